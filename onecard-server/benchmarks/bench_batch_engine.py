@@ -0,0 +1,80 @@
+"""Throughput of the batched NumPy engine vs the scalar dict reducer (rule-based AI in every seat).
+
+    PYTHONPATH=src python benchmarks/bench_batch_engine.py [games]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from onecard_api.domain.batch import play_rule_based_turns, stack_games
+from onecard_api.domain.compact import FINISHED, to_compact
+from onecard_api.domain.engine import (
+    apply_special_effect_action,
+    create_started_state,
+    draw_card_action,
+    next_turn_action,
+    play_card_action,
+)
+from onecard_api.domain.players import find_playable_card_brute_force
+from onecard_api.domain.transitions import transition_game_state
+
+SETTINGS = {
+    "mode": "single",
+    "numberOfPlayers": 4,
+    "includeJokers": True,
+    "initHandSize": 5,
+    "maxHandSize": 15,
+    "difficulty": "easy",
+}
+MAX_TURNS = 500
+
+
+def _scalar_turn(state):
+    index = state["currentPlayerIndex"]
+    hand = state["players"][index]["hand"]
+    card = find_playable_card_brute_force(hand, state["discardPile"][0], state["damage"])
+    if card is not None:
+        state = transition_game_state(state, play_card_action(index, hand.index(card)))
+        state = transition_game_state(state, apply_special_effect_action(card))
+    else:
+        state = transition_game_state(state, draw_card_action(max(1, state["damage"])))
+    if state["gameStatus"] != "finished":
+        state = transition_game_state(state, next_turn_action())
+    return state
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    states = [
+        create_started_state({**SETTINGS, "seed": seed})  # type: ignore[typeddict-item]
+        for seed in range(count)
+    ]
+
+    start = time.perf_counter()
+    scalar_turns = 0
+    for state in states:
+        for _ in range(MAX_TURNS):
+            if state["gameStatus"] == "finished":
+                break
+            state = _scalar_turn(state)
+            scalar_turns += 1
+    scalar_elapsed = time.perf_counter() - start
+
+    games = stack_games([to_compact(state) for state in states])
+    start = time.perf_counter()
+    for _ in range(MAX_TURNS):
+        if (games.status == FINISHED).all():
+            break
+        play_rule_based_turns(games)
+    batch_elapsed = time.perf_counter() - start
+
+    print(f"games           : {count}")
+    print(f"scalar reducer  : {count / scalar_elapsed:10.0f} games/s ({scalar_turns / scalar_elapsed:.0f} turns/s)")
+    print(f"batched engine  : {count / batch_elapsed:10.0f} games/s")
+    print(f"speedup         : {scalar_elapsed / batch_elapsed:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Allocations and latency per draw_card_status call at several damage levels.
+
+    PYTHONPATH=src python benchmarks/bench_draw_card.py
+"""
+
+from __future__ import annotations
+
+import timeit
+import tracemalloc
+
+from onecard_api.domain.engine import create_started_state
+from onecard_api.domain.transitions import draw_card_status
+from onecard_api.domain.types import GameState
+
+SETTINGS = {
+    "mode": "single",
+    "numberOfPlayers": 4,
+    "includeJokers": True,
+    "initHandSize": 5,
+    "maxHandSize": 20,
+    "difficulty": "easy",
+}
+AMOUNTS = (1, 2, 5, 7)
+
+
+def _allocations(state: GameState, amount: int, repeat: int = 200) -> tuple[float, float]:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    results = [draw_card_status(state, amount) for _ in range(repeat)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    del results
+    return blocks / repeat, size / repeat
+
+
+def main() -> None:
+    state = create_started_state({**SETTINGS, "seed": 0})  # type: ignore[typeddict-item]
+    print(f"{'amount':>6} {'us/draw':>10} {'blocks/draw':>12} {'bytes/draw':>11}")
+    for amount in AMOUNTS:
+        seconds = min(timeit.repeat(lambda: draw_card_status(state, amount), number=2000, repeat=5))
+        blocks, size = _allocations(state, amount)
+        print(f"{amount:>6} {seconds / 2000 * 1e6:>10.2f} {blocks:>12.1f} {size:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
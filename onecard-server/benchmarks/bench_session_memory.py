@@ -0,0 +1,63 @@
+"""Resident bytes per stored session (live and packed) and create_game latency at N sessions.
+
+    PYTHONPATH=src python benchmarks/bench_session_memory.py [sessions]
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from onecard_api.domain.engine import start_game_action
+from onecard_api.services.game_engine_service import GameEngineService
+from onecard_api.services.game_state_store import GameStateStore, StoreLimits
+
+SETTINGS = {"numberOfPlayers": 4, "includeJokers": True, "maxHandSize": 15}
+
+
+def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    engine = GameEngineService()
+    now = [0.0]
+    store = GameStateStore(game_engine=engine, limits=StoreLimits(), clock=lambda: now[0])
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for _ in range(sessions):
+        record = store.create(SETTINGS)
+        started = engine.step(record["state"], start_game_action())
+        store.update_state(record["id"], started["state"])
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    resident = tracemalloc.get_traced_memory()[0] - baseline
+
+    # 모두 유휴 상태로 만들어 압축한 뒤 다시 잰다.
+    now[0] = StoreLimits().pack_idle_after_seconds + 1
+    start = time.perf_counter()
+    store.reap()
+    pack_elapsed = time.perf_counter() - start
+    gc.collect()
+    packed = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    game_ids = [record["id"] for record in store.list()]
+    start = time.perf_counter()
+    for game_id in game_ids:
+        store.find(game_id)
+    unpack_elapsed = time.perf_counter() - start
+
+    print(f"sessions          : {sessions}")
+    print(f"bytes per session : {resident / sessions:10.0f}")
+    print(f"total resident    : {resident / 2**20:10.1f} MiB")
+    print(f"create+start      : {elapsed / sessions * 1e6:10.1f} us/session (traced)")
+    print(f"bytes when packed : {packed / sessions:10.0f}")
+    print(f"pack              : {pack_elapsed / sessions * 1e6:10.1f} us/session (traced)")
+    print(f"unpack on find    : {unpack_elapsed / sessions * 1e6:10.1f} us/session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Session store throughput: in-memory vs SQLite write-back, with many concurrent games.
+
+    PYTHONPATH=src python benchmarks/bench_store_backends.py [games] [moves-per-game] [threads]
+
+Every game is created and started, then each thread plays its share of the games move by
+move (find + update_state, the API's access pattern). Reports store ops/s, the cost of a
+hot `find`, and for SQLite the final flush, the number of batches written and the size of
+the database (snapshots plus action log).
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from onecard_api.domain.engine import draw_card_action, play_card_action, start_game_action
+from onecard_api.services.game_engine_service import GameEngineService
+from onecard_api.services.game_state_store import GameStateStore, StoreLimits
+from onecard_api.services.sqlite_store import SqliteGameStateBackend
+
+SETTINGS = {"numberOfPlayers": 4, "includeJokers": True, "maxHandSize": 15}
+LIMITS = StoreLimits(idle_ttl_seconds=None, finished_ttl_seconds=None)
+
+
+def _play(store: GameStateStore, engine: GameEngineService, game_ids: list[str], moves: int) -> int:
+    ops = 0
+    for _ in range(moves):
+        for game_id in game_ids:
+            state = store.find(game_id)["state"]
+            ops += 1
+            if state["gameStatus"] != "playing":
+                continue
+            legal = engine.legal_actions(state)
+            if legal.play_indices:
+                action = play_card_action(legal.player_index, legal.play_indices[0])
+            else:
+                action = draw_card_action(legal.draw_amount)
+            result = engine.play_turn(state, action)
+            store.update_state(game_id, result["state"], result["info"]["actions"])
+            ops += 1
+    return ops
+
+
+def run(label: str, store: GameStateStore, games: int, moves: int, threads: int) -> None:
+    engine = GameEngineService()
+    started = time.perf_counter()
+    game_ids = []
+    for seed in range(games):
+        record = store.create({**SETTINGS, "seed": seed})
+        action = start_game_action()
+        store.update_state(record["id"], engine.step(record["state"], action)["state"], [action])
+        game_ids.append(record["id"])
+    created = time.perf_counter() - started
+
+    shards = [game_ids[index::threads] for index in range(threads)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        ops = sum(pool.map(lambda shard: _play(store, engine, shard, moves), shards))
+    played = time.perf_counter() - started
+
+    hot = game_ids[-1]
+    started = time.perf_counter()
+    for _ in range(10_000):
+        store.find(hot)
+    find_us = (time.perf_counter() - started) / 10_000 * 1e6
+
+    started = time.perf_counter()
+    store.close()
+    closed = time.perf_counter() - started
+
+    print(f"[{label}]")
+    print(f"  create+start   : {created / games * 1e6:10.1f} us/game")
+    print(f"  find+update    : {ops / played:10.0f} ops/s ({threads} threads)")
+    print(f"  hot find       : {find_us:10.2f} us")
+    backend = store.metrics().get("backend")
+    if backend is not None:
+        print(f"  final flush    : {closed * 1e3:10.1f} ms")
+        print(f"  batches        : {backend['flushes']:10d} ({backend['flushedRecords']} records)")
+        size = sum(path.stat().st_size for path in Path(store.backend.path).parent.glob("*.sqlite3*"))
+        print(f"  file size      : {size / 2**20:10.1f} MiB")
+
+
+def main() -> None:
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    moves = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    run("memory", GameStateStore(limits=LIMITS), games, moves, threads)
+    with tempfile.TemporaryDirectory() as directory:
+        backend = SqliteGameStateBackend(Path(directory) / "sessions.sqlite3")
+        run("sqlite", GameStateStore(limits=LIMITS, backend=backend), games, moves, threads)
+
+
+if __name__ == "__main__":
+    main()
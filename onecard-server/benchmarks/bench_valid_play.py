@@ -0,0 +1,74 @@
+"""Microbenchmark: legal plays of a 15-card hand, per-card rule chain vs lookup table.
+
+    PYTHONPATH=src python benchmarks/bench_valid_play.py
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+
+from onecard_api.domain.card_codes import encode_card
+from onecard_api.domain.card_utils import (
+    PLAYABLE_MASKS,
+    _is_valid_play_rule,
+    create_deck,
+    hand_mask,
+    playable_code_indices,
+    playable_indices,
+)
+
+HAND_SIZE = 15
+ROUNDS = 50_000
+
+
+def main() -> None:
+    rng = random.Random(0)
+    deck = create_deck(include_jokers=True)
+    cases = []
+    for _ in range(64):
+        cards = rng.sample(deck, HAND_SIZE + 1)
+        cases.append((cards[:HAND_SIZE], cards[HAND_SIZE], rng.choice((0, 0, 2, 5))))
+    coded = [
+        (bytes(encode_card(c) for c in hand), hand_mask(hand), encode_card(top), damage)
+        for hand, top, damage in cases
+    ]
+
+    for hand, top, damage in cases:
+        expected = [i for i, c in enumerate(hand) if _is_valid_play_rule(c, top, damage)]
+        assert playable_indices(hand, top, damage) == expected
+
+    def rule_chain() -> None:
+        for hand, top, damage in cases:
+            [idx for idx, card in enumerate(hand) if _is_valid_play_rule(card, top, damage)]
+
+    def table_dict_hand() -> None:
+        for hand, top, damage in cases:
+            playable_indices(hand, top, damage)
+
+    def table_code_hand() -> None:
+        for codes, _, top_code, damage in coded:
+            playable_code_indices(codes, top_code, damage)
+
+    def bitmask_hand() -> None:
+        for _, bits, top_code, damage in coded:
+            bits & PLAYABLE_MASKS[damage > 0][top_code]
+
+    number = ROUNDS // len(cases)
+    per_hand = number * len(cases)
+    timings = {
+        name: min(timeit.repeat(fn, number=number, repeat=7)) / per_hand
+        for name, fn in (
+            ("rule chain (dict hand)", rule_chain),
+            ("lookup table (dict hand)", table_dict_hand),
+            ("lookup table (code hand)", table_code_hand),
+            ("bitmask legal set", bitmask_hand),
+        )
+    }
+    baseline = timings["rule chain (dict hand)"]
+    for name, seconds in timings.items():
+        print(f"{name:26s}: {seconds * 1e6:7.3f} us/hand  ({baseline / seconds:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Body, Depends
+
+from onecard_api.api.deps import get_ai_prefetcher, get_game_state_store, get_transition_profiler
+from onecard_api.api.schemas import TransitionProfilingDto
+from onecard_api.domain.profiling import TransitionProfiler
+from onecard_api.services.ai_prefetch import AiMovePrefetcher
+from onecard_api.services.game_state_store import GameStateStore
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/transitions")
+def transition_profile(
+    profiler: TransitionProfiler = Depends(get_transition_profiler),
+) -> dict:
+    return profiler.snapshot()
+
+
+@router.put("/transitions")
+def configure_transition_profile(
+    body: TransitionProfilingDto = Body(...),
+    profiler: TransitionProfiler = Depends(get_transition_profiler),
+) -> dict:
+    if body.enabled:
+        profiler.enable(track_allocations=body.trackAllocations)
+    else:
+        profiler.disable()
+    return profiler.snapshot()
+
+
+@router.delete("/transitions")
+def reset_transition_profile(
+    profiler: TransitionProfiler = Depends(get_transition_profiler),
+) -> dict:
+    profiler.reset()
+    return profiler.snapshot()
+
+
+@router.get("/store")
+def store_metrics(store: GameStateStore = Depends(get_game_state_store)) -> dict:
+    return store.metrics()
+
+
+@router.get("/ai-prefetch")
+def ai_prefetch_metrics(prefetcher: AiMovePrefetcher = Depends(get_ai_prefetcher)) -> dict:
+    return prefetcher.metrics()
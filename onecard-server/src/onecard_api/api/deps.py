@@ -3,8 +3,11 @@ from __future__ import annotations
 from fastapi import Depends
 
 from onecard_api.container import ServiceContainer, get_container
+from onecard_api.domain.profiling import TransitionProfiler
+from onecard_api.services.ai_prefetch import AiMovePrefetcher
 from onecard_api.services.game_ai_service import GameAiService
 from onecard_api.services.game_service import GameService
+from onecard_api.services.game_state_store import GameStateStore
 from onecard_api.services.onnx_policy_service import OnnxPolicyService
 
 
@@ -28,3 +31,21 @@ def get_onnx_policy_service(
     container: ServiceContainer = Depends(get_service_container),
 ) -> OnnxPolicyService:
     return container.onnx_policy_service
+
+
+def get_transition_profiler(
+    container: ServiceContainer = Depends(get_service_container),
+) -> TransitionProfiler:
+    return container.transition_profiler
+
+
+def get_game_state_store(
+    container: ServiceContainer = Depends(get_service_container),
+) -> GameStateStore:
+    return container.game_state_store
+
+
+def get_ai_prefetcher(
+    container: ServiceContainer = Depends(get_service_container),
+) -> AiMovePrefetcher:
+    return container.ai_prefetcher
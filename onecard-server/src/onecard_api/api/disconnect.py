@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Awaitable, TypeVar
+
+from fastapi import HTTPException, Request
+
+T = TypeVar("T")
+
+# nginx 관례: 응답 전에 클라이언트가 연결을 끊은 요청
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def cancel_on_disconnect(request: Request, work: Awaitable[T]) -> T:
+    """Awaits `work`, cancelling it (and answering 499) if the client goes away first.
+
+    Only for routes that do not read the request body themselves: the watcher consumes the
+    ASGI receive channel. A cancelled AI turn is never stored, and its job is dropped from
+    the executor queue if it has not started yet.
+    """
+
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        watcher.cancel()
+
+    if task.done():
+        return task.result()
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+    raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
@@ -3,18 +3,55 @@ from __future__ import annotations
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, Response, status
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status
 
 from onecard_api.api.deps import get_game_service
-from onecard_api.api.schemas import ApplyGameActionDto, CreateGameDto
+from onecard_api.api.disconnect import cancel_on_disconnect
+from onecard_api.api.schemas import ApplyGameActionDto, CreateGameDto, ListGamesQueryDto
 from onecard_api.services.game_service import GameService
+from onecard_api.services.session_index import SessionQuery
 
 router = APIRouter(prefix="/games", tags=["games"])
 
 
+def _expected_version(if_match: str | None) -> int | None:
+    # If-Match 에는 응답의 ETag("<version>")를 그대로 보낸다. "*"는 조건 없음과 같다.
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip().removeprefix("W/").strip('"')
+    try:
+        return int(tag)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must be the game's ETag (its version)",
+        ) from None
+
+
+def _with_etag(response: Response, body: dict) -> dict:
+    if "version" in body:
+        response.headers["ETag"] = f'"{body["version"]}"'
+    return body
+
+
 @router.get("")
-def list_games(game_service: GameService = Depends(get_game_service)) -> list[dict]:
-    return game_service.list_games()
+def list_games(
+    query: ListGamesQueryDto = Depends(),
+    game_service: GameService = Depends(get_game_service),
+) -> dict:
+    settings = query.model_dump(
+        include={"mode", "difficulty", "numberOfPlayers", "includeJokers"}, exclude_none=True
+    )
+    return game_service.list_games(
+        SessionQuery(
+            game_status=query.gameStatus,
+            settings=settings or None,
+            updated_since=query.updatedSince,
+            order=query.order,
+            limit=query.limit,
+            cursor=query.cursor,
+        )
+    )
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -28,31 +65,62 @@ def create_game(
 
 @router.get("/{game_id}")
 def get_game(
-    game_id: UUID, game_service: GameService = Depends(get_game_service)
+    game_id: UUID, response: Response, game_service: GameService = Depends(get_game_service)
 ) -> dict:
-    return game_service.get_game(str(game_id))
+    return _with_etag(response, game_service.get_game(str(game_id)))
 
 
 @router.patch("/{game_id}")
-def apply_action(
+async def apply_action(
     game_id: UUID,
+    response: Response,
     body: ApplyGameActionDto = Body(...),
+    if_match: str | None = Header(default=None),
     game_service: GameService = Depends(get_game_service),
 ) -> dict:
     action_payload = body.action.model_dump(exclude_none=True)
-    return game_service.apply_action(str(game_id), action_payload)
+    result = await game_service.apply_action(
+        str(game_id), action_payload, _expected_version(if_match)
+    )
+    return _with_etag(response, result)
 
 
 @router.post("/{game_id}/ai-turns")
 async def execute_ai_turn(
+    game_id: UUID,
+    request: Request,
+    response: Response,
+    untilHuman: bool = Query(default=False),
+    maxTurns: int | None = Query(default=None, ge=1),
+    if_match: str | None = Header(default=None),
+    game_service: GameService = Depends(get_game_service),
+) -> dict:
+    result = await cancel_on_disconnect(
+        request,
+        game_service.execute_ai_turn(
+            str(game_id), _expected_version(if_match), untilHuman, maxTurns
+        ),
+    )
+    return _with_etag(response, result)
+
+
+@router.get("/{game_id}/history")
+def get_history(
     game_id: UUID, game_service: GameService = Depends(get_game_service)
 ) -> dict:
-    return await game_service.execute_ai_turn(str(game_id))
+    return game_service.get_history(str(game_id))
+
+
+@router.get("/{game_id}/history/{seq}")
+def get_state_at(
+    game_id: UUID, seq: int, game_service: GameService = Depends(get_game_service)
+) -> dict:
+    return game_service.get_state_at(str(game_id), seq)
 
 
 @router.delete("/{game_id}", status_code=status.HTTP_200_OK)
-def delete_game(
+async def delete_game(
     game_id: UUID, game_service: GameService = Depends(get_game_service)
 ) -> Response:
-    game_service.delete_game(str(game_id))
+    await game_service.delete_game(str(game_id))
     return Response(status_code=status.HTTP_200_OK)
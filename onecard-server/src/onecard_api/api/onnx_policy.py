@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 
 from onecard_api.api.deps import get_game_service, get_onnx_policy_service
+from onecard_api.api.disconnect import cancel_on_disconnect
 from onecard_api.api.schemas import OnnxHealthQueryDto
 from onecard_api.domain.types import GameSettings
 from onecard_api.services.game_service import GameService
@@ -19,6 +20,7 @@ router = APIRouter(
 @router.get("")
 async def predict_action(
     game_id: UUID,
+    request: Request,
     include_logits: bool = Query(
         default=False, alias="includeLogits", description="로그 확률 반환 여부"
     ),
@@ -26,7 +28,7 @@ async def predict_action(
     onnx_policy_service: OnnxPolicyService = Depends(get_onnx_policy_service),
 ) -> dict:
     game = game_service.get_game(str(game_id))
-    result = await onnx_policy_service.predict_action(game["state"])
+    result = await cancel_on_disconnect(request, onnx_policy_service.predict_action(game["state"]))
     response = {
         "actionIndex": result["actionIndex"],
         "payload": result["payload"],
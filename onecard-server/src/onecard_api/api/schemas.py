@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -46,6 +47,7 @@ class GameSettingsDto(BaseModel):
     initHandSize: int | None = Field(default=None, ge=1, le=15)
     maxHandSize: int | None = Field(default=None, ge=1, le=20)
     difficulty: Literal["easy", "medium", "hard"] | None = None
+    seed: int | None = Field(default=None, ge=0, le=2**63 - 1)
 
     model_config = ConfigDict(extra="forbid")
 
@@ -56,6 +58,20 @@ class CreateGameDto(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+class ListGamesQueryDto(BaseModel):
+    gameStatus: Literal["waiting", "playing", "finished"] | None = None
+    mode: Literal["single", "multi"] | None = None
+    difficulty: Literal["easy", "medium", "hard"] | None = None
+    numberOfPlayers: int | None = Field(default=None, ge=2, le=6)
+    includeJokers: bool | None = None
+    updatedSince: datetime | None = None
+    order: Literal["desc", "asc"] = "desc"
+    limit: int = Field(default=50, ge=1, le=500)
+    cursor: str | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
 class OnnxHealthQueryDto(BaseModel):
     players: int = Field(ge=2, le=4)
     includeJokers: bool
@@ -64,3 +80,10 @@ class OnnxHealthQueryDto(BaseModel):
     difficulty: Literal["easy", "medium", "hard"] | None = None
 
     model_config = ConfigDict(extra="forbid")
+
+
+class TransitionProfilingDto(BaseModel):
+    enabled: bool
+    trackAllocations: bool = False
+
+    model_config = ConfigDict(extra="forbid")
@@ -0,0 +1,328 @@
+"""Microbenchmarks of the domain engine hot paths, with JSON baselines and regression checks.
+
+    PYTHONPATH=src python -m onecard_api.bench run --out benchmarks/baselines/engine.json
+    PYTHONPATH=src python -m onecard_api.bench compare benchmarks/baselines/engine.json
+
+`run` times every benchmark (best of `--repeat` rounds, microseconds per call) and writes
+the results as JSON. `compare` checks a fresh run (or a saved one) against a baseline and
+exits with status 1 when any benchmark got slower than `--threshold` (relative).
+Baselines are only comparable on the machine and Python build that produced them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Literal, TextIO
+
+from onecard_api.domain.card_utils import create_deck, deal_cards, refill_deck, shuffle_deck
+from onecard_api.domain.discard_pile import DiscardPile
+from onecard_api.domain.engine import (
+    create_started_state,
+    draw_card_action,
+    legal_actions,
+    play_card_action,
+)
+from onecard_api.domain.players import create_ai_player
+from onecard_api.domain.transitions import draw_card_status, play_card_status
+from onecard_api.domain.types import GameSettings, GameState
+from onecard_api.inference.action_mask import build_action_mask
+from onecard_api.inference.observation_encoder import build_observation_spec, encode_observation
+from onecard_api.services.game_engine_service import EngineKind, GameEngineService
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / "benchmarks" / "baselines" / "engine.json"
+DEFAULT_THRESHOLD = 0.25
+DAMAGE_LEVELS = (0, 2, 5, 7)
+PLAYOUT_MAX_TURNS = 1000
+
+SETTINGS: GameSettings = {
+    "mode": "single",
+    "numberOfPlayers": 4,
+    "includeJokers": True,
+    "initHandSize": 5,
+    "maxHandSize": 15,
+    "difficulty": "easy",
+    "seed": 0,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    """`setup` builds the inputs once and returns the callable that is timed `number` times."""
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    number: int
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    name: str
+    baseline_us: float | None
+    current_us: float | None
+    status: Literal["ok", "regression", "improvement", "new", "missing"]
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline_us or self.current_us is None:
+            return None
+        return self.current_us / self.baseline_us
+
+
+def _started_state() -> GameState:
+    return create_started_state(SETTINGS)
+
+
+def _bench_create_deck() -> Callable[[], object]:
+    return lambda: create_deck(True)
+
+
+def _bench_shuffle_deck() -> Callable[[], object]:
+    deck = create_deck(True)
+    rng = random.Random(0)
+    return lambda: shuffle_deck(deck, rng)
+
+
+def _bench_deal_cards() -> Callable[[], object]:
+    deck = shuffle_deck(create_deck(True), random.Random(0))
+    players = [create_ai_player(f"ai-{idx}", f"AI {idx}", [], "easy") for idx in range(4)]
+    return lambda: deal_cards(players, deck, 5)
+
+
+def _bench_play_card_status() -> Callable[[], object]:
+    state = _started_state()
+    legal = legal_actions(state)
+    card_index = legal.play_indices[0] if legal.play_indices else 0
+    player_index = legal.player_index
+    return lambda: play_card_status(state, player_index, card_index)
+
+
+def _bench_draw_card_status(damage: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        state: GameState = {**_started_state(), "damage": damage}
+        amount = max(1, damage)
+        return lambda: draw_card_status(state, amount)
+
+    return setup
+
+
+def _bench_refill_deck() -> Callable[[], object]:
+    deck = create_deck(True)
+    current, discarded = deck[:4], DiscardPile.from_cards(deck[4:34])
+    rng = random.Random(0)
+    return lambda: refill_deck(current, discarded, rng)
+
+
+def _bench_build_action_mask() -> Callable[[], object]:
+    state = _started_state()
+    # 실제 요청처럼 매번 새 상태 객체를 넘겨 합법 수 캐시에 걸리지 않게 한다(얕은 복사 비용 포함).
+    return lambda: build_action_mask({**state}, SETTINGS["maxHandSize"])
+
+
+def _bench_encode_observation() -> Callable[[], object]:
+    state = _started_state()
+    spec = build_observation_spec(SETTINGS)
+    return lambda: encode_observation(state, spec)
+
+
+def play_out(engine: GameEngineService, state: GameState) -> GameState:
+    """Rule-based play (first playable card, else draw) in every seat until someone wins."""
+
+    for _ in range(PLAYOUT_MAX_TURNS):
+        if state["gameStatus"] != "playing":
+            break
+        legal = engine.legal_actions(state)
+        if legal.play_indices:
+            action = play_card_action(legal.player_index, legal.play_indices[0])
+        else:
+            action = draw_card_action(legal.draw_amount)
+        state = engine.play_turn(state, action)["state"]
+    return state
+
+
+def _bench_playout(kind: EngineKind) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        engine = GameEngineService(kind)
+        state = _started_state()
+        return lambda: play_out(engine, state)
+
+    return setup
+
+
+BENCHMARKS: tuple[Benchmark, ...] = (
+    Benchmark("create_deck", _bench_create_deck, 200_000),
+    Benchmark("shuffle_deck", _bench_shuffle_deck, 10_000),
+    Benchmark("deal_cards", _bench_deal_cards, 50_000),
+    Benchmark("play_card_status", _bench_play_card_status, 20_000),
+    *(
+        Benchmark(f"draw_card_status[damage={damage}]", _bench_draw_card_status(damage), 20_000)
+        for damage in DAMAGE_LEVELS
+    ),
+    Benchmark("refill_deck", _bench_refill_deck, 10_000),
+    Benchmark("build_action_mask", _bench_build_action_mask, 50_000),
+    Benchmark("encode_observation", _bench_encode_observation, 20_000),
+    Benchmark("playout[dict]", _bench_playout("dict"), 50),
+    Benchmark("playout[compact]", _bench_playout("compact"), 20),
+)
+
+
+def measure(benchmark: Benchmark, *, repeat: int = 7, scale: float = 1.0) -> dict[str, float | int]:
+    fn = benchmark.setup()
+    number = max(1, int(benchmark.number * scale))
+    fn()  # 워밍업: 지연 초기화/캐시를 측정에서 뺀다.
+    rounds = [seconds / number * 1e6 for seconds in timeit.repeat(fn, number=number, repeat=repeat)]
+    return {
+        "usPerCall": round(min(rounds), 4),
+        "medianUs": round(statistics.median(rounds), 4),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def select_benchmarks(patterns: Sequence[str] | None = None) -> list[Benchmark]:
+    if not patterns:
+        return list(BENCHMARKS)
+    return [bench for bench in BENCHMARKS if any(pattern in bench.name for pattern in patterns)]
+
+
+def run_benchmarks(
+    benchmarks: Sequence[Benchmark] | None = None,
+    *,
+    repeat: int = 7,
+    scale: float = 1.0,
+    on_result: Callable[[str, dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    started = time.perf_counter()
+    for benchmark in benchmarks or BENCHMARKS:
+        results[benchmark.name] = measure(benchmark, repeat=repeat, scale=scale)
+        if on_result is not None:
+            on_result(benchmark.name, results[benchmark.name])
+    return {
+        "meta": {
+            "createdAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seconds": round(time.perf_counter() - started, 2),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = DEFAULT_THRESHOLD
+) -> list[Comparison]:
+    """Classifies every benchmark of either run; slower than `1 + threshold` is a regression."""
+
+    base_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+    comparisons: list[Comparison] = []
+    for name in [*base_results, *(name for name in current_results if name not in base_results)]:
+        base = base_results.get(name, {}).get("usPerCall")
+        now = current_results.get(name, {}).get("usPerCall")
+        if base is None:
+            status = "new"
+        elif now is None:
+            status = "missing"
+        elif now > base * (1 + threshold):
+            status = "regression"
+        elif now < base / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        comparisons.append(Comparison(name, base, now, status))  # type: ignore[arg-type]
+    return comparisons
+
+
+def format_comparisons(comparisons: Sequence[Comparison]) -> str:
+    lines = [f"{'benchmark':<28} {'baseline us':>12} {'current us':>12} {'ratio':>7}  status"]
+    for item in comparisons:
+        base = f"{item.baseline_us:.3f}" if item.baseline_us is not None else "-"
+        now = f"{item.current_us:.3f}" if item.current_us is not None else "-"
+        ratio = f"{item.ratio:.2f}x" if item.ratio is not None else "-"
+        lines.append(f"{item.name:<28} {base:>12} {now:>12} {ratio:>7}  {item.status}")
+    return "\n".join(lines)
+
+
+def _read(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m onecard_api.bench", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_arguments(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument("--only", nargs="+", default=None, help="substrings of benchmark names")
+        sub.add_argument("--repeat", type=int, default=7)
+        sub.add_argument("--scale", type=float, default=1.0, help="multiplier of calls per round")
+
+    run = commands.add_parser("run", help="time the benchmarks and write JSON")
+    add_run_arguments(run)
+    run.add_argument("--out", type=Path, default=None, help="JSON file (default: stdout)")
+
+    check = commands.add_parser("compare", help="flag regressions against a baseline")
+    add_run_arguments(check)
+    check.add_argument("baseline", type=Path, nargs="?", default=DEFAULT_BASELINE)
+    check.add_argument("current", type=Path, nargs="?", default=None, help="saved run (default: run now)")
+    check.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    commands.add_parser("list", help="print the benchmark names")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None, out: TextIO = sys.stdout) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "list":
+        out.write("\n".join(bench.name for bench in BENCHMARKS) + "\n")
+        return 0
+
+    def progress(name: str, result: dict[str, Any]) -> None:
+        print(f"{name:<28} {result['usPerCall']:>12.3f} us", file=sys.stderr)
+
+    if args.command == "run":
+        report = run_benchmarks(
+            select_benchmarks(args.only), repeat=args.repeat, scale=args.scale, on_result=progress
+        )
+        text = json.dumps(report, indent=2) + "\n"
+        if args.out is None:
+            out.write(text)
+        else:
+            args.out.parent.mkdir(parents=True, exist_ok=True)
+            args.out.write_text(text, encoding="utf-8")
+        return 0
+
+    baseline = _read(args.baseline)
+    if args.current is not None:
+        current = _read(args.current)
+    else:
+        current = run_benchmarks(
+            select_benchmarks(args.only), repeat=args.repeat, scale=args.scale, on_result=progress
+        )
+        if args.only:
+            # 일부만 돌렸으면 나머지 기준값은 비교에서 뺀다.
+            kept = {name: result for name, result in baseline["results"].items() if name in current["results"]}
+            baseline = {**baseline, "results": kept}
+    comparisons = compare(baseline, current, args.threshold)
+    out.write(format_comparisons(comparisons) + "\n")
+    regressions = [item.name for item in comparisons if item.status == "regression"]
+    if regressions:
+        out.write(f"regressions beyond {args.threshold:.0%}: {', '.join(regressions)}\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,34 +1,92 @@
 from __future__ import annotations
 
+import os
 from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from onecard_api.domain.constants import DEFAULT_GAME_SETTINGS
+from onecard_api.domain.profiling import TransitionProfiler
+from onecard_api.search.ismcts import SearchConfig
+from onecard_api.search.puct import PuctConfig
+from onecard_api.services.ai_executor import default_executor
+from onecard_api.services.ai_prefetch import AiMovePrefetcher, PrefetchConfig
 from onecard_api.services.game_ai_service import GameAiService
-from onecard_api.services.game_engine_service import GameEngineService
-from onecard_api.services.game_service import GameService
-from onecard_api.services.game_state_store import GameStateStore
+from onecard_api.services.game_engine_service import EngineKind, GameEngineService
+from onecard_api.services.game_service import DEFAULT_MAX_AI_TURNS, GameService
+from onecard_api.services.game_state_store import (
+    FlushPolicy,
+    GameStateBackend,
+    GameStateStore,
+    StoreLimits,
+)
 from onecard_api.services.onnx_policy_service import OnnxPolicyService
+from onecard_api.services.sqlite_store import DEFAULT_SNAPSHOT_EVERY, SqliteGameStateBackend
 
 
 class ServiceContainer:
     """Lazily constructed service graph for dependency injection."""
 
-    def __init__(self, model_dir: Optional[str | Path] = None) -> None:
-        self.game_engine_service = GameEngineService()
-        self.onnx_policy_service = OnnxPolicyService(model_dir=model_dir)
+    def __init__(
+        self,
+        model_dir: Optional[str | Path] = None,
+        engine: Optional[EngineKind] = None,
+    ) -> None:
+        self.game_engine_service = GameEngineService(
+            engine or os.getenv("ONECARD_ENGINE", "dict")  # type: ignore[arg-type]
+        )
+        self.transition_profiler = TransitionProfiler()
+        # ONECARD_PROFILE_TRANSITIONS=1 이면 전이별 시간을, "alloc" 이면 할당량까지 기록한다.
+        profile = os.getenv("ONECARD_PROFILE_TRANSITIONS", "").lower()
+        if profile in ("1", "true", "alloc"):
+            self.transition_profiler.enable(track_allocations=profile == "alloc")
+        # 프로세스 전체가 하나의 실행기(와 max_pending 상한)를 공유한다.
+        self.ai_executor = default_executor()
+        self.onnx_policy_service = OnnxPolicyService(
+            model_dir=model_dir, executor=self.ai_executor
+        )
         self.game_state_store = GameStateStore(
-            DEFAULT_GAME_SETTINGS, self.game_engine_service
+            DEFAULT_GAME_SETTINGS,
+            self.game_engine_service,
+            StoreLimits.from_env(),
+            backend=_store_backend_from_env(),
+            flush_policy=FlushPolicy.from_env(),
         )
         self.game_ai_service = GameAiService(
-            self.game_engine_service, self.onnx_policy_service
+            self.game_engine_service,
+            self.onnx_policy_service,
+            SearchConfig.from_env(),
+            PuctConfig.from_env(),
+            self.ai_executor,
         )
+        self.ai_prefetcher = AiMovePrefetcher(self.game_ai_service, PrefetchConfig.from_env())
         self.game_service = GameService(
             self.game_state_store,
             self.game_engine_service,
             self.game_ai_service,
+            max_ai_turns=int(os.getenv("ONECARD_AI_MAX_TURNS", DEFAULT_MAX_AI_TURNS)),
+            ai_prefetcher=self.ai_prefetcher,
+        )
+
+    def shutdown(self) -> None:
+        """Flushes the session store and releases worker pools; both reopen on use."""
+
+        self.ai_prefetcher.clear()
+        self.game_state_store.close()
+        self.ai_executor.shutdown()
+
+
+def _store_backend_from_env() -> GameStateBackend | None:
+    # ONECARD_STORE=sqlite 이면 세션을 SQLite 파일에 저장해 재시작 후에도 유지한다.
+    kind = os.getenv("ONECARD_STORE", "memory").lower()
+    if kind == "memory":
+        return None
+    if kind == "sqlite":
+        return SqliteGameStateBackend(
+            os.getenv("ONECARD_SQLITE_PATH", "onecard-sessions.sqlite3"),
+            snapshot_every=int(os.getenv("ONECARD_SNAPSHOT_EVERY", DEFAULT_SNAPSHOT_EVERY)),
         )
+    raise ValueError(f"unknown ONECARD_STORE: {kind}")
 
 
 @lru_cache(maxsize=1)
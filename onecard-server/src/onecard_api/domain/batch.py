@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Sequence
+
+import numpy as np
+
+from .card_codes import CARD_CODE_COUNT, JOKER_CODES, code_rank
+from .card_utils import ALL_CODES_MASK, PLAYABLE_MASKS, SPECIAL_RANKS
+from .compact import (
+    ATTACK_BY_CODE,
+    FINISHED,
+    PLAYING,
+    REVERSES_BY_CODE,
+    TURN_SHIFT_BY_CODE,
+    CompactGameState,
+)
+from .rng import next_random
+
+# 배치 액션 종류 (BatchActions.kind)
+NOOP, PLAY, DRAW, NEXT_TURN, APPLY_SPECIAL_EFFECT = range(5)
+
+# 빈 슬롯 / 버린 카드가 없는 상태를 나타내는 패딩 코드
+EMPTY = CARD_CODE_COUNT
+NO_TOP = CARD_CODE_COUNT
+SLOTS = CARD_CODE_COUNT
+
+_ATTACK = np.array([*ATTACK_BY_CODE, 0], dtype=np.int32)
+_REVERSES = np.array([*REVERSES_BY_CODE, False], dtype=bool)
+_TURN_SHIFT = np.array([*TURN_SHIFT_BY_CODE, 0], dtype=np.int32)
+_SPECIAL = np.array(
+    [code in JOKER_CODES or code_rank(code) in SPECIAL_RANKS for code in range(CARD_CODE_COUNT)]
+    + [False],
+    dtype=bool,
+)
+
+
+def _build_playable_table() -> np.ndarray:
+    # _PLAYABLE[damage > 0, top_code (NO_TOP 포함), played_code (EMPTY 포함)]
+    table = np.zeros((2, CARD_CODE_COUNT + 1, CARD_CODE_COUNT + 1), dtype=bool)
+    for damaged in (0, 1):
+        masks = (*PLAYABLE_MASKS[damaged], ALL_CODES_MASK)
+        for top, mask in enumerate(masks):
+            for played in range(CARD_CODE_COUNT):
+                table[damaged, top, played] = bool(mask >> played & 1)
+    return table
+
+
+_PLAYABLE = _build_playable_table()
+
+
+@dataclass
+class BatchGames:
+    """Struct-of-arrays view of N independent games with the same player count.
+
+    Hands are `(N, P, 54)` slot matrices of card codes padded with `EMPTY` (slot order is the
+    hand order, so card indices mean the same thing as in the dict state). Decks are per-game
+    permutation rows read from `deck_pos` to `deck_end`; the discard pile grows to the right
+    (`discard[g, discard_len[g] - 1]` is the top card). Arrays are updated in place.
+    """
+
+    hands: np.ndarray
+    hand_len: np.ndarray
+    deck: np.ndarray
+    deck_pos: np.ndarray
+    deck_end: np.ndarray
+    discard: np.ndarray
+    discard_len: np.ndarray
+    current: np.ndarray
+    direction: np.ndarray
+    damage: np.ndarray
+    status: np.ndarray
+    winner: np.ndarray
+    max_hand: np.ndarray
+    rng_seed: np.ndarray
+    rng_counter: np.ndarray
+    templates: list[CompactGameState]
+
+    @property
+    def size(self) -> int:
+        return len(self.templates)
+
+    @property
+    def player_count(self) -> int:
+        return self.hands.shape[1]
+
+
+@dataclass
+class BatchActions:
+    """One action per game: `kind` is NOOP/PLAY/DRAW/NEXT_TURN/APPLY_SPECIAL_EFFECT and `arg`
+    is the hand slot (PLAY), the amount (DRAW) or the effect card code (APPLY_SPECIAL_EFFECT).
+    PLAY always acts on the current player's hand."""
+
+    kind: np.ndarray
+    arg: np.ndarray
+
+
+def stack_games(states: Sequence[CompactGameState]) -> BatchGames:
+    if not states:
+        raise ValueError("stack_games requires at least one game")
+    player_count = len(states[0].hands)
+    if any(len(state.hands) != player_count for state in states):
+        raise ValueError("All games in a batch must have the same number of players")
+
+    n = len(states)
+    hands = np.full((n, player_count, SLOTS), EMPTY, dtype=np.uint8)
+    hand_len = np.zeros((n, player_count), dtype=np.int16)
+    deck = np.full((n, SLOTS), EMPTY, dtype=np.uint8)
+    deck_end = np.zeros(n, dtype=np.int16)
+    discard = np.full((n, SLOTS), EMPTY, dtype=np.uint8)
+    discard_len = np.zeros(n, dtype=np.int16)
+    for g, state in enumerate(states):
+        for p, hand in enumerate(state.hands):
+            hands[g, p, : len(hand)] = np.frombuffer(hand, dtype=np.uint8)
+            hand_len[g, p] = len(hand)
+        deck[g, : len(state.deck)] = np.frombuffer(state.deck, dtype=np.uint8)
+        deck_end[g] = len(state.deck)
+        discard[g, : len(state.discard)] = np.frombuffer(state.discard, dtype=np.uint8)
+        discard_len[g] = len(state.discard)
+
+    return BatchGames(
+        hands=hands,
+        hand_len=hand_len,
+        deck=deck,
+        deck_pos=np.zeros(n, dtype=np.int16),
+        deck_end=deck_end,
+        discard=discard,
+        discard_len=discard_len,
+        current=np.array([s.current for s in states], dtype=np.int16),
+        direction=np.array([s.direction for s in states], dtype=np.int8),
+        damage=np.array([s.damage for s in states], dtype=np.int32),
+        status=np.array([s.status for s in states], dtype=np.int8),
+        winner=np.array([s.winner for s in states], dtype=np.int16),
+        max_hand=np.array([s.settings["maxHandSize"] for s in states], dtype=np.int16),
+        rng_seed=np.array([s.rng["seed"] if s.rng else 0 for s in states], dtype=np.uint64),
+        rng_counter=np.array([s.rng["counter"] if s.rng else 0 for s in states], dtype=np.int64),
+        templates=list(states),
+    )
+
+
+def unstack_game(games: BatchGames, index: int) -> CompactGameState:
+    g = index
+    return replace(
+        games.templates[g],
+        hands=tuple(
+            games.hands[g, p, : games.hand_len[g, p]].tobytes() for p in range(games.player_count)
+        ),
+        deck=games.deck[g, games.deck_pos[g] : games.deck_end[g]].tobytes(),
+        discard=games.discard[g, : games.discard_len[g]].tobytes(),
+        current=int(games.current[g]),
+        direction=int(games.direction[g]),
+        damage=int(games.damage[g]),
+        status=int(games.status[g]),
+        winner=int(games.winner[g]),
+        rng=(
+            {"seed": int(games.rng_seed[g]), "counter": int(games.rng_counter[g])}
+            if games.templates[g].rng is not None
+            else None
+        ),
+    )
+
+
+def top_codes(games: BatchGames, rows: np.ndarray | None = None) -> np.ndarray:
+    rows = np.arange(games.size) if rows is None else rows
+    length = games.discard_len[rows]
+    tops = games.discard[rows, np.maximum(length - 1, 0)].astype(np.intp)
+    return np.where(length > 0, tops, NO_TOP)
+
+
+def current_hands(games: BatchGames, rows: np.ndarray | None = None) -> np.ndarray:
+    rows = np.arange(games.size) if rows is None else rows
+    return games.hands[rows, games.current[rows]]
+
+
+def legal_action_mask(
+    games: BatchGames, max_hand_size: int | None = None, rows: np.ndarray | None = None
+) -> np.ndarray:
+    """`(N, H + 1)` mask in the ONNX action layout: H hand slots of the current player, then draw.
+
+    Pass `rows` to compute the mask for a subset of games only (one mask row per entry).
+    """
+
+    rows = np.arange(games.size) if rows is None else rows
+    width = int(games.max_hand.max()) if max_hand_size is None else max_hand_size
+    damaged = (games.damage[rows] > 0).astype(np.intp)
+    codes = current_hands(games, rows)[:, :width].astype(np.intp)
+    mask = np.zeros((rows.size, width + 1), dtype=bool)
+    mask[:, : codes.shape[1]] = _PLAYABLE[
+        damaged[:, None], top_codes(games, rows)[:, None], codes
+    ]
+    mask[:, width] = games.hand_len[rows, games.current[rows]] < games.max_hand[rows]
+    return mask
+
+
+def batch_step(games: BatchGames, actions: BatchActions) -> None:
+    """Applies one action to every game still playing (other games ignore their action)."""
+
+    active = games.status == PLAYING
+    kind = actions.kind
+    arg = actions.arg.astype(np.intp)
+
+    _play(games, np.flatnonzero(active & (kind == PLAY)), arg)
+    _draw(games, np.flatnonzero(active & (kind == DRAW)), arg)
+
+    turn = np.flatnonzero(active & (kind == NEXT_TURN))
+    games.current[turn] = (games.current[turn] + games.direction[turn]) % games.player_count
+
+    effect = np.flatnonzero(active & (kind == APPLY_SPECIAL_EFFECT))
+    _apply_special_effects(games, effect, arg[effect])
+
+
+def _apply_special_effects(games: BatchGames, effect: np.ndarray, codes: np.ndarray) -> None:
+    games.current[effect] = (
+        games.current[effect] + _TURN_SHIFT[codes] * games.direction[effect]
+    ) % games.player_count
+    games.direction[effect] = np.where(
+        _REVERSES[codes], -games.direction[effect], games.direction[effect]
+    )
+    games.damage[effect] += _ATTACK[codes]
+
+
+def _play(games: BatchGames, g: np.ndarray, slots: np.ndarray) -> None:
+    if not g.size:
+        return
+    p = games.current[g]
+    slot = slots[g]
+    rows = games.hands[g, p]
+    played = rows[np.arange(g.size), slot]
+
+    cols = np.arange(SLOTS)[None, :]
+    source = np.minimum(cols + (cols >= slot[:, None]), SLOTS - 1)
+    shifted = np.take_along_axis(rows, source, axis=1)
+    shifted[:, -1] = EMPTY
+    games.hands[g, p] = shifted
+    games.hand_len[g, p] -= 1
+
+    games.discard[g, games.discard_len[g]] = played
+    games.discard_len[g] += 1
+
+    empty_hands = games.hand_len[g] == 0
+    finished = empty_hands.any(axis=1)
+    done = g[finished]
+    games.status[done] = FINISHED
+    games.winner[done] = np.argmax(empty_hands[finished], axis=1)
+
+
+def _draw(games: BatchGames, g: np.ndarray, amounts: np.ndarray) -> None:
+    if not g.size:
+        return
+    cur = games.current[g]
+    needed = np.minimum(amounts[g], games.max_hand[g] - games.hand_len[g, cur])
+    drawing = g[needed > 0]
+    remaining = needed[needed > 0]
+
+    refilled = np.zeros(games.size, dtype=bool)
+    while drawing.size:
+        # 스칼라 draw_card_status 와 같이 한 번의 드로우에서 리필은 최대 한 번
+        exhausted = drawing[
+            (games.deck_pos[drawing] >= games.deck_end[drawing]) & ~refilled[drawing]
+        ]
+        for game in exhausted:
+            _refill(games, int(game))
+        refilled[exhausted] = True
+        has_card = games.deck_pos[drawing] < games.deck_end[drawing]
+        drawing, remaining = drawing[has_card], remaining[has_card]
+        if not drawing.size:
+            break
+        p = games.current[drawing]
+        games.hands[drawing, p, games.hand_len[drawing, p]] = games.deck[
+            drawing, games.deck_pos[drawing]
+        ]
+        games.hand_len[drawing, p] += 1
+        games.deck_pos[drawing] += 1
+        remaining = remaining - 1
+        drawing, remaining = drawing[remaining > 0], remaining[remaining > 0]
+
+    games.damage[g] = 0
+
+
+def _refill(games: BatchGames, g: int) -> None:
+    # card_utils.refill_deck 과 같은 순서로 섞는다 (남은 덱 + 맨 위를 제외한 버린 카드, 위에서부터).
+    length = int(games.discard_len[g])
+    if not length:
+        return
+    cards = [
+        *games.deck[g, games.deck_pos[g] : games.deck_end[g]].tolist(),
+        *games.discard[g, : length - 1][::-1].tolist(),
+    ]
+    rng, next_state = next_random(
+        {"seed": int(games.rng_seed[g]), "counter": int(games.rng_counter[g])}
+    )
+    rng.shuffle(cards)
+    games.rng_counter[g] = next_state["counter"]
+    games.deck[g, : len(cards)] = cards
+    games.deck_pos[g] = 0
+    games.deck_end[g] = len(cards)
+    games.discard[g, 0] = games.discard[g, length - 1]
+    games.discard_len[g] = 1
+
+
+def rule_based_actions(games: BatchGames) -> BatchActions:
+    """Vectorized `find_playable_card_brute_force` turn choice for the current player:
+    the first playable card in hand order, otherwise draw max(1, damage)."""
+
+    kind = np.full(games.size, NOOP, dtype=np.int8)
+    arg = np.zeros(games.size, dtype=np.intp)
+    rows = np.flatnonzero(games.status == PLAYING)
+    if not rows.size:
+        return BatchActions(kind=kind, arg=arg)
+
+    playable = legal_action_mask(games, SLOTS, rows)[:, :SLOTS]
+    has_play = playable.any(axis=1) & (games.discard_len[rows] > 0)
+    kind[rows] = np.where(has_play, PLAY, DRAW)
+    arg[rows] = np.where(has_play, np.argmax(playable, axis=1), np.maximum(1, games.damage[rows]))
+    return BatchActions(kind=kind, arg=arg)
+
+
+def play_rule_based_turns(games: BatchGames) -> BatchActions:
+    """Plays one full built-in AI turn (play or draw, special effect, next turn) in every game."""
+
+    actions = rule_based_actions(games)
+    played = np.flatnonzero(actions.kind == PLAY)
+    played_codes = current_hands(games, played)[np.arange(played.size), actions.arg[played]]
+    acting = np.flatnonzero(actions.kind != NOOP)
+    batch_step(games, actions)
+
+    # 스칼라 AI 와 마찬가지로, 그 카드로 게임이 끝났어도 특수 효과는 적용한다.
+    special = _SPECIAL[played_codes]
+    _apply_special_effects(games, played[special], played_codes[special].astype(np.intp))
+
+    turn = acting[games.status[acting] == PLAYING]
+    games.current[turn] = (games.current[turn] + games.direction[turn]) % games.player_count
+    return actions
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from .types import PokerCard, RankValue, SuitValue
+
+# 카드 정수 코드: suit_index * 13 + (rank - 1) 로 0~51, 조커는 52/53.
+# create_deck 의 생성 순서와 동일하므로 코드 순서 = 새 덱 순서.
+CODE_SUITS: tuple[SuitValue, ...] = ("hearts", "diamonds", "clubs", "spades")
+RANKS_PER_SUIT = 13
+JOKER_CODES: tuple[int, int] = (52, 53)
+CARD_CODE_COUNT = 54
+
+CODE_BY_SUIT_RANK: dict[tuple[str, int], int] = {
+    (suit, rank): suit_index * RANKS_PER_SUIT + rank - 1
+    for suit_index, suit in enumerate(CODE_SUITS)
+    for rank in range(1, RANKS_PER_SUIT + 1)
+}
+
+
+class CanonicalCard(dict):
+    """Immutable shared card object; one instance per code is reused by every game.
+
+    It is still a plain `PokerCard` dict for readers and JSON, but mutation raises and
+    copying/pickling returns the same canonical instance.
+    """
+
+    __slots__ = ("code",)
+
+    def __init__(self, code: int, fields: PokerCard) -> None:
+        super().__init__(fields)
+        self.code = code
+
+    def _immutable(self, *args: object, **kwargs: object) -> None:
+        raise TypeError("Canonical cards are immutable; build a new dict instead.")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _immutable  # type: ignore[assignment]
+    __ior__ = _immutable  # type: ignore[assignment]
+
+    def __copy__(self) -> CanonicalCard:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> CanonicalCard:
+        return self
+
+    def __reduce__(self):
+        return (canonical_card, (self.code,))
+
+
+def _canonical_fields(code: int) -> PokerCard:
+    if code >= JOKER_CODES[0]:
+        return {
+            "id": f"joker-{code - JOKER_CODES[0] + 1}",
+            "isJoker": True,
+            "isFlipped": True,
+            "draggable": False,
+        }
+    suit = CODE_SUITS[code // RANKS_PER_SUIT]
+    rank = code % RANKS_PER_SUIT + 1
+    return {
+        "id": f"{suit}-{rank}",
+        "suit": suit,
+        "rank": rank,
+        "isJoker": False,
+        "isFlipped": True,
+        "draggable": False,
+    }
+
+
+CANONICAL_CARDS: tuple[CanonicalCard, ...] = tuple(
+    CanonicalCard(code, _canonical_fields(code)) for code in range(CARD_CODE_COUNT)
+)
+
+
+def canonical_card(code: int) -> CanonicalCard:
+    return CANONICAL_CARDS[code]
+
+
+def encode_card(card: PokerCard) -> int | None:
+    """Returns the joker-agnostic code of a card, or None when it is not a standard card."""
+
+    if card.__class__ is CanonicalCard:
+        code = card.code  # type: ignore[attr-defined]
+        return code if code < JOKER_CODES[0] else JOKER_CODES[0]
+    if card.get("isJoker"):
+        return JOKER_CODES[0]
+    return CODE_BY_SUIT_RANK.get((card.get("suit"), card.get("rank")))  # type: ignore[arg-type]
+
+
+def is_joker_code(code: int) -> bool:
+    return code >= JOKER_CODES[0]
+
+
+def code_rank(code: int) -> RankValue | None:
+    if is_joker_code(code):
+        return None
+    return code % RANKS_PER_SUIT + 1
+
+
+def code_suit(code: int) -> SuitValue | None:
+    if is_joker_code(code):
+        return None
+    return CODE_SUITS[code // RANKS_PER_SUIT]
+
+
+def code_to_card_fields(code: int) -> PokerCard:
+    """Rank/suit/joker fields of a code (no id); enough to evaluate card rules."""
+
+    if is_joker_code(code):
+        return {"isJoker": True}
+    return {"isJoker": False, "rank": code_rank(code), "suit": code_suit(code)}
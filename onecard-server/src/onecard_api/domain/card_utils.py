@@ -1,9 +1,18 @@
 from __future__ import annotations
 
 import random
-import uuid
-from typing import Iterable
-
+from typing import Iterable, Sequence
+
+from .card_codes import (
+    CANONICAL_CARDS,
+    CARD_CODE_COUNT,
+    CODE_BY_SUIT_RANK,
+    JOKER_CODES,
+    CanonicalCard,
+    code_to_card_fields,
+    encode_card,
+)
+from .discard_pile import EMPTY_DISCARD_PILE, DiscardPile
 from .types import Direction, GameState, Player, PokerCard, RankValue, SuitValue
 
 SUIT_VALUES: tuple[SuitValue, ...] = ("hearts", "diamonds", "clubs", "spades")
@@ -11,55 +20,30 @@ RANK_VALUES: tuple[RankValue, ...] = tuple(range(1, 14))  # 1~13
 
 
 def create_deck(include_jokers: bool) -> list[PokerCard]:
-    deck: list[PokerCard] = [
-        {
-            "id": str(uuid.uuid4()),
-            "suit": suit,
-            "rank": rank,
-            "isJoker": False,
-            "isFlipped": True,
-            "draggable": False,
-        }
-        for suit in SUIT_VALUES
-        for rank in RANK_VALUES
-    ]
-
-    if include_jokers:
-        deck.append(
-            {
-                "id": str(uuid.uuid4()),
-                "isJoker": True,
-                "isFlipped": True,
-                "draggable": False,
-            }
-        )
-        deck.append(
-            {
-                "id": str(uuid.uuid4()),
-                "isJoker": True,
-                "isFlipped": True,
-                "draggable": False,
-            }
-        )
+    # 모든 게임이 같은 54장의 불변 카드 객체를 공유한다 (id 는 "hearts-1", "joker-2" 처럼 고정).
+    count = CARD_CODE_COUNT if include_jokers else JOKER_CODES[0]
+    return list(CANONICAL_CARDS[:count])
 
-    return deck
 
-
-def shuffle_deck(deck: Iterable[PokerCard]) -> list[PokerCard]:
+def shuffle_deck(
+    deck: Iterable[PokerCard], rng: random.Random | None = None
+) -> list[PokerCard]:
+    # rng 를 넘기지 않으면 전역 random 을 사용한다 (게임별 시드가 없는 기존 상태 호환).
     shuffled = list(deck)
-    random.shuffle(shuffled)
+    (rng or random).shuffle(shuffled)
     return shuffled
 
 
 def refill_deck(
-    current_deck: list[PokerCard], discard_pile: list[PokerCard]
-) -> dict[str, list[PokerCard]]:
+    current_deck: list[PokerCard],
+    discard_pile: Sequence[PokerCard],
+    rng: random.Random | None = None,
+) -> dict:
     if not discard_pile:
-        return {"new_deck": list(current_deck), "new_discard_pile": []}
+        return {"new_deck": list(current_deck), "new_discard_pile": EMPTY_DISCARD_PILE}
 
-    cards_to_shuffle = [*current_deck, *discard_pile[1:]]
-    shuffled_deck = shuffle_deck(cards_to_shuffle)
-    new_discard_pile = [discard_pile[0]]
+    new_discard_pile, below_top = DiscardPile.coerce(discard_pile).split_top()
+    shuffled_deck = shuffle_deck([*current_deck, *below_top], rng)
     return {"new_deck": shuffled_deck, "new_discard_pile": new_discard_pile}
 
 
@@ -78,15 +62,13 @@ def deal_cards(
     return updated_players, updated_deck
 
 
-def is_able_to_block(played_card: PokerCard, top_card: PokerCard) -> bool:
-    if top_card.get("rank") == 2:
-        return played_card.get("rank") == 2 or (
-            played_card.get("suit") == top_card.get("suit")
-            and played_card.get("rank") == 1
-        )
-    if top_card.get("rank") == 1:
-        return played_card.get("rank") == 1
-    return bool(played_card.get("isJoker"))
+SPECIAL_RANKS: frozenset[int] = frozenset({1, 2, 11, 12, 13})
+
+
+def has_special_effect(card: PokerCard) -> bool:
+    if card.get("isJoker"):
+        return True
+    return card.get("rank") in SPECIAL_RANKS
 
 
 def attack_value(card: PokerCard) -> int:
@@ -113,13 +95,24 @@ def turn_special_effect(card: PokerCard, state: GameState) -> int:
     return state["currentPlayerIndex"]
 
 
-def is_valid_play(
+def _is_able_to_block_rule(played_card: PokerCard, top_card: PokerCard) -> bool:
+    if top_card.get("rank") == 2:
+        return played_card.get("rank") == 2 or (
+            played_card.get("suit") == top_card.get("suit")
+            and played_card.get("rank") == 1
+        )
+    if top_card.get("rank") == 1:
+        return played_card.get("rank") == 1
+    return bool(played_card.get("isJoker"))
+
+
+def _is_valid_play_rule(
     played_card: PokerCard, top_card: PokerCard, damage: int
 ) -> bool:
     if played_card.get("isJoker"):
         return True
     if damage > 0:
-        return is_able_to_block(played_card, top_card)
+        return _is_able_to_block_rule(played_card, top_card)
     if top_card.get("isJoker"):
         return True
 
@@ -133,6 +126,94 @@ def is_valid_play(
     ) == top_card.get("suit")
 
 
+def _build_code_masks(rule) -> tuple[int, ...]:
+    # top 코드별로, 규칙을 만족하는 played 코드들의 비트마스크
+    cards = [code_to_card_fields(code) for code in range(CARD_CODE_COUNT)]
+    return tuple(
+        sum(1 << played for played in range(CARD_CODE_COUNT) if rule(cards[played], top))
+        for top in cards
+    )
+
+
+BLOCKER_MASKS: tuple[int, ...] = _build_code_masks(_is_able_to_block_rule)
+# PLAYABLE_MASKS[damage > 0][top_code] -> 낼 수 있는 카드 코드 비트마스크
+PLAYABLE_MASKS: tuple[tuple[int, ...], tuple[int, ...]] = (
+    _build_code_masks(lambda played, top: _is_valid_play_rule(played, top, 0)),
+    _build_code_masks(lambda played, top: _is_valid_play_rule(played, top, 1)),
+)
+ALL_CODES_MASK = (1 << CARD_CODE_COUNT) - 1
+
+
+def hand_mask(hand: Iterable[PokerCard]) -> int:
+    mask = 0
+    for card in hand:
+        code = encode_card(card)
+        if code is not None:
+            mask |= 1 << code
+    return mask
+
+
+def playable_code_mask(top_card: PokerCard | None, damage: int) -> int | None:
+    """Bitmask of playable card codes, or None when the top card has no code."""
+
+    if top_card is None:
+        return ALL_CODES_MASK
+    top_code = encode_card(top_card)
+    if top_code is None:
+        return None
+    return PLAYABLE_MASKS[damage > 0][top_code]
+
+
+def playable_indices(
+    hand: list[PokerCard], top_card: PokerCard | None, damage: int
+) -> list[int]:
+    allowed = playable_code_mask(top_card, damage)
+    if allowed is None:
+        return [
+            idx
+            for idx, card in enumerate(hand)
+            if _is_valid_play_rule(card, top_card, damage)  # type: ignore[arg-type]
+        ]
+    indices: list[int] = []
+    code_by_suit_rank = CODE_BY_SUIT_RANK  # 카드마다 encode_card 호출 비용을 피하려고 인라인
+    for idx, card in enumerate(hand):
+        if card.__class__ is CanonicalCard:
+            code = min(card.code, JOKER_CODES[0])  # type: ignore[attr-defined]
+        elif card.get("isJoker"):
+            code = JOKER_CODES[0]
+        else:
+            code = code_by_suit_rank.get((card.get("suit"), card.get("rank")))  # type: ignore[arg-type]
+        if code is None:
+            if _is_valid_play_rule(card, top_card, damage):  # type: ignore[arg-type]
+                indices.append(idx)
+        elif allowed >> code & 1:
+            indices.append(idx)
+    return indices
+
+
+def playable_code_indices(hand_codes: bytes, top_code: int, damage: int) -> list[int]:
+    allowed = PLAYABLE_MASKS[damage > 0][top_code]
+    return [idx for idx, code in enumerate(hand_codes) if allowed >> code & 1]
+
+
+def is_able_to_block(played_card: PokerCard, top_card: PokerCard) -> bool:
+    played_code = encode_card(played_card)
+    top_code = encode_card(top_card)
+    if played_code is None or top_code is None:
+        return _is_able_to_block_rule(played_card, top_card)
+    return bool(BLOCKER_MASKS[top_code] >> played_code & 1)
+
+
+def is_valid_play(
+    played_card: PokerCard, top_card: PokerCard, damage: int
+) -> bool:
+    played_code = encode_card(played_card)
+    top_code = encode_card(top_card)
+    if played_code is None or top_code is None:
+        return _is_valid_play_rule(played_card, top_card, damage)
+    return bool(PLAYABLE_MASKS[damage > 0][top_code] >> played_code & 1)
+
+
 def check_winner(players: Iterable[Player]) -> Player | None:
     for player in players:
         if len(player.get("hand", [])) == 0:
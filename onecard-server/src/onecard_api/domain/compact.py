@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, replace
+from typing import Any, Iterable
+
+from .card_codes import (
+    CARD_CODE_COUNT,
+    JOKER_CODES,
+    CanonicalCard,
+    code_to_card_fields,
+    encode_card,
+)
+from .card_utils import attack_value, change_direction
+from .discard_pile import DiscardPile
+from .rng import next_random
+from .types import GameSettings, GameState, Player, PokerCard, RngState
+from .zobrist import compute_state_hash
+
+GameAction = dict[str, Any]
+
+STATUS_CODES: tuple[str, ...] = ("waiting", "playing", "finished")
+WAITING, PLAYING, FINISHED = range(3)
+CLOCKWISE, COUNTERCLOCKWISE = 1, -1
+
+# 코드별 특수 효과 테이블: card_utils 규칙 함수에서 그대로 유도해 규칙이 한 곳에만 존재하도록 한다.
+ATTACK_BY_CODE: tuple[int, ...] = tuple(
+    attack_value(code_to_card_fields(code)) for code in range(CARD_CODE_COUNT)
+)
+REVERSES_BY_CODE: tuple[bool, ...] = tuple(
+    change_direction(code_to_card_fields(code), "clockwise") != "clockwise"
+    for code in range(CARD_CODE_COUNT)
+)
+# +1: 다음 플레이어로 건너뜀(J), -1: 이전 플레이어로 되돌림(K), 0: 변화 없음
+TURN_SHIFT_BY_CODE: tuple[int, ...] = tuple(
+    {11: 1, 13: -1}.get(code_to_card_fields(code).get("rank"), 0)  # type: ignore[arg-type]
+    for code in range(CARD_CODE_COUNT)
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CompactGameState:
+    """Integer-coded game state; hands/deck/discard are immutable byte strings of card codes.
+
+    `deck[0]` is the next card to draw and `discard[-1]` is the top card. `cards` maps each
+    code back to the original `PokerCard` object so the dict state can be rebuilt losslessly.
+    `hashed` records whether the dict state carried a Zobrist hash, which is then recomputed
+    on the way back.
+    """
+
+    hands: tuple[bytes, ...]
+    deck: bytes
+    discard: bytes
+    current: int
+    direction: int
+    damage: int
+    status: int
+    winner: int
+    players: tuple[Player, ...]
+    settings: GameSettings
+    cards: tuple[PokerCard | None, ...]
+    rng: RngState | None = None
+    hashed: bool = False
+
+
+def to_compact(state: GameState) -> CompactGameState:
+    cards: list[PokerCard | None] = [None] * CARD_CODE_COUNT
+    seen_ids: dict[str, int] = {}
+
+    def encode(card: PokerCard) -> int:
+        if card.__class__ is CanonicalCard:
+            # 공유 카드는 코드가 고유하므로 id 조회 없이 바로 쓴다.
+            code = card.code  # type: ignore[attr-defined]
+            cards[code] = card
+            return code
+        card_id = card.get("id")
+        if card_id is not None and card_id in seen_ids:
+            return seen_ids[card_id]
+        code = encode_card(card)
+        if code is None:
+            raise ValueError(f"Card {card!r} cannot be represented in the compact engine.")
+        if code == JOKER_CODES[0] and cards[code] is not None:
+            code = JOKER_CODES[1]
+        if cards[code] is not None:
+            raise ValueError(f"Duplicate card code {code} for card {card!r}.")
+        cards[code] = card
+        if card_id is not None:
+            seen_ids[card_id] = code
+        return code
+
+    def encode_all(pile: Iterable[PokerCard]) -> bytes:
+        return bytes(encode(card) for card in pile)
+
+    players = state["players"]
+    hands = tuple(encode_all(player.get("hand", [])) for player in players)
+    deck = encode_all(state["deck"])
+    discard = encode_all(state["discardPile"])[::-1]
+
+    winner = state.get("winner")
+    winner_index = -1
+    if winner is not None:
+        winner_index = next(
+            (idx for idx, player in enumerate(players) if player.get("id") == winner.get("id")),
+            -1,
+        )
+
+    return CompactGameState(
+        hands=hands,
+        deck=deck,
+        discard=discard,
+        current=state["currentPlayerIndex"],
+        direction=CLOCKWISE if state["direction"] == "clockwise" else COUNTERCLOCKWISE,
+        damage=state["damage"],
+        status=STATUS_CODES.index(state["gameStatus"]),
+        winner=winner_index,
+        players=tuple(
+            {key: value for key, value in player.items() if key != "hand"}  # type: ignore[misc]
+            for player in players
+        ),
+        settings=state["settings"],
+        cards=tuple(cards),
+        rng=state.get("rng"),
+        hashed="zobrist" in state,
+    )
+
+
+def from_compact(compact: CompactGameState) -> GameState:
+    cards = compact.cards
+
+    def decode_all(codes: Iterable[int]) -> list[PokerCard]:
+        return [cards[code] for code in codes]  # type: ignore[misc]
+
+    players: list[Player] = [
+        {**meta, "hand": decode_all(hand)} for meta, hand in zip(compact.players, compact.hands)
+    ]
+    state: GameState = {
+        "players": players,
+        "currentPlayerIndex": compact.current,
+        "deck": decode_all(compact.deck),
+        "discardPile": DiscardPile.from_cards(decode_all(reversed(compact.discard))),
+        "direction": "clockwise" if compact.direction == CLOCKWISE else "counterclockwise",
+        "damage": compact.damage,
+        "gameStatus": STATUS_CODES[compact.status],  # type: ignore[typeddict-item]
+        "settings": compact.settings,
+        "winner": players[compact.winner] if compact.winner >= 0 else None,
+    }
+    if compact.rng is not None:
+        state["rng"] = compact.rng
+    if compact.hashed:
+        state["zobrist"] = compute_state_hash(state)
+    return state
+
+
+def transition_compact_state(state: CompactGameState, action: GameAction) -> CompactGameState:
+    """Compact counterpart of `transitions.transition_game_state` (START_GAME excluded)."""
+
+    action_type = action.get("type")
+    payload = action.get("payload") or {}
+    if action_type == "PLAY_CARD":
+        return play_card_compact(
+            state, int(payload.get("playerIndex", -1)), int(payload.get("cardIndex", -1))
+        )
+    if action_type == "DRAW_CARD":
+        return draw_card_compact(state, int(payload.get("amount", 1)))
+    if action_type == "NEXT_TURN":
+        return next_turn_compact(state)
+    if action_type == "APPLY_SPECIAL_EFFECT":
+        effect_card = payload.get("effectCard")
+        if effect_card is None:
+            return state
+        code = encode_card(effect_card)
+        if code is None:
+            raise ValueError(f"Effect card {effect_card!r} has no compact code.")
+        return apply_special_effect_compact(state, code)
+    if action_type == "END_GAME":
+        return end_game_compact(state, int(payload.get("winnerIndex", 0)))
+    if action_type == "START_GAME":
+        raise ValueError("START_GAME must be applied on the dict state.")
+    return state
+
+
+def play_card_compact(state: CompactGameState, player_index: int, card_index: int) -> CompactGameState:
+    hand = state.hands[player_index]
+    played = hand[card_index]
+    hands = (
+        *state.hands[:player_index],
+        hand[:card_index] + hand[card_index + 1 :],
+        *state.hands[player_index + 1 :],
+    )
+    discard = state.discard + bytes((played,))
+    winner = next((idx for idx, h in enumerate(hands) if not h), -1)
+    if winner >= 0:
+        return replace(state, hands=hands, discard=discard, status=FINISHED, winner=winner)
+    return replace(state, hands=hands, discard=discard)
+
+
+def play_turn_compact(state: CompactGameState, player_index: int, card_index: int) -> CompactGameState:
+    """Play + special effect + next turn, building the output state once.
+
+    Search rollouts call this in their inner loop, so it avoids the per-field cost of
+    chaining `dataclasses.replace` three times.
+    """
+
+    hand = state.hands[player_index]
+    played = hand[card_index]
+    hands = (
+        *state.hands[:player_index],
+        hand[:card_index] + hand[card_index + 1 :],
+        *state.hands[player_index + 1 :],
+    )
+    count = len(hands)
+    direction = state.direction
+    current = (state.current + TURN_SHIFT_BY_CODE[played] * direction) % count
+    if REVERSES_BY_CODE[played]:
+        direction = -direction
+    status, winner = state.status, state.winner
+    if b"" in hands:
+        status, winner = FINISHED, hands.index(b"")
+    else:
+        current = (current + direction) % count
+    return CompactGameState(
+        hands,
+        state.deck,
+        state.discard + bytes((played,)),
+        current,
+        direction,
+        state.damage + ATTACK_BY_CODE[played],
+        status,
+        winner,
+        state.players,
+        state.settings,
+        state.cards,
+        state.rng,
+        state.hashed,
+    )
+
+
+def draw_turn_compact(state: CompactGameState, amount: int) -> CompactGameState:
+    hands, deck, discard, rng_state = _draw_cards(state, amount)
+    current = state.current
+    if state.status != FINISHED:
+        current = (current + state.direction) % len(hands)
+    return CompactGameState(
+        hands,
+        deck,
+        discard,
+        current,
+        state.direction,
+        0,
+        state.status,
+        state.winner,
+        state.players,
+        state.settings,
+        state.cards,
+        rng_state,
+        state.hashed,
+    )
+
+
+def draw_card_compact(state: CompactGameState, amount: int) -> CompactGameState:
+    hands, deck, discard, rng_state = _draw_cards(state, amount)
+    return replace(state, hands=hands, deck=deck, discard=discard, damage=0, rng=rng_state)
+
+
+def _draw_cards(
+    state: CompactGameState, amount: int
+) -> tuple[tuple[bytes, ...], bytes, bytes, RngState | None]:
+    current = state.current
+    hand = state.hands[current]
+    deck, discard, rng_state = state.deck, state.discard, state.rng
+    needed = min(amount, state.settings["maxHandSize"] - len(hand))
+    if needed <= 0:
+        return state.hands, deck, discard, rng_state
+
+    drawn = deck[:needed]
+    deck = deck[needed:]
+    if len(drawn) < needed:
+        rng = None
+        if rng_state is not None and discard:
+            rng, rng_state = next_random(rng_state)
+        deck, discard = refill_compact_deck(deck, discard, rng)
+        rest = needed - len(drawn)
+        drawn += deck[:rest]
+        deck = deck[rest:]
+
+    hands = (*state.hands[:current], hand + drawn, *state.hands[current + 1 :])
+    return hands, deck, discard, rng_state
+
+
+def refill_compact_deck(
+    deck: bytes, discard: bytes, rng: random.Random | None = None
+) -> tuple[bytes, bytes]:
+    if not discard:
+        return deck, discard
+    # card_utils.refill_deck 과 같은 순서(덱 + 맨 위를 제외한 버린 카드, 위에서부터)로 섞어야
+    # 같은 시드에서 dict 엔진과 동일한 결과가 나온다.
+    cards = [*deck, *discard[-2::-1]]
+    (rng or random).shuffle(cards)
+    return bytes(cards), discard[-1:]
+
+
+def next_turn_compact(state: CompactGameState) -> CompactGameState:
+    return replace(state, current=(state.current + state.direction) % len(state.hands))
+
+
+def apply_special_effect_compact(state: CompactGameState, effect_code: int) -> CompactGameState:
+    shift = TURN_SHIFT_BY_CODE[effect_code]
+    direction = state.direction
+    return replace(
+        state,
+        current=(state.current + shift * direction) % len(state.hands),
+        direction=-direction if REVERSES_BY_CODE[effect_code] else direction,
+        damage=state.damage + ATTACK_BY_CODE[effect_code],
+    )
+
+
+def end_game_compact(state: CompactGameState, winner_index: int) -> CompactGameState:
+    return replace(state, status=FINISHED, winner=winner_index)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from typing import overload
+
+from .types import PokerCard
+
+
+class DiscardPile(Sequence[PokerCard]):
+    """Immutable, structurally shared stack of discarded cards (index 0 is the top card).
+
+    Reading or pushing the top card is O(1) and never copies the cards below it, so every
+    state produced by a transition can share the pile of the previous state. It behaves
+    like the old top-first list for reads (`pile[0]`, `len`, iteration, `==` with a list).
+    """
+
+    __slots__ = ("_top", "_below", "_size")
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(
+        self, top: PokerCard | None = None, below: DiscardPile | None = None
+    ) -> None:
+        self._top = top
+        self._below = below
+        self._size = 0 if top is None else 1 + (len(below) if below is not None else 0)
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[PokerCard]) -> DiscardPile:
+        """Builds a pile from cards given top first, like the `discardPile` JSON list."""
+
+        pile = EMPTY_DISCARD_PILE
+        for card in reversed(list(cards)):
+            pile = pile.push(card)
+        return pile
+
+    @classmethod
+    def coerce(cls, cards: Iterable[PokerCard]) -> DiscardPile:
+        if isinstance(cards, DiscardPile):
+            return cards
+        return cls.from_cards(cards)
+
+    @property
+    def top(self) -> PokerCard | None:
+        return self._top
+
+    def push(self, card: PokerCard) -> DiscardPile:
+        return DiscardPile(card, self if self._size else None)
+
+    def split_top(self) -> tuple[DiscardPile, list[PokerCard]]:
+        """Returns a pile holding only the top card, and every other card (top first)."""
+
+        if not self._size:
+            return EMPTY_DISCARD_PILE, []
+        below = list(self._below) if self._below is not None else []
+        return DiscardPile(self._top), below
+
+    def to_list(self) -> list[PokerCard]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[PokerCard]:
+        node: DiscardPile | None = self
+        while node is not None and node._size:
+            yield node._top  # type: ignore[misc]
+            node = node._below
+
+    def __reversed__(self) -> Iterator[PokerCard]:
+        return reversed(self.to_list())
+
+    @overload
+    def __getitem__(self, index: int) -> PokerCard: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[PokerCard]: ...
+
+    def __getitem__(self, index: int | slice) -> PokerCard | list[PokerCard]:
+        if isinstance(index, slice):
+            return self.to_list()[index]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("discard pile index out of range")
+        node = self
+        for _ in range(index):
+            node = node._below  # type: ignore[assignment]
+        return node._top  # type: ignore[return-value]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, DiscardPile) and other is self:
+            return True
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(other) == self._size and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"DiscardPile({self.to_list()!r})"
+
+    def __reduce__(self):
+        return (DiscardPile.from_cards, (self.to_list(),))
+
+
+EMPTY_DISCARD_PILE = DiscardPile()
@@ -2,9 +2,19 @@ from __future__ import annotations
 
 from typing import Any, Iterable
 
+from .card_utils import has_special_effect
+from .compact import (
+    draw_turn_compact,
+    from_compact,
+    play_turn_compact,
+    to_compact,
+    transition_compact_state,
+)
+from .legal_actions import LegalActions, legal_actions, legal_actions_scope
 from .state import create_game_state, initialize_game_state, start_game
-from .transitions import transition_game_state
+from .transitions import draw_turn_status, play_turn_status, transition_game_state
 from .types import GameSettings, GameState, PokerCard
+from .zobrist import StateHash, state_hash
 
 GameAction = dict[str, Any]
 
@@ -27,6 +37,78 @@ def step(state: GameState, action: GameAction) -> dict[str, Any]:
     return {"state": next_state, "done": done, "info": {"action": action}}
 
 
+def compact_step(state: GameState, action: GameAction) -> dict[str, Any]:
+    """Same contract as `step`, but runs the transition on the integer-coded engine."""
+
+    if action.get("type") == "START_GAME":
+        return step(state, action)
+    try:
+        compact = to_compact(state)
+        next_state = from_compact(transition_compact_state(compact, action))
+    except ValueError:
+        # 코드로 표현할 수 없는 카드(임의 effectCard 등)가 섞이면 dict 엔진으로 처리한다.
+        return step(state, action)
+    done = next_state.get("gameStatus") == "finished"
+    return {"state": next_state, "done": done, "info": {"action": action}}
+
+
+def play_turn(state: GameState, action: GameAction) -> dict[str, Any]:
+    """Applies a whole turn in one pass: the PLAY_CARD/DRAW_CARD action, the special effect
+    of the played card and NEXT_TURN.
+
+    `info["actions"]` lists the constituent actions in the order `step` would apply them, so
+    the result matches calling `step` for each of them in turn.
+    """
+
+    return _turn_result(state, action, _transition_turn(state, action))
+
+
+def compact_play_turn(state: GameState, action: GameAction) -> dict[str, Any]:
+    """Same contract as `play_turn`, converting to the integer-coded engine only once."""
+
+    action_type = action.get("type")
+    if action_type not in ("PLAY_CARD", "DRAW_CARD"):
+        return play_turn(state, action)
+    payload = action.get("payload") or {}
+    try:
+        compact = to_compact(state)
+        if action_type == "PLAY_CARD":
+            compact = play_turn_compact(
+                compact, int(payload.get("playerIndex", -1)), int(payload.get("cardIndex", -1))
+            )
+        else:
+            compact = draw_turn_compact(compact, int(payload.get("amount", 1)))
+        next_state = from_compact(compact)
+    except ValueError:
+        return play_turn(state, action)
+    return _turn_result(state, action, next_state)
+
+
+def _transition_turn(state: GameState, action: GameAction) -> GameState:
+    payload = action.get("payload") or {}
+    action_type = action.get("type")
+    if action_type == "PLAY_CARD":
+        return play_turn_status(
+            state, int(payload.get("playerIndex", -1)), int(payload.get("cardIndex", -1))
+        )
+    if action_type == "DRAW_CARD":
+        return draw_turn_status(state, int(payload.get("amount", 1)))
+    raise ValueError(f"play_turn expects PLAY_CARD or DRAW_CARD, got {action_type!r}")
+
+
+def _turn_result(state: GameState, action: GameAction, next_state: GameState) -> dict[str, Any]:
+    actions: list[GameAction] = [action]
+    if action.get("type") == "PLAY_CARD":
+        payload = action.get("payload") or {}
+        played_card = state["players"][int(payload["playerIndex"])]["hand"][int(payload["cardIndex"])]
+        if has_special_effect(played_card):
+            actions.append(apply_special_effect_action(played_card))
+    done = next_state.get("gameStatus") == "finished"
+    if not done:
+        actions.append(next_turn_action())
+    return {"state": next_state, "done": done, "info": {"action": action, "actions": actions}}
+
+
 def apply_actions(state: GameState, actions: Iterable[GameAction]) -> dict[str, Any]:
     result: dict[str, Any] = {"state": state, "done": False}
     for action in actions:
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from .card_utils import playable_indices
+from .types import GameState
+
+
+@dataclass(frozen=True, slots=True)
+class LegalActions:
+    """Playable hand indices and draw legality of one player in one state."""
+
+    player_index: int
+    play_indices: tuple[int, ...]
+    hand_size: int
+    can_draw: bool
+    draw_amount: int
+
+    def can_play(self, card_index: int) -> bool:
+        return card_index in self.play_indices
+
+
+# 상태는 전이마다 새 dict 로 만들어지고 이후 변경되지 않으므로 객체 identity 로 캐시한다.
+# 항목이 상태를 함께 붙잡고 있어 id 가 재사용되어도 다른 상태와 섞이지 않는다. 캐시는 범위
+# (요청 하나) 안에서만 살아 있으므로 상태를 오래 붙잡거나 다른 게임/스레드와 공유하지 않는다.
+_memo: ContextVar[dict[tuple[int, int], tuple[GameState, LegalActions]] | None] = ContextVar(
+    "legal_actions_memo", default=None
+)
+
+
+@contextmanager
+def legal_actions_scope() -> Iterator[None]:
+    """Memoizes `legal_actions` per state until the block exits; nested scopes share the outer one.
+
+    Open one around a unit of work (one request) so that validation, masking and AI
+    selection compute the legal moves of a state once. The memo follows the context into
+    `run_in_threadpool` and tasks created inside the block.
+    """
+
+    if _memo.get() is not None:
+        yield
+        return
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def legal_actions(state: GameState, player_index: int | None = None) -> LegalActions:
+    """Legal moves of `player_index` (default: the current player), computed once per state
+    inside a `legal_actions_scope`.
+
+    With an empty discard pile every card is playable, matching the action mask. Drawing is
+    legal while the hand is below `settings.maxHandSize`.
+    """
+
+    index = state.get("currentPlayerIndex", 0) if player_index is None else player_index
+    memo = _memo.get()
+    key = (id(state), index)
+    if memo is not None:
+        entry = memo.get(key)
+        if entry is not None and entry[0] is state:
+            return entry[1]
+
+    players = state.get("players") or []
+    hand = players[index].get("hand", []) if 0 <= index < len(players) else []
+    discard_pile = state.get("discardPile")
+    top_card = discard_pile[0] if discard_pile else None
+    damage = state.get("damage", 0)
+    max_hand_size = (state.get("settings") or {}).get("maxHandSize")
+    result = LegalActions(
+        player_index=index,
+        play_indices=tuple(playable_indices(hand, top_card, damage)),
+        hand_size=len(hand),
+        can_draw=max_hand_size is None or len(hand) < max_hand_size,
+        draw_amount=max(1, damage),
+    )
+
+    if memo is not None:
+        memo[key] = (state, result)
+    return result
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from .card_utils import is_valid_play
+from .card_utils import playable_indices
 from .types import AIDifficulty, Player, PokerCard
 
 
@@ -33,7 +33,5 @@ def create_ai_player(
 def find_playable_card_brute_force(
     hand: list[PokerCard], top_card: PokerCard, damage: int
 ) -> PokerCard | None:
-    for card in hand:
-        if is_valid_play(card, top_card, damage):
-            return card
-    return None
+    indices = playable_indices(hand, top_card, damage)
+    return hand[indices[0]] if indices else None
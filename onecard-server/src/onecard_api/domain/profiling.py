@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from . import transitions
+from .types import GameState
+
+GameAction = dict[str, Any]
+
+
+@dataclass(slots=True)
+class ActionStats:
+    count: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    alloc_bytes: int = 0  # tracemalloc 로 잰 순 증가량 합
+    max_alloc_bytes: int = 0
+    alloc_samples: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "count": self.count,
+            "totalMs": round(self.total_ns / 1e6, 3),
+            "meanUs": round(self.total_ns / self.count / 1e3, 3) if self.count else 0.0,
+            "maxUs": round(self.max_ns / 1e3, 3),
+        }
+        if self.alloc_samples:
+            data["allocBytes"] = self.alloc_bytes
+            data["meanAllocBytes"] = round(self.alloc_bytes / self.alloc_samples, 1)
+            data["maxAllocBytes"] = self.max_alloc_bytes
+        return data
+
+
+class TransitionProfiler:
+    """Per-action-type counters and latency of `transition_game_state`.
+
+    Installed only while enabled: a disabled profiler leaves a single `is None` check in the
+    transition. With `track_allocations` every transition also records the net traced-memory
+    delta; tracemalloc is started if needed (and stopped again on disable), which slows
+    every allocation in the process, so keep it for short investigations. Allocation deltas
+    include whatever other threads allocate meanwhile.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, ActionStats] = {}
+        self._track_allocations = False
+        self._started_tracemalloc = False
+        self._enabled = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def track_allocations(self) -> bool:
+        return self._track_allocations
+
+    def enable(self, track_allocations: bool = False) -> None:
+        if track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        elif not track_allocations:
+            self._stop_tracemalloc()
+        self._track_allocations = track_allocations
+        self._enabled = True
+        transitions.set_transition_profiler(self)
+
+    def disable(self) -> None:
+        transitions.set_transition_profiler(None)
+        self._enabled = False
+        self._track_allocations = False
+        self._stop_tracemalloc()
+
+    def _stop_tracemalloc(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def measure(
+        self,
+        transition: Callable[[GameState, GameAction], GameState],
+        state: GameState,
+        action: GameAction,
+    ) -> GameState:
+        track = self._track_allocations and tracemalloc.is_tracing()
+        before = tracemalloc.get_traced_memory()[0] if track else 0
+        started = time.perf_counter_ns()
+        try:
+            return transition(state, action)
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            allocated = tracemalloc.get_traced_memory()[0] - before if track else None
+            self._record(str(action.get("type")), elapsed, allocated)
+
+    def _record(self, action_type: str, elapsed_ns: int, allocated: int | None) -> None:
+        with self._lock:
+            stats = self._stats.get(action_type)
+            if stats is None:
+                stats = self._stats[action_type] = ActionStats()
+            stats.count += 1
+            stats.total_ns += elapsed_ns
+            if elapsed_ns > stats.max_ns:
+                stats.max_ns = elapsed_ns
+            if allocated is not None:
+                stats.alloc_samples += 1
+                stats.alloc_bytes += allocated
+                if allocated > stats.max_alloc_bytes:
+                    stats.max_alloc_bytes = allocated
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            actions = {name: stats.to_dict() for name, stats in sorted(self._stats.items())}
+        return {
+            "enabled": self._enabled,
+            "trackAllocations": self._track_allocations,
+            "actions": actions,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import random
+import secrets
+
+from .types import RngState
+
+_MASK64 = (1 << 64) - 1
+
+
+def _splitmix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def create_rng_state(seed: int | None = None) -> RngState:
+    if seed is None:
+        seed = secrets.randbits(63)
+    return {"seed": int(seed) & _MASK64, "counter": 0}
+
+
+def stream_key(rng_state: RngState) -> int:
+    """64-bit key of the stream for the current counter; depends only on (seed, counter)."""
+
+    return _splitmix64(rng_state["seed"] ^ _splitmix64(rng_state["counter"]))
+
+
+def next_random(rng_state: RngState) -> tuple[random.Random, RngState]:
+    """Counter-based draw: an independent generator for this step and the advanced state.
+
+    Each shuffle of a game consumes exactly one counter value, so replaying the same actions
+    from the same seed reproduces every deck without any shared global generator.
+    """
+
+    generator = random.Random(stream_key(rng_state))
+    return generator, {"seed": rng_state["seed"], "counter": rng_state["counter"] + 1}
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from .card_utils import create_deck, deal_cards, shuffle_deck
+from .discard_pile import EMPTY_DISCARD_PILE, DiscardPile
 from .players import create_ai_player, create_myself
-from .types import AIDifficulty, GameSettings, GameState, Player
+from .rng import create_rng_state, next_random
+from .types import AIDifficulty, GameSettings, GameState, Player, RngState
+from .zobrist import with_state_hash
 
 
 def create_game_state(settings: GameSettings) -> GameState:
@@ -10,20 +13,27 @@ def create_game_state(settings: GameSettings) -> GameState:
         "players": [],
         "currentPlayerIndex": 0,
         "deck": [],
-        "discardPile": [],
+        "discardPile": EMPTY_DISCARD_PILE,
         "direction": "clockwise",
         "damage": 0,
         "gameStatus": "waiting",
         "settings": settings,
         "winner": None,
+        "rng": create_rng_state(settings.get("seed")),
     }
 
 
-def initialize_game_state(settings: GameSettings) -> GameState:
+def initialize_game_state(
+    settings: GameSettings, rng_state: RngState | None = None
+) -> GameState:
+    """`rng_state` continues an existing game's generator (START_GAME); otherwise a new one
+    is seeded from `settings["seed"]` (or randomly when no seed is given)."""
+
+    rng_state = rng_state or create_rng_state(settings.get("seed"))
     if settings["mode"] == "single":
-        return _initialize_single_play_game(settings)
+        return _initialize_single_play_game(settings, rng_state)
     # 멀티플레이는 아직 미지원: 단일 플레이로 초기화
-    return _initialize_single_play_game(settings)
+    return _initialize_single_play_game(settings, rng_state)
 
 
 def start_game(state: GameState) -> GameState:
@@ -31,12 +41,39 @@ def start_game(state: GameState) -> GameState:
     if not deck:
         raise ValueError("Cannot start a game without cards in the deck.")
     top_card = deck.pop()
-    return {
+    return with_state_hash(
+        {
+            **state,
+            "deck": deck,
+            "discardPile": DiscardPile().push(top_card),
+            "gameStatus": "playing",
+        }
+    )
+
+
+# 클라이언트에 보내지 않는 설정 키 (시드만 알면 딜 전체를 재현할 수 있다)
+SERVER_ONLY_SETTING_KEYS: tuple[str, ...] = ("seed",)
+
+
+def public_settings(settings: GameSettings) -> GameSettings:
+    return {key: value for key, value in settings.items() if key not in SERVER_ONLY_SETTING_KEYS}  # type: ignore[return-value]
+
+
+def serialize_state(state: GameState) -> GameState:
+    """JSON-ready view of a state (the discard pile becomes the top-first list clients expect).
+
+    The generator state and the seed are server-side only: they would let clients predict
+    upcoming cards.
+    """
+
+    public = {
         **state,
-        "deck": deck,
-        "discardPile": [top_card],
-        "gameStatus": "playing",
+        "discardPile": list(state["discardPile"]),
+        "settings": public_settings(state["settings"]),
     }
+    public.pop("rng", None)
+    public.pop("zobrist", None)
+    return public  # type: ignore[return-value]
 
 
 def update_players(state: GameState, players: list[Player]) -> GameState:
@@ -47,20 +84,22 @@ def update_deck(state: GameState, deck: list) -> GameState:
     return {**state, "deck": deck}
 
 
-def _initialize_single_play_game(settings: GameSettings) -> GameState:
-    deck = shuffle_deck(create_deck(settings["includeJokers"]))
+def _initialize_single_play_game(settings: GameSettings, rng_state: RngState) -> GameState:
+    rng, next_rng_state = next_random(rng_state)
+    deck = shuffle_deck(create_deck(settings["includeJokers"]), rng)
     players = _initialize_player_roles(settings["numberOfPlayers"], settings["difficulty"])
     updated_players, updated_deck = deal_cards(players, deck, settings["initHandSize"])
     return {
         "players": updated_players,
         "currentPlayerIndex": 0,
         "deck": updated_deck,
-        "discardPile": [],
+        "discardPile": EMPTY_DISCARD_PILE,
         "direction": "clockwise",
         "damage": 0,
         "gameStatus": "waiting",
         "settings": settings,
         "winner": None,
+        "rng": next_rng_state,
     }
 
 
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import marshal
+import zlib
+from collections.abc import Iterable
+from typing import Any
+
+from .card_codes import CANONICAL_CARDS, CanonicalCard
+from .discard_pile import DiscardPile
+from .types import GameState, PokerCard
+from .zobrist import with_state_hash
+
+# 저장했다가 읽은 카드도 다시 공유 카드 객체를 쓰도록 id 로 찾는다.
+_CANONICAL_BY_ID: dict[str, CanonicalCard] = {card["id"]: card for card in CANONICAL_CARDS}
+
+
+def _canonical(card: PokerCard) -> PokerCard:
+    shared = _CANONICAL_BY_ID.get(card.get("id", ""))  # type: ignore[arg-type]
+    return shared if shared is not None and shared == card else card
+
+
+def _canonical_all(cards: list[PokerCard]) -> list[PokerCard]:
+    return [_canonical(card) for card in cards]
+
+
+def state_to_dict(state: GameState) -> dict[str, Any]:
+    """Complete JSON-ready form of a state for storage.
+
+    Unlike `serialize_state` the generator state is kept (replays need it); the Zobrist
+    hash is not stored but recomputed on load when the state carried one.
+    """
+
+    data: dict[str, Any] = {**state, "discardPile": list(state.get("discardPile", ()))}
+    data["zobrist"] = data.pop("zobrist", None) is not None
+    return data
+
+
+def state_from_dict(data: dict[str, Any]) -> GameState:
+    state: dict[str, Any] = dict(data)
+    hashed = state.pop("zobrist", False)
+    state["players"] = [
+        {**player, "hand": _canonical_all(player.get("hand", []))} for player in state.get("players", [])
+    ]
+    state["deck"] = _canonical_all(state.get("deck", []))
+    state["discardPile"] = DiscardPile.from_cards(_canonical_all(state.get("discardPile", [])))
+    winner = state.get("winner")
+    if winner is not None:
+        state["winner"] = {**winner, "hand": _canonical_all(winner.get("hand", []))}
+    if hashed:
+        return with_state_hash(state)  # type: ignore[arg-type]
+    return state  # type: ignore[return-value]
+
+
+def dump_state(state: GameState) -> str:
+    return json.dumps(state_to_dict(state), ensure_ascii=False, separators=(",", ":"))
+
+
+def load_state(text: str | bytes) -> GameState:
+    return state_from_dict(json.loads(text))
+
+
+def dump_action(action: dict[str, Any]) -> str:
+    return json.dumps(action, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_action(text: str | bytes) -> dict[str, Any]:
+    action = json.loads(text)
+    payload = action.get("payload")
+    if payload and payload.get("effectCard") is not None:
+        action["payload"] = {**payload, "effectCard": _canonical(payload["effectCard"])}
+    return action
+
+
+def _pack_cards(cards: Iterable[PokerCard]) -> bytes | list[int | dict[str, Any]]:
+    packed: list[int | dict[str, Any]] = []
+    canonical = True
+    for card in cards:
+        if card.__class__ is CanonicalCard:
+            packed.append(card.code)  # type: ignore[attr-defined]
+        else:
+            canonical = False
+            packed.append(dict(card))
+    return bytes(packed) if canonical else packed  # type: ignore[arg-type]
+
+
+def _unpack_cards(packed: bytes | list[int | dict[str, Any]]) -> list[PokerCard]:
+    return [CANONICAL_CARDS[item] if isinstance(item, int) else item for item in packed]  # type: ignore[misc]
+
+
+def pack_state(state: GameState, level: int = 6) -> bytes:
+    """Compressed binary form of a state for idle sessions: cards as one-byte codes.
+
+    Lossless like `dump_state` (the Zobrist hash is recomputed by `unpack_state`), several
+    times smaller, and only meant to be read back by the same code version (marshal).
+    """
+
+    data: dict[str, Any] = dict(state)
+    players = state["players"]
+    data["players"] = [{**player, "hand": _pack_cards(player.get("hand", []))} for player in players]
+    data["deck"] = _pack_cards(state.get("deck", []))
+    data["discardPile"] = _pack_cards(state.get("discardPile", ()))
+    data["zobrist"] = data.pop("zobrist", None) is not None
+    winner = state.get("winner")
+    if winner is not None:
+        # 보통 승자는 players 의 한 항목과 같으므로 인덱스만 남긴다.
+        index = next((idx for idx, player in enumerate(players) if player == winner), None)
+        data["winner"] = index if index is not None else {**winner, "hand": _pack_cards(winner.get("hand", []))}
+    return zlib.compress(marshal.dumps(data), level)
+
+
+def unpack_state(blob: bytes) -> GameState:
+    data: dict[str, Any] = marshal.loads(zlib.decompress(blob))
+    hashed = data.pop("zobrist")
+    players = [{**player, "hand": _unpack_cards(player["hand"])} for player in data["players"]]
+    data["players"] = players
+    data["deck"] = _unpack_cards(data["deck"])
+    data["discardPile"] = DiscardPile.from_cards(_unpack_cards(data["discardPile"]))
+    winner = data.get("winner")
+    if isinstance(winner, int):
+        data["winner"] = players[winner]
+    elif winner is not None:
+        data["winner"] = {**winner, "hand": _unpack_cards(winner["hand"])}
+    if hashed:
+        return with_state_hash(data)  # type: ignore[arg-type]
+    return data  # type: ignore[return-value]
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .card_utils import (
     attack_value,
@@ -11,17 +10,36 @@ from .card_utils import (
     refill_deck,
     turn_special_effect,
 )
+from .discard_pile import DiscardPile
+from .rng import next_random
 from .types import GameState, PokerCard
 
+if TYPE_CHECKING:
+    from .profiling import TransitionProfiler
+
 GameAction = dict[str, Any]
 
+# 활성화된 프로파일러만 설치되므로, 꺼져 있을 때 전이마다 드는 비용은 None 비교 한 번이다.
+_profiler: TransitionProfiler | None = None
+
+
+def set_transition_profiler(profiler: TransitionProfiler | None) -> None:
+    global _profiler
+    _profiler = profiler
+
 
 def transition_game_state(state: GameState, action: GameAction) -> GameState:
+    if _profiler is not None:
+        return _profiler.measure(_transition, state, action)
+    return _transition(state, action)
+
+
+def _transition(state: GameState, action: GameAction) -> GameState:
     action_type = action.get("type")
     if action_type == "START_GAME":
         from .state import initialize_game_state, start_game
 
-        return start_game(initialize_game_state(state["settings"]))
+        return start_game(initialize_game_state(state["settings"], state.get("rng")))
     if action_type == "PLAY_CARD":
         payload = action.get("payload") or {}
         return play_card_status(
@@ -52,75 +70,116 @@ def play_card_status(state: GameState, player_index: int, card_index: int) -> Ga
         else p
         for idx, p in enumerate(state["players"])
     ]
-    updated_discard_pile = [played_card, *state["discardPile"]]
-    winner = check_winner(updated_players)
-    if winner:
-        return {
-            **state,
-            "players": updated_players,
-            "discardPile": updated_discard_pile,
-            "gameStatus": "finished",
-            "winner": winner,
-        }
-    return {
+    discard_pile = DiscardPile.coerce(state["discardPile"])
+    updated_discard_pile = discard_pile.push(played_card)
+    next_state: GameState = {
         **state,
         "players": updated_players,
         "discardPile": updated_discard_pile,
     }
+    zobrist = state.get("zobrist")
+    if zobrist is not None:
+        next_state["zobrist"] = zobrist.remove_card(
+            player_index, played_card, len(player["hand"])
+        ).replace_top(discard_pile.top, played_card)
+    winner = check_winner(updated_players)
+    if winner:
+        next_state["gameStatus"] = "finished"
+        next_state["winner"] = winner
+    return next_state
 
 
-def draw_card_status(state: GameState, amount: int) -> GameState:
-    updated_state = deepcopy(state)
-    max_hand_size = state["settings"]["maxHandSize"]
-    for _ in range(amount):
-        current_hand_size = len(
-            updated_state["players"][updated_state["currentPlayerIndex"]]["hand"]
-        )
-        if current_hand_size >= max_hand_size:
-            return {**updated_state, "damage": 0}
-
-        draw_result = _draw_card(updated_state)
-        updated_player, remaining_deck, discard_pile, drawn_card = draw_result
-
-        if drawn_card is None:
-            return {
-                **updated_state,
-                "deck": remaining_deck,
-                "discardPile": discard_pile,
-                "damage": 0,
-            }
-
-        updated_players = _update_players(
-            updated_state["players"],
-            updated_state["currentPlayerIndex"],
-            updated_player,
+def play_turn_status(state: GameState, player_index: int, card_index: int) -> GameState:
+    """PLAY_CARD, APPLY_SPECIAL_EFFECT and NEXT_TURN folded into a single output state.
+
+    The effect of the played card is applied even when the play wins the game (as the AI
+    turn always did); only the turn advance is skipped for a finished game.
+    """
+
+    player = state["players"][player_index]
+    played_card = player["hand"][card_index]
+    updated_player = {**player, "hand": [c for idx, c in enumerate(player["hand"]) if idx != card_index]}
+    updated_players = _update_players(state["players"], player_index, updated_player)
+
+    discard_pile = DiscardPile.coerce(state["discardPile"])
+    next_state: GameState = {
+        **state,
+        "players": updated_players,
+        "discardPile": discard_pile.push(played_card),
+        "currentPlayerIndex": turn_special_effect(played_card, state),
+        "direction": change_direction(played_card, state["direction"]),
+        "damage": state["damage"] + attack_value(played_card),
+    }
+    winner = check_winner(updated_players)
+    if winner:
+        next_state["gameStatus"] = "finished"
+        next_state["winner"] = winner
+    else:
+        next_state["currentPlayerIndex"] = get_next_player_index(next_state)
+    zobrist = state.get("zobrist")
+    if zobrist is not None:
+        next_state["zobrist"] = (
+            zobrist.remove_card(player_index, played_card, len(player["hand"]))
+            .replace_top(discard_pile.top, played_card)
+            .replace_turn(state, next_state)
         )
-        updated_state = {
-            **updated_state,
-            "players": updated_players,
-            "deck": remaining_deck,
-            "discardPile": discard_pile,
-        }
+    return next_state
+
 
-    return {**updated_state, "damage": 0}
+def draw_turn_status(state: GameState, amount: int) -> GameState:
+    """DRAW_CARD followed by NEXT_TURN."""
 
+    drawn_state = draw_card_status(state, amount)
+    if drawn_state["gameStatus"] == "finished":
+        return drawn_state
+    return next_turn_status(drawn_state)
 
-def _draw_card(state: GameState) -> tuple[dict, list[PokerCard], list[PokerCard], PokerCard | None]:
-    current_player = state["players"][state["currentPlayerIndex"]]
-    deck = list(state["deck"])
-    discard_pile = list(state["discardPile"])
 
-    if not deck:
-        refilled = refill_deck(deck, discard_pile)
-        deck = refilled["new_deck"]
+def draw_card_status(state: GameState, amount: int) -> GameState:
+    # 입력 상태는 변경하지 않고, 현재 플레이어 외의 플레이어/카드 객체는 그대로 공유한다.
+    current_index = state["currentPlayerIndex"]
+    current_player = state["players"][current_index]
+    hand = current_player["hand"]
+    needed = min(amount, state["settings"]["maxHandSize"] - len(hand))
+    if needed <= 0:
+        return _with_turn_hash(state, {**state, "damage": 0})
+
+    deck = state["deck"]
+    discard_pile = state["discardPile"]
+    rng_state = state.get("rng")
+    drawn = deck[:needed]
+    remaining_deck = deck[needed:]
+    if len(drawn) < needed:
+        # 덱이 모자랄 때만, 그리고 최대 한 번만 버린 카드 더미로 덱을 채운다.
+        rng = None
+        if rng_state is not None and discard_pile:
+            rng, rng_state = next_random(rng_state)
+        refilled = refill_deck(remaining_deck, discard_pile, rng)
+        refilled_deck = refilled["new_deck"]
         discard_pile = refilled["new_discard_pile"]
+        rest = needed - len(drawn)
+        drawn = [*drawn, *refilled_deck[:rest]]
+        remaining_deck = refilled_deck[rest:]
 
-    if not deck:
-        return current_player, deck, discard_pile, None
+    updated_state: GameState = {
+        **state,
+        "deck": remaining_deck,
+        "discardPile": discard_pile,
+        "damage": 0,
+    }
+    if rng_state is not None:
+        updated_state["rng"] = rng_state
+    zobrist = state.get("zobrist")
+    if zobrist is not None:
+        updated_state["zobrist"] = zobrist.add_cards(current_index, drawn, len(hand)).replace_turn(
+            state, updated_state
+        )
+    if not drawn:
+        return updated_state
 
-    drawn_card, *remaining_deck = deck
-    updated_player = {**current_player, "hand": [*current_player["hand"], drawn_card]}
-    return updated_player, remaining_deck, discard_pile, drawn_card
+    updated_player = {**current_player, "hand": [*hand, *drawn]}
+    updated_state["players"] = _update_players(state["players"], current_index, updated_player)
+    return updated_state
 
 
 def _update_players(
@@ -131,19 +190,29 @@ def _update_players(
     ]
 
 
+def _with_turn_hash(state: GameState, next_state: GameState) -> GameState:
+    zobrist = state.get("zobrist")
+    if zobrist is not None:
+        next_state["zobrist"] = zobrist.replace_turn(state, next_state)
+    return next_state
+
+
 def next_turn_status(state: GameState) -> GameState:
-    return {**state, "currentPlayerIndex": get_next_player_index(state)}
+    return _with_turn_hash(state, {**state, "currentPlayerIndex": get_next_player_index(state)})
 
 
 def apply_special_effect_status(state: GameState, effect_card: PokerCard | None) -> GameState:
     if effect_card is None:
         return state
-    return {
-        **state,
-        "currentPlayerIndex": turn_special_effect(effect_card, state),
-        "direction": change_direction(effect_card, state["direction"]),
-        "damage": state["damage"] + attack_value(effect_card),
-    }
+    return _with_turn_hash(
+        state,
+        {
+            **state,
+            "currentPlayerIndex": turn_special_effect(effect_card, state),
+            "direction": change_direction(effect_card, state["direction"]),
+            "damage": state["damage"] + attack_value(effect_card),
+        },
+    )
 
 
 def end_game_status(state: GameState, winner_index: int) -> GameState:
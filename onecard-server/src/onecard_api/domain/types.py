@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Literal, NotRequired, TypedDict
+from typing import TYPE_CHECKING, Literal, NotRequired, Sequence, TypedDict
+
+if TYPE_CHECKING:
+    from .zobrist import StateHash
 
 RankValue = int
 SuitValue = Literal["clubs", "diamonds", "hearts", "spades"]
@@ -66,15 +69,23 @@ class GameSettings(TypedDict):
     initHandSize: int
     maxHandSize: int
     difficulty: AIDifficulty
+    seed: NotRequired[int]
+
+
+class RngState(TypedDict):
+    seed: int
+    counter: int
 
 
 class GameState(TypedDict, total=False):
     players: list[Player]
     currentPlayerIndex: int
     deck: list[PokerCard]
-    discardPile: list[PokerCard]
+    discardPile: Sequence[PokerCard]  # DiscardPile (top first)
     direction: Direction
     damage: int
     gameStatus: GameStatus
     settings: GameSettings
     winner: NotRequired[Player | None]
+    rng: RngState
+    zobrist: StateHash  # 전이 함수들이 점진적으로 갱신하는 상태 해시 (API 응답에는 포함되지 않음)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import reduce
+from operator import xor
+from typing import Iterable
+
+from .card_codes import CARD_CODE_COUNT, CanonicalCard, encode_card
+from .rng import _splitmix64
+from .types import Direction, GameState, PokerCard
+
+# 고정 시드에서 유도한 64비트 키라서 프로세스/재시작과 무관하게 같은 상태는 같은 해시를 갖는다.
+MAX_SEATS = 8
+MAX_HAND_SIZE_KEYS = CARD_CODE_COUNT + 2
+_UNKNOWN_CODE = CARD_CODE_COUNT  # 코드로 표현할 수 없는 카드
+_NO_TOP = CARD_CODE_COUNT + 1
+_DAMAGE_TABLE_SIZE = 256
+
+_HAND_TAG, _SIZE_TAG, _TOP_TAG, _CURRENT_TAG, _DAMAGE_TAG, _DIRECTION_TAG = range(1, 7)
+
+
+def _key(tag: int, *values: int) -> int:
+    key = _splitmix64(tag)
+    for value in values:
+        key = _splitmix64(key ^ value)
+    return key
+
+
+HAND_KEYS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_key(_HAND_TAG, seat, code) for code in range(CARD_CODE_COUNT + 1))
+    for seat in range(MAX_SEATS)
+)
+SIZE_KEYS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_key(_SIZE_TAG, seat, size) for size in range(MAX_HAND_SIZE_KEYS))
+    for seat in range(MAX_SEATS)
+)
+TOP_KEYS: tuple[int, ...] = tuple(_key(_TOP_TAG, code) for code in range(CARD_CODE_COUNT + 2))
+CURRENT_KEYS: tuple[int, ...] = tuple(_key(_CURRENT_TAG, seat) for seat in range(MAX_SEATS))
+_DAMAGE_KEYS: tuple[int, ...] = tuple(_key(_DAMAGE_TAG, damage) for damage in range(_DAMAGE_TABLE_SIZE))
+COUNTERCLOCKWISE_KEY = _key(_DIRECTION_TAG)
+
+
+def _card_code(card: PokerCard) -> int:
+    if card.__class__ is CanonicalCard:
+        return card.code  # type: ignore[attr-defined]
+    code = encode_card(card)
+    return _UNKNOWN_CODE if code is None else code
+
+
+def _top_key(card: PokerCard | None) -> int:
+    return TOP_KEYS[_NO_TOP if card is None else _card_code(card)]
+
+
+def _size_key(seat: int, size: int) -> int:
+    if size < MAX_HAND_SIZE_KEYS:
+        return SIZE_KEYS[seat][size]
+    return _key(_SIZE_TAG, seat, size)
+
+
+def _damage_key(damage: int) -> int:
+    if 0 <= damage < _DAMAGE_TABLE_SIZE:
+        return _DAMAGE_KEYS[damage]
+    return _key(_DAMAGE_TAG, damage)
+
+
+def _direction_key(direction: Direction) -> int:
+    return COUNTERCLOCKWISE_KEY if direction == "counterclockwise" else 0
+
+
+@dataclass(frozen=True, slots=True)
+class StateHash:
+    """Incrementally maintained 64-bit Zobrist hash of a game state.
+
+    `public` covers what every player can see (hand sizes, top card, damage, direction and
+    current player); `hands[seat]` covers the cards held by each seat. `full` keys
+    transposition tables over complete states, `observer(seat)` keys caches over what one
+    seat knows.
+    """
+
+    public: int
+    hands: tuple[int, ...]
+
+    @property
+    def full(self) -> int:
+        return reduce(xor, self.hands, self.public)
+
+    def observer(self, seat: int) -> int:
+        return self.public ^ self.hands[seat]
+
+    def remove_card(self, seat: int, card: PokerCard, size_before: int) -> StateHash:
+        hands = list(self.hands)
+        hands[seat] ^= HAND_KEYS[seat][_card_code(card)]
+        public = self.public ^ _size_key(seat, size_before) ^ _size_key(seat, size_before - 1)
+        return StateHash(public, tuple(hands))
+
+    def add_cards(self, seat: int, cards: Iterable[PokerCard], size_before: int) -> StateHash:
+        keys = HAND_KEYS[seat]
+        hand_hash = self.hands[seat]
+        size_after = size_before
+        for card in cards:
+            hand_hash ^= keys[_card_code(card)]
+            size_after += 1
+        if size_after == size_before:
+            return self
+        hands = (*self.hands[:seat], hand_hash, *self.hands[seat + 1 :])
+        public = self.public ^ _size_key(seat, size_before) ^ _size_key(seat, size_after)
+        return StateHash(public, hands)
+
+    def replace_top(self, before: PokerCard | None, after: PokerCard | None) -> StateHash:
+        return StateHash(self.public ^ _top_key(before) ^ _top_key(after), self.hands)
+
+    def replace_turn(self, before: GameState, after: GameState) -> StateHash:
+        """Re-keys current player, direction and damage where they differ between states."""
+
+        public = self.public
+        if before["currentPlayerIndex"] != after["currentPlayerIndex"]:
+            public ^= CURRENT_KEYS[before["currentPlayerIndex"]] ^ CURRENT_KEYS[after["currentPlayerIndex"]]
+        if before["direction"] != after["direction"]:
+            public ^= COUNTERCLOCKWISE_KEY
+        if before["damage"] != after["damage"]:
+            public ^= _damage_key(before["damage"]) ^ _damage_key(after["damage"])
+        if public == self.public:
+            return self
+        return StateHash(public, self.hands)
+
+
+def compute_state_hash(state: GameState) -> StateHash:
+    """Hashes a state from scratch; transitions keep the result up to date incrementally."""
+
+    players = state["players"]
+    discard_pile = state["discardPile"]
+    public = (
+        CURRENT_KEYS[state["currentPlayerIndex"]]
+        ^ _direction_key(state["direction"])
+        ^ _damage_key(state["damage"])
+        ^ _top_key(discard_pile[0] if discard_pile else None)
+    )
+    hands: list[int] = []
+    for seat, player in enumerate(players):
+        hand = player.get("hand", [])
+        public ^= _size_key(seat, len(hand))
+        keys = HAND_KEYS[seat]
+        hands.append(reduce(xor, (keys[_card_code(card)] for card in hand), 0))
+    return StateHash(public, tuple(hands))
+
+
+def state_hash(state: GameState) -> StateHash:
+    """Maintained hash of the state, computed on demand for states that do not carry one."""
+
+    maintained = state.get("zobrist")
+    if maintained is not None:
+        return maintained
+    return compute_state_hash(state)
+
+
+def with_state_hash(state: GameState) -> GameState:
+    return {**state, "zobrist": compute_state_hash(state)}
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Literal, NotRequired, TypedDict
 
-from onecard_api.domain.card_utils import is_valid_play
+from onecard_api.domain.legal_actions import LegalActions, legal_actions
 from onecard_api.domain.types import GameState, PokerCard
 
 
@@ -14,25 +14,16 @@ class EngineActionPayload(TypedDict):
 
 
 def build_action_mask(state: GameState, max_hand_size: int) -> list[bool]:
-    mask = [False] * (max_hand_size + 1)
-    hand: list[PokerCard] = state.get("players", [{}])[0].get("hand", []) if state.get("players") else []
-
-    if not state.get("discardPile"):
-        for i in range(min(len(hand), max_hand_size)):
-            mask[i] = True
-        mask[max_hand_size] = len(hand) < max_hand_size
-        return mask
+    return action_mask_from_legal(legal_actions(state, 0), max_hand_size)
 
-    top_card = state["discardPile"][0]
-    damage = state.get("damage", 0)
 
-    for i in range(max_hand_size):
-        if i >= len(hand):
-            mask[i] = False
-            continue
-        mask[i] = is_valid_play(hand[i], top_card, damage)
-
-    mask[max_hand_size] = len(hand) < max_hand_size
+def action_mask_from_legal(legal: LegalActions, max_hand_size: int) -> list[bool]:
+    mask = [False] * (max_hand_size + 1)
+    for i in legal.play_indices:
+        if i >= max_hand_size:
+            break
+        mask[i] = True
+    mask[max_hand_size] = legal.hand_size < max_hand_size
     return mask
 
 
@@ -1,19 +1,44 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import os
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Optional
 
 from fastapi import FastAPI
 
-from onecard_api.api import games, onnx_policy
+from onecard_api.api import debug, games, onnx_policy
 from onecard_api.api.deps import get_service_container
 from onecard_api.container import ServiceContainer
 
 
-def create_app(container: Optional[ServiceContainer] = None) -> FastAPI:
+def create_app(
+    container: Optional[ServiceContainer] = None, debug_endpoints: Optional[bool] = None
+) -> FastAPI:
+    """Builds the app; `/debug` routes are mounted only with `debug_endpoints` (default:
+    `ONECARD_DEBUG_ENDPOINTS=1`), since they are unauthenticated and can slow the process."""
+
+    if debug_endpoints is None:
+        debug_endpoints = os.getenv("ONECARD_DEBUG_ENDPOINTS", "").lower() in ("1", "true")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        resolve = app.dependency_overrides.get(get_service_container, get_service_container)
+        services = resolve()
+        reaper = asyncio.create_task(services.game_state_store.run_reaper())
+        try:
+            yield
+        finally:
+            reaper.cancel()
+            with suppress(asyncio.CancelledError):
+                await reaper
+            services.shutdown()
+
     app = FastAPI(
         title="Onecard API",
         description="REST API specification for the Onecard service",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     if container is not None:
@@ -21,6 +46,8 @@ def create_app(container: Optional[ServiceContainer] = None) -> FastAPI:
 
     app.include_router(games.router)
     app.include_router(onnx_policy.router)
+    if debug_endpoints:
+        app.include_router(debug.router)
 
     @app.get("/health", tags=["health"])
     def health() -> dict[str, str]:
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+from dataclasses import dataclass, field, replace
+
+from onecard_api.domain.card_codes import JOKER_CODES
+from onecard_api.domain.card_utils import playable_code_indices
+from onecard_api.domain.compact import (
+    FINISHED,
+    CompactGameState,
+    draw_turn_compact,
+    play_turn_compact,
+    to_compact,
+)
+from onecard_api.domain.engine import GameAction, draw_card_action, play_card_action
+from onecard_api.domain.types import GameState
+
+# 결정화(determinization)마다 손패가 달라지므로 행동은 손패 인덱스가 아니라 카드 코드로 식별한다.
+# 두 조커(52/53)는 같은 행동이다.
+DRAW = -1
+
+
+@dataclass(frozen=True, slots=True)
+class SearchConfig:
+    """Strength/latency knobs of the search AI.
+
+    `time_budget_ms` bounds the wall-clock time of one move (measured from the request, so
+    queued requests search less rather than answer later); `max_iterations` additionally
+    caps the work for reproducible runs.
+    """
+
+    time_budget_ms: float = 200.0
+    max_iterations: int | None = None
+    exploration: float = 0.7
+    rollout_max_turns: int = 200
+    seed: int | None = None
+
+    @classmethod
+    def from_env(cls) -> SearchConfig:
+        defaults = cls()
+        max_iterations = os.getenv("ONECARD_HARD_MAX_ITERATIONS")
+        return cls(
+            time_budget_ms=float(os.getenv("ONECARD_HARD_BUDGET_MS", defaults.time_budget_ms)),
+            max_iterations=int(max_iterations) if max_iterations else None,
+            exploration=float(os.getenv("ONECARD_HARD_EXPLORATION", defaults.exploration)),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    action: GameAction
+    iterations: int
+    visits: dict[int, int]
+    elapsed_ms: float
+
+
+@dataclass(slots=True)
+class _Node:
+    player: int  # 이 노드로 오는 행동을 고른 좌석
+    visits: int = 0
+    wins: float = 0.0
+    available: int = 0
+    children: dict[int, _Node] = field(default_factory=dict)
+
+
+def action_key(code: int) -> int:
+    """The move a card code stands for; both jokers are one move."""
+
+    return JOKER_CODES[0] if code >= JOKER_CODES[0] else code
+
+
+def legal_moves(state: CompactGameState) -> list[int]:
+    """Distinct action keys of the current player: playable card codes, or DRAW when none.
+
+    Drawing while holding a playable card is legal but almost never right; leaving it out
+    keeps the branching factor (and the opponent model) close to how the AIs actually play.
+    """
+
+    hand = state.hands[state.current]
+    if state.discard:
+        indices = playable_code_indices(hand, state.discard[-1], state.damage)
+    else:
+        indices = range(len(hand))
+    moves = [*dict.fromkeys(action_key(hand[idx]) for idx in indices)]
+    return moves or [DRAW]
+
+
+def apply_move(state: CompactGameState, move: int) -> CompactGameState:
+    if move == DRAW:
+        return draw_turn_compact(state, max(1, state.damage))
+    hand = state.hands[state.current]
+    index = next(idx for idx, code in enumerate(hand) if action_key(code) == move)
+    return play_turn_compact(state, state.current, index)
+
+
+def determinize(state: CompactGameState, observer: int, rng: random.Random) -> CompactGameState:
+    """Samples the cards `observer` cannot see: other hands and the deck keep their sizes."""
+
+    hidden = bytearray(state.deck)
+    for seat, hand in enumerate(state.hands):
+        if seat != observer:
+            hidden += hand
+    rng.shuffle(hidden)
+
+    hands = []
+    offset = 0
+    for seat, hand in enumerate(state.hands):
+        if seat == observer:
+            hands.append(hand)
+            continue
+        hands.append(bytes(hidden[offset : offset + len(hand)]))
+        offset += len(hand)
+    return replace(
+        state,
+        hands=tuple(hands),
+        deck=bytes(hidden[offset:]),
+        rng={"seed": rng.getrandbits(63), "counter": 0},
+    )
+
+
+def rollout(state: CompactGameState, rng: random.Random, max_turns: int) -> int:
+    """Plays random legal cards (drawing only when nothing is playable); returns the winner."""
+
+    for _ in range(max_turns):
+        if state.status == FINISHED:
+            return state.winner
+        hand = state.hands[state.current]
+        playable = (
+            playable_code_indices(hand, state.discard[-1], state.damage)
+            if state.discard
+            else range(len(hand))
+        )
+        if playable:
+            state = play_turn_compact(state, state.current, rng.choice(playable))
+        else:
+            state = draw_turn_compact(state, max(1, state.damage))
+    if state.status == FINISHED:
+        return state.winner
+    # 턴 제한에 걸리면 손패가 가장 적은 좌석을 승자로 본다.
+    return min(range(len(state.hands)), key=lambda seat: len(state.hands[seat]))
+
+
+def search(
+    game_state: GameState,
+    config: SearchConfig | None = None,
+    *,
+    deadline: float | None = None,
+) -> SearchResult:
+    """Information-set MCTS for the current player of `game_state`.
+
+    Every iteration samples the hidden cards, descends the shared tree with UCB restricted to
+    the moves available in that sample, expands one node and finishes with a random rollout.
+    """
+
+    config = config or SearchConfig()
+    started = time.perf_counter()
+    if deadline is None:
+        deadline = started + config.time_budget_ms / 1000
+    rng = random.Random(config.seed)
+    root_state = to_compact(game_state)
+    observer = root_state.current
+    root = _Node(player=-1)
+    c = config.exploration
+
+    root_moves = legal_moves(root_state)
+    iterations = 0
+    # 한 번도 탐색하지 못해도 합법적인 수를 돌려줄 수 있도록 최소 1회는 수행한다.
+    while iterations == 0 or (
+        time.perf_counter() < deadline
+        and (config.max_iterations is None or iterations < config.max_iterations)
+    ):
+        iterations += 1
+        state = determinize(root_state, observer, rng)
+        node = root
+        path = [root]
+
+        while state.status != FINISHED:
+            moves = legal_moves(state)
+            children = node.children
+            untried = [move for move in moves if move not in children]
+            for move in moves:
+                child = children.get(move)
+                if child is not None:
+                    child.available += 1
+            if untried:
+                move = rng.choice(untried)
+                node = children[move] = _Node(player=state.current, available=1)
+            else:
+                log_total = {move: math.log(children[move].available) for move in moves}
+                move = max(
+                    moves,
+                    key=lambda m: children[m].wins / children[m].visits
+                    + c * math.sqrt(log_total[m] / children[m].visits),
+                )
+                node = children[move]
+            state = apply_move(state, move)
+            path.append(node)
+            if node.visits == 0:
+                break
+
+        winner = state.winner if state.status == FINISHED else rollout(
+            state, rng, config.rollout_max_turns
+        )
+        for visited in path:
+            visited.visits += 1
+            if visited.player == winner:
+                visited.wins += 1
+
+    visits = {move: root.children[move].visits for move in root_moves if move in root.children}
+    best = max(root_moves, key=lambda move: visits.get(move, -1))
+    if best == DRAW:
+        action = draw_card_action(max(1, root_state.damage))
+    else:
+        hand = root_state.hands[observer]
+        card_index = next(idx for idx, code in enumerate(hand) if action_key(code) == best)
+        action = play_card_action(observer, card_index)
+    return SearchResult(
+        action=action,
+        iterations=iterations,
+        visits=visits,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+import numpy as np
+
+from onecard_api.domain.card_codes import CARD_CODE_COUNT, code_to_card_fields
+from onecard_api.domain.compact import CLOCKWISE, FINISHED, CompactGameState, to_compact
+from onecard_api.domain.engine import GameAction, draw_card_action, play_card_action
+from onecard_api.domain.types import GameState
+from onecard_api.inference.observation_encoder import ObservationSpec
+from onecard_api.search.ismcts import DRAW, action_key, apply_move, determinize, legal_moves, rollout
+
+_TRUE_VALUES = ("1", "true", "yes", "on", "puct")
+
+
+class PolicySession(Protocol):
+    """The part of `onnxruntime.InferenceSession` the search uses."""
+
+    def run(self, output_names: Any, input_feed: dict[str, np.ndarray]) -> list[np.ndarray]: ...
+
+
+@dataclass(frozen=True, slots=True)
+class PuctConfig:
+    """Knobs of the policy-prior search used by 'medium' when `enabled`.
+
+    `node_budget` caps the leaves evaluated per move and `time_budget_ms` the wall-clock time
+    (measured from the request); leaves are sent to the model `batch_size` at a time, so one
+    move costs about `node_budget / batch_size` inference calls.
+    """
+
+    enabled: bool = False
+    node_budget: int = 64
+    time_budget_ms: float = 100.0
+    batch_size: int = 8
+    c_puct: float = 1.5
+    rollout_max_turns: int = 200
+    seed: int | None = None
+
+    @classmethod
+    def from_env(cls) -> PuctConfig:
+        defaults = cls()
+        return cls(
+            enabled=os.getenv("ONECARD_MEDIUM_SEARCH", "").lower() in _TRUE_VALUES,
+            node_budget=int(os.getenv("ONECARD_MEDIUM_NODES", defaults.node_budget)),
+            time_budget_ms=float(os.getenv("ONECARD_MEDIUM_BUDGET_MS", defaults.time_budget_ms)),
+            batch_size=int(os.getenv("ONECARD_MEDIUM_BATCH", defaults.batch_size)),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PuctResult:
+    action: GameAction
+    nodes: int  # 평가한 리프(종료 상태 포함) 수
+    evaluations: int  # session.run 호출 수
+    visits: dict[int, int]
+    elapsed_ms: float
+
+
+@dataclass(slots=True)
+class _Node:
+    player: int  # 이 노드로 오는 행동을 고른 좌석
+    visits: int = 0
+    value: float = 0.0  # `player` 관점의 승리 확률 합
+    priors: dict[int, float] | None = None  # 이 노드에서 둘 좌석의 정책 사전확률, 평가 전에는 None
+    children: dict[int, _Node] = field(default_factory=dict)
+
+
+class CompactObservationEncoder:
+    """`encode_observation` of the state rotated to the current player, straight from codes.
+
+    The search encodes every leaf; going through dict states and rotation would cost more
+    than the search itself. Rows are written into a preallocated batch array.
+    """
+
+    def __init__(self, spec: ObservationSpec) -> None:
+        self.spec = spec
+        ranks, suits = len(spec.ranks), len(spec.suits)
+        self._max_hand = max(1.0, float(spec.maxHandSize))
+        self._joker = ranks + suits
+        self._top = self._joker + 1
+        self._top_joker = self._top + ranks + suits
+        self._damage = self._top_joker + 1
+        self._direction = self._damage + 1
+        self._current = self._direction + 1
+        self._deck = self._current + spec.playerCount
+        self._opponents = self._deck + 1
+        # 코드별 (손패 랭크 칸, 손패 무늬 칸); 조커는 둘 다 None
+        self._slots: list[tuple[int | None, int | None]] = []
+        for code in range(CARD_CODE_COUNT):
+            fields = code_to_card_fields(code)
+            if fields["isJoker"]:
+                self._slots.append((None, None))
+                continue
+            rank = fields["rank"]
+            suit = fields["suit"]
+            self._slots.append(
+                (
+                    spec.ranks.index(rank) if rank in spec.ranks else None,
+                    ranks + spec.suits.index(suit) if suit in spec.suits else None,
+                )
+            )
+
+    def encode_into(self, state: CompactGameState, row: np.ndarray) -> None:
+        row.fill(0.0)
+        max_hand = self._max_hand
+        unit = 1.0 / max_hand
+        slots = self._slots
+        for code in state.hands[state.current]:
+            rank_slot, suit_slot = slots[code]
+            if rank_slot is None and suit_slot is None:
+                row[self._joker] += unit
+                continue
+            if rank_slot is not None:
+                row[rank_slot] += unit
+            if suit_slot is not None:
+                row[suit_slot] += unit
+
+        if state.discard:
+            top = state.discard[-1]
+            rank_slot, suit_slot = slots[top]
+            if rank_slot is None and suit_slot is None:
+                row[self._top_joker] = 1.0
+            else:
+                if rank_slot is not None:
+                    row[self._top + rank_slot] = 1.0
+                if suit_slot is not None:
+                    row[self._top + suit_slot] = 1.0
+
+        row[self._damage] = min(float(state.damage), float(self.spec.maxHandSize)) / max_hand
+        row[self._direction] = 1.0 if state.direction == CLOCKWISE else 0.0
+        if self.spec.playerCount:
+            row[self._current] = 1.0  # 회전된 상태에서 현재 플레이어는 항상 0번
+        row[self._deck] = min(len(state.deck) / max(1, self.spec.initialDeckSize), 1.0)
+
+        total = len(state.hands)
+        for offset in range(1, total):
+            seat = (state.current + offset * state.direction) % total
+            row[self._opponents + offset - 1] = min(len(state.hands[seat]) / max_hand, 1.0)
+
+    def encode(self, state: CompactGameState) -> np.ndarray:
+        row = np.zeros(self.spec.vectorSize, dtype=np.float32)
+        self.encode_into(state, row)
+        return row
+
+
+def _priors(state: CompactGameState, moves: list[int], logits: np.ndarray, max_hand_size: int) -> dict[int, float]:
+    """Softmax of the move logits over `moves`; duplicate codes (jokers) pool their mass."""
+
+    hand = state.hands[state.current]
+    scores: dict[int, list[float]] = {move: [] for move in moves}
+    if DRAW in scores:
+        scores[DRAW].append(float(logits[max_hand_size]))
+    else:
+        for index, code in enumerate(hand[:max_hand_size]):
+            bucket = scores.get(action_key(code))
+            if bucket is not None:
+                bucket.append(float(logits[index]))
+    peak = max((score for bucket in scores.values() for score in bucket), default=0.0)
+    weights = {move: sum(math.exp(score - peak) for score in bucket) for move, bucket in scores.items()}
+    total = sum(weights.values())
+    if total <= 0.0:
+        return {move: 1.0 / len(moves) for move in moves}
+    # 관측 범위(maxHandSize) 밖의 카드처럼 로짓이 없는 수에도 탐색 기회를 남긴다.
+    floor = 1.0 / (len(moves) * 16)
+    priors = {move: max(weight / total, floor) for move, weight in weights.items()}
+    norm = sum(priors.values())
+    return {move: prior / norm for move, prior in priors.items()}
+
+
+def _win_shares(players: int, seat: int, win_probability: float) -> list[float]:
+    shares = [(1.0 - win_probability) / max(1, players - 1)] * players
+    shares[seat] = win_probability
+    return shares
+
+
+def _backup(path: list[_Node], shares: list[float]) -> None:
+    # 방문 수는 하강할 때(가상 손실) 이미 더했으므로 가치만 더한다.
+    for node in path[1:]:
+        node.value += shares[node.player]
+
+
+def _select(node: _Node, moves: list[int], state: CompactGameState, c_puct: float) -> int:
+    priors = node.priors or {}
+    uniform = 1.0 / len(moves)
+    scale = c_puct * math.sqrt(max(1, node.visits))
+    first_play = 1.0 / len(state.hands)  # 미방문 수의 가치는 공정 몫으로 본다.
+    children = node.children
+    best_move = moves[0]
+    best_score = -math.inf
+    for move in moves:
+        child = children.get(move)
+        visits = child.visits if child is not None else 0
+        q = child.value / visits if visits else first_play
+        score = q + scale * priors.get(move, uniform) / (1 + visits)
+        if score > best_score:
+            best_move, best_score = move, score
+    return best_move
+
+
+def search(
+    game_state: GameState,
+    session: PolicySession,
+    spec: ObservationSpec,
+    config: PuctConfig | None = None,
+    *,
+    deadline: float | None = None,
+    encoder: CompactObservationEncoder | None = None,
+) -> PuctResult:
+    """PUCT search over sampled hidden cards, guided by the policy and value heads.
+
+    Each simulation samples the hidden cards, descends the shared tree by PUCT and stops at
+    the first unevaluated node. Up to `batch_size` such leaves (kept apart by virtual loss)
+    are encoded into one array and evaluated by a single `session.run`; the logits become the
+    leaf's priors and the value head (or a rollout, for models without one) its value. The
+    root is always evaluated, so a search without budget left plays the policy argmax.
+    """
+
+    config = config or PuctConfig()
+    started = time.perf_counter()
+    if deadline is None:
+        deadline = started + config.time_budget_ms / 1000
+    rng = random.Random(config.seed)
+    encoder = encoder or CompactObservationEncoder(spec)
+    root_state = to_compact(game_state)
+    observer = root_state.current
+    players = len(root_state.hands)
+    max_hand_size = spec.maxHandSize
+    batch_size = max(1, config.batch_size)
+    batch = np.zeros((batch_size, spec.vectorSize), dtype=np.float32)
+    root = _Node(player=-1)
+    root_moves = legal_moves(root_state)
+
+    nodes = 0
+    evaluations = 0
+    # 첫 배치는 루트 하나만 평가해, 이후 하강이 루트의 사전확률을 쓰도록 한다.
+    while nodes == 0 or (nodes < config.node_budget and time.perf_counter() < deadline):
+        want = 1 if nodes == 0 else min(batch_size, config.node_budget - nodes)
+        pending: list[tuple[list[_Node], CompactGameState, list[int]]] = []
+        for _ in range(want):
+            state = determinize(root_state, observer, rng)
+            node = root
+            path = [root]
+            node.visits += 1
+            while state.status != FINISHED and node.priors is not None:
+                move = _select(node, legal_moves(state), state, config.c_puct)
+                child = node.children.get(move)
+                if child is None:
+                    child = node.children[move] = _Node(player=state.current)
+                state = apply_move(state, move)
+                node = child
+                path.append(node)
+                node.visits += 1
+            nodes += 1
+            if state.status == FINISHED:
+                _backup(path, _win_shares(players, state.winner, 1.0))
+                continue
+            encoder.encode_into(state, batch[len(pending)])
+            pending.append((path, state, legal_moves(state)))
+
+        if not pending:
+            continue
+        outputs = session.run(None, {"observation": batch[: len(pending)]})
+        evaluations += 1
+        logits = outputs[0]
+        values = outputs[1].reshape(-1) if len(outputs) > 1 else None
+        for row, (path, state, moves) in enumerate(pending):
+            leaf = path[-1]
+            if leaf.priors is None:
+                leaf.priors = _priors(state, moves, logits[row], max_hand_size)
+            if values is not None:
+                # 가치 헤드는 둘 차례인 좌석의 수익([-1, 1])을 추정한다.
+                win = min(1.0, max(0.0, (float(values[row]) + 1.0) / 2.0))
+                shares = _win_shares(players, state.current, win)
+            else:
+                winner = rollout(state, rng, config.rollout_max_turns)
+                shares = _win_shares(players, winner, 1.0)
+            _backup(path, shares)
+
+    visits = {move: root.children[move].visits for move in root_moves if move in root.children}
+    root_priors = root.priors or {}
+    best = max(root_moves, key=lambda move: (visits.get(move, 0), root_priors.get(move, 0.0)))
+    if best == DRAW:
+        action = draw_card_action(max(1, root_state.damage))
+    else:
+        hand = root_state.hands[observer]
+        card_index = next(idx for idx, code in enumerate(hand) if action_key(code) == best)
+        action = play_card_action(observer, card_index)
+    return PuctResult(
+        action=action,
+        nodes=nodes,
+        evaluations=evaluations,
+        visits=visits,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Literal, TypeVar
+
+from fastapi import HTTPException, status
+
+T = TypeVar("T")
+PoolKind = Literal["inference", "search"]
+
+
+class ExecutorSaturatedError(HTTPException):
+    """Raised instead of queueing when the AI executor already holds `max_pending` jobs."""
+
+    def __init__(self, pending: int) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"AI 작업 대기열이 가득 찼습니다({pending}). 잠시 후 다시 시도하세요.",
+            headers={"Retry-After": "1"},
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutorConfig:
+    """Sizing of the pools that run AI work off the event loop.
+
+    ONNX inference releases the GIL and runs on `inference_threads` threads. Pure-Python
+    search holds the GIL, so it runs in `search_processes` worker processes (started on the
+    first search) whose priority is lowered by `search_niceness`, so that even on a single
+    core requests are scheduled ahead of it; with 0 processes it shares the inference
+    threads and slows request handling down while it runs. `max_pending` bounds the jobs
+    queued or running across both pools; beyond it requests fail fast with 503 instead of
+    piling up.
+    """
+
+    inference_threads: int = 2
+    search_processes: int = 1
+    search_niceness: int = 10
+    max_pending: int = 32
+
+    @classmethod
+    def from_env(cls) -> ExecutorConfig:
+        defaults = cls()
+        return cls(
+            inference_threads=int(os.getenv("ONECARD_AI_THREADS", defaults.inference_threads)),
+            search_processes=int(os.getenv("ONECARD_AI_PROCESSES", defaults.search_processes)),
+            search_niceness=int(os.getenv("ONECARD_AI_SEARCH_NICE", defaults.search_niceness)),
+            max_pending=int(os.getenv("ONECARD_AI_MAX_PENDING", defaults.max_pending)),
+        )
+
+
+class AiExecutor:
+    """Runs AI jobs on dedicated pools and keeps the event loop (and anyio's thread pool,
+    which serves the sync routes) free.
+
+    Pools are created on first use and again after `shutdown`, so one container survives
+    several application lifespans.
+    """
+
+    def __init__(self, config: ExecutorConfig | None = None) -> None:
+        self._config = config or ExecutorConfig()
+        self._lock = threading.Lock()
+        self._pools: dict[PoolKind, Executor] = {}
+        self._pending = 0
+        self._counters = {"submitted": 0, "completed": 0, "cancelled": 0, "rejected": 0}
+
+    @property
+    def config(self) -> ExecutorConfig:
+        return self._config
+
+    async def run_inference(self, fn: Callable[..., T], *args: Any) -> T:
+        return await self._run("inference", fn, *args)
+
+    async def run_search(self, fn: Callable[..., T], *args: Any) -> T:
+        """Runs `fn` in a worker process when configured; `fn` and its arguments must pickle."""
+
+        kind: PoolKind = "search" if self._config.search_processes > 0 else "inference"
+        return await self._run(kind, fn, *args)
+
+    async def _run(self, kind: PoolKind, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self._config.max_pending:
+                self._counters["rejected"] += 1
+                raise ExecutorSaturatedError(self._pending)
+            self._pending += 1
+            self._counters["submitted"] += 1
+            pool = self._pool(kind)
+        try:
+            future = pool.submit(fn, *args)
+        except BaseException:
+            self._finish(None)
+            raise
+        # 대기 중인 작업 수는 호출자가 아니라 실제 작업이 끝날 때 줄어야 상한이 의미가 있다.
+        future.add_done_callback(self._finish)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # 아직 시작하지 않은 작업은 버린다. 이미 실행 중인 탐색은 자체 시간 예산 안에서 끝난다.
+            future.cancel()
+            raise
+
+    def _finish(self, future: Future | None) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future is not None and future.cancelled():
+                self._counters["cancelled"] += 1
+            else:
+                self._counters["completed"] += 1
+
+    def _pool(self, kind: PoolKind) -> Executor:
+        pool = self._pools.get(kind)
+        if pool is None:
+            if kind == "search":
+                # 스레드가 있는 프로세스에서 fork 하지 않도록 spawn 으로 워커를 띄운다.
+                pool = ProcessPoolExecutor(
+                    max_workers=self._config.search_processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_lower_priority,
+                    initargs=(self._config.search_niceness,),
+                )
+            else:
+                pool = ThreadPoolExecutor(
+                    max_workers=max(1, self._config.inference_threads),
+                    thread_name_prefix="onecard-ai",
+                )
+            self._pools[kind] = pool
+        return pool
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"pending": self._pending, "maxPending": self._config.max_pending, **self._counters}
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _lower_priority(niceness: int) -> None:
+    # 탐색은 시간 예산 안에서 덜 반복할 뿐이지만, 요청 처리가 밀리면 응답 시간이 그대로 늘어난다.
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+
+
+_default_executor: AiExecutor | None = None
+_default_lock = threading.Lock()
+
+
+def default_executor() -> AiExecutor:
+    """The process-wide executor (configured from the environment) that services share when
+    none is passed, so `max_pending` bounds the whole process rather than each service."""
+
+    global _default_executor
+    with _default_lock:
+        if _default_executor is None:
+            _default_executor = AiExecutor(ExecutorConfig.from_env())
+        return _default_executor
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from onecard_api.domain.types import AIDifficulty, GameState
+from onecard_api.services.game_ai_service import GameAiService
+from onecard_api.services.game_state_store import GameSessionRecord
+
+
+@dataclass(frozen=True, slots=True)
+class PrefetchConfig:
+    """When to compute the next AI turn ahead of the `ai-turns` request.
+
+    Only `difficulties` whose move follows from the state alone are prefetched (the rule
+    AI and the ONNX policy); `hard` search spends a time budget and a worker per move, so
+    computing it speculatively would compete with requests. At most `max_entries` results
+    are kept, oldest dropped first.
+    """
+
+    enabled: bool = False
+    difficulties: tuple[AIDifficulty, ...] = ("easy", "medium")
+    max_entries: int = 1024
+
+    @classmethod
+    def from_env(cls) -> PrefetchConfig:
+        defaults = cls()
+        return cls(
+            enabled=os.getenv("ONECARD_AI_PREFETCH", "").lower() in ("1", "true"),
+            max_entries=int(os.getenv("ONECARD_AI_PREFETCH_MAX", defaults.max_entries)),
+        )
+
+
+@dataclass(slots=True)
+class _Entry:
+    version: int
+    state_hash: int
+    task: asyncio.Task
+
+
+class AiMovePrefetcher:
+    """Starts the next AI turn in the background right after a write, keyed by game version.
+
+    `take` hands the result to `execute_ai_turn` only if the game is still at the version
+    (and state hash) it was computed from; any other write makes it stale. Results live on
+    the event loop that scheduled them and are neither logged nor written to the store by
+    themselves; `GameService` does both when it applies one.
+    """
+
+    def __init__(self, game_ai_service: GameAiService, config: PrefetchConfig | None = None) -> None:
+        self._game_ai_service = game_ai_service
+        self._config = config or PrefetchConfig()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._counters = {
+            "scheduled": 0,
+            "hits": 0,
+            "misses": 0,
+            "invalidated": 0,
+            "failed": 0,
+            "skipped": 0,
+        }
+
+    @property
+    def config(self) -> PrefetchConfig:
+        return self._config
+
+    def schedule(self, record: GameSessionRecord) -> bool:
+        """Starts computing the AI turn of `record` if an eligible AI seat is to move."""
+
+        game_id = record["id"]
+        self.invalidate(game_id)
+        state = record["state"]
+        if not self._eligible(state):
+            return False
+        executor = self._game_ai_service.executor.stats()
+        # 요청이 쓸 실행기 자리를 남겨 둔다. 추측 계산 때문에 실제 요청이 503을 받으면 안 된다.
+        if executor["pending"] * 2 >= executor["maxPending"]:
+            self._counters["skipped"] += 1
+            return False
+
+        task = asyncio.get_running_loop().create_task(
+            self._game_ai_service.play_while_ai_turn(state, {"gameId": game_id, "logActions": False})
+        )
+        task.add_done_callback(self._settled)
+        self._entries[game_id] = _Entry(record["version"], state["zobrist"].full, task)
+        self._counters["scheduled"] += 1
+        while len(self._entries) > self._config.max_entries:
+            _, oldest = self._entries.popitem(last=False)
+            self._discard(oldest)
+        return True
+
+    async def take(self, record: GameSessionRecord) -> dict | None:
+        """The prefetched AI turn for exactly this record, waiting if it is still running."""
+
+        if not self._eligible(record["state"]):
+            return None
+        entry = self._entries.pop(record["id"], None)
+        if entry is not None and (
+            entry.version != record["version"]
+            or entry.state_hash != record["state"]["zobrist"].full
+            or entry.task.get_loop() is not asyncio.get_running_loop()
+        ):
+            self._discard(entry)
+            entry = None
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+
+        try:
+            # 요청이 취소돼도(클라이언트 끊김) 계산은 취소하지 않는다.
+            result = await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            if not entry.task.cancelled():
+                raise
+            result = None
+        except Exception:
+            result = None
+        self._counters["hits" if result is not None else "misses"] += 1
+        return result
+
+    def invalidate(self, game_id: str) -> None:
+        entry = self._entries.pop(game_id, None)
+        if entry is not None:
+            self._discard(entry)
+
+    def clear(self) -> None:
+        for entry in self._entries.values():
+            if not entry.task.done():
+                entry.task.cancel()
+        self._entries.clear()
+
+    def metrics(self) -> dict:
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "enabled": self._config.enabled,
+            "entries": len(self._entries),
+            "running": sum(1 for entry in self._entries.values() if not entry.task.done()),
+            "hitRate": self._counters["hits"] / lookups if lookups else None,
+            **self._counters,
+        }
+
+    def _eligible(self, state: GameState) -> bool:
+        settings = state["settings"]
+        return (
+            self._config.enabled
+            and state["gameStatus"] == "playing"
+            and settings["mode"] == "single"
+            and settings["difficulty"] in self._config.difficulties
+            and self._game_ai_service.is_ai_turn(state)
+        )
+
+    def _discard(self, entry: _Entry) -> None:
+        if not entry.task.done():
+            entry.task.cancel()
+        self._counters["invalidated"] += 1
+
+    def _settled(self, task: asyncio.Task) -> None:
+        # 예외를 여기서 꺼내 두어야 아무도 take 하지 않은 실패가 경고로 남지 않는다.
+        if not task.cancelled() and task.exception() is not None:
+            self._counters["failed"] += 1
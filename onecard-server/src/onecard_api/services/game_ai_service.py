@@ -1,18 +1,21 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
+import time
 from typing import Any
 
 from onecard_api.domain.engine import (
     GameAction,
-    apply_special_effect_action,
     draw_card_action,
-    next_turn_action,
+    legal_actions_scope,
     play_card_action,
 )
-from onecard_api.domain.players import find_playable_card_brute_force
-from onecard_api.domain.types import GameState, Player, PokerCard
+from onecard_api.domain.types import AIDifficulty, GameState, Player
+from onecard_api.search import puct
+from onecard_api.search.ismcts import SearchConfig, search
+from onecard_api.services.ai_executor import AiExecutor, ExecutorSaturatedError, default_executor
 from onecard_api.services.game_engine_service import GameEngineService
 from onecard_api.services.onnx_policy_service import OnnxPolicyService
 
@@ -24,18 +27,106 @@ class GameAiService:
         self,
         game_engine: GameEngineService,
         onnx_policy_service: OnnxPolicyService,
+        search_config: SearchConfig | None = None,
+        puct_config: puct.PuctConfig | None = None,
+        executor: AiExecutor | None = None,
     ) -> None:
         self._game_engine = game_engine
         self._onnx_policy_service = onnx_policy_service
+        self._search_config = search_config or SearchConfig()
+        self._puct_config = puct_config or puct.PuctConfig()
+        self._executor = executor or default_executor()
+
+    @property
+    def game_engine(self) -> GameEngineService:
+        return self._game_engine
+
+    @property
+    def onnx_policy_service(self) -> OnnxPolicyService:
+        return self._onnx_policy_service
+
+    @property
+    def executor(self) -> AiExecutor:
+        return self._executor
 
     async def play_while_ai_turn(
         self, state: GameState, context: dict[str, Any] | None = None
     ) -> dict | None:
         if state["settings"]["mode"] != "single" or not self.is_ai_turn(state):
             return None
+        return await self.play_turn_as(state, state["settings"]["difficulty"], context)
+
+    async def play_until_human_turn(
+        self,
+        state: GameState,
+        max_turns: int,
+        context: dict[str, Any] | None = None,
+        first_turn: dict | None = None,
+    ) -> dict | None:
+        """Plays AI turns back to back until a human is to move, the game ends or `max_turns` pass.
+
+        `info.aiActions` holds every constituent action in order and `info.turns` the per-turn
+        details; `info.truncated` is set when the chain stopped while an AI was still to move.
+        `first_turn` is an already computed result of the first turn (see `AiMovePrefetcher`).
+        """
+
+        turns: list[dict[str, Any]] = []
+        actions: list[GameAction] = []
+        current = state
+        while len(turns) < max_turns:
+            try:
+                if first_turn is not None and not turns:
+                    result = first_turn
+                else:
+                    result = await self.play_while_ai_turn(current, context)
+            except ExecutorSaturatedError:
+                # 이미 둔 수는 버리지 않는다. 남은 차례는 다음 요청이 이어서 둔다.
+                if not turns:
+                    raise
+                break
+            if result is None:
+                break
+            turns.append({"playerIndex": current["currentPlayerIndex"], **result["info"]})
+            actions.extend(result["info"]["aiActions"])
+            current = result["state"]
+            if result["done"]:
+                break
+        if not turns:
+            return None
+
+        finished = current["gameStatus"] == "finished"
+        return {
+            "state": current,
+            "done": finished,
+            "info": {
+                "aiActions": actions,
+                "turns": turns,
+                "truncated": not finished and self.is_ai_turn(current),
+            },
+        }
 
-        if state["settings"]["difficulty"] == "medium":
+    async def play_turn_as(
+        self,
+        state: GameState,
+        difficulty: AIDifficulty,
+        context: dict[str, Any] | None = None,
+    ) -> dict | None:
+        """Plays the current AI seat's turn with the strategy of `difficulty`."""
+
+        # 행동 마스크와 규칙 기반 대체 경로가 같은 상태의 합법 수를 한 번만 계산하게 한다.
+        with legal_actions_scope():
+            return await self._play_turn_as(state, difficulty, context)
+
+    async def _play_turn_as(
+        self,
+        state: GameState,
+        difficulty: AIDifficulty,
+        context: dict[str, Any] | None,
+    ) -> dict | None:
+        if difficulty == "medium":
             return await self._play_with_onnx(state, context)
+        if difficulty == "hard":
+            return await self._play_with_search(state, context)
 
         turn_result = self._execute_turn(state, context)
         if not turn_result:
@@ -54,72 +145,36 @@ class GameAiService:
         if not player.get("isAI"):
             return None
 
-        current_state = state
-        last_result: dict | None = None
-        actions: list[GameAction] = []
-
-        top_card = current_state["discardPile"][0] if current_state["discardPile"] else None
-        card_to_play = (
-            find_playable_card_brute_force(
-                player["hand"], top_card, current_state["damage"]
-            )
-            if top_card
-            else None
-        )
-
-        if card_to_play:
-            playable_index = next(
-                (idx for idx, c in enumerate(player["hand"]) if c["id"] == card_to_play["id"]),
-                -1,
-            )
-            play_outcome = self._apply_action(
-                current_state,
-                play_card_action(current_state["currentPlayerIndex"], playable_index),
-                context,
-            )
-            current_state = play_outcome["state"]
-            last_result = play_outcome["result"]
-            self._push_action(actions, play_outcome["result"])
-
-            if self._has_special_effect(card_to_play):
-                effect_outcome = self._apply_action(
-                    current_state, apply_special_effect_action(card_to_play), context
-                )
-                current_state = effect_outcome["state"]
-                last_result = effect_outcome["result"]
-                self._push_action(actions, effect_outcome["result"])
+        legal = self._game_engine.legal_actions(state)
+        if state["discardPile"] and legal.play_indices:
+            action = play_card_action(state["currentPlayerIndex"], legal.play_indices[0])
         else:
-            draw_outcome = self._apply_action(
-                current_state,
-                draw_card_action(max(1, current_state["damage"])),
-                context,
-            )
-            current_state = draw_outcome["state"]
-            last_result = draw_outcome["result"]
-            self._push_action(actions, draw_outcome["result"])
-
-        if current_state["gameStatus"] != "finished":
-            next_outcome = self._apply_action(current_state, next_turn_action(), context)
-            current_state = next_outcome["state"]
-            last_result = next_outcome["result"]
-            self._push_action(actions, next_outcome["result"])
+            action = draw_card_action(max(1, state["damage"]))
 
-        return {"state": current_state, "actions": actions, "result": last_result}
+        return self._apply_turn(state, action, context)
 
-    def _apply_action(
+    def _apply_turn(
         self,
         state: GameState,
         action: GameAction,
         context: dict[str, Any] | None = None,
     ) -> dict:
-        self._log_ai_action(action, state["players"][state["currentPlayerIndex"]], context)
-        result = self._game_engine.step(state, action)
-        return {"state": result["state"], "result": result}
+        # 카드 내기/특수 효과/턴 넘김을 한 번의 전이로 처리하고, 구성 액션은 그대로 기록한다.
+        result = self._game_engine.play_turn(state, action)
+        actions: list[GameAction] = result["info"]["actions"]
+        # 미리 계산한(아직 적용되지 않은) 수는 context["logActions"]=False 로 기록을 미룬다.
+        if context is None or context.get("logActions", True):
+            self.log_ai_actions(state, actions, context)
+        return {"state": result["state"], "actions": actions, "result": result}
 
-    def _push_action(self, actions: list[GameAction], result: dict) -> None:
-        info_action = (result.get("info") or {}).get("action")
-        if info_action:
-            actions.append(info_action)  # type: ignore[arg-type]
+    def log_ai_actions(
+        self, state: GameState, actions: list[GameAction], context: dict[str, Any] | None = None
+    ) -> None:
+        """Logs the actions the seat to move in `state` played (one "[AI] ai-action" line each)."""
+
+        actor = state["players"][state["currentPlayerIndex"]]
+        for constituent in actions:
+            self._log_ai_action(constituent, actor, context)
 
     def _log_ai_action(
         self, action: GameAction, actor: Player | None, context: dict[str, Any] | None
@@ -140,22 +195,13 @@ class GameAiService:
             serialized = str(metadata)
         logger.info("[AI] %s", serialized)
 
-    def _has_special_effect(self, card: PokerCard) -> bool:
-        if card.get("isJoker"):
-            return True
-        special_ranks = {1, 2, 11, 12, 13}
-        rank = card.get("rank")
-        return rank in special_ranks if rank is not None else False
-
     async def _play_with_onnx(
         self, state: GameState, context: dict[str, Any] | None = None
     ) -> dict | None:
         try:
-            current_state = state
-            actions: list[GameAction] = []
-            last_result: dict | None = None
-
-            prediction = await self._onnx_policy_service.predict_action(current_state)
+            if self._puct_config.enabled:
+                return await self._play_with_puct(state, context)
+            prediction = await self._onnx_policy_service.predict_action(state)
             payload = prediction["payload"]
             action_index = prediction["actionIndex"]
             is_draw = payload.get("type") == "DRAW_CARD"
@@ -175,39 +221,17 @@ class GameAiService:
                 json.dumps(payload, ensure_ascii=False),
             )
 
-            first_outcome = self._apply_action(current_state, first_action, context)
-            current_state = first_outcome["state"]
-            last_result = first_outcome["result"]
-            self._push_action(actions, first_outcome["result"])
-
-            if not is_draw:
-                player = state["players"][state["currentPlayerIndex"]]
-                card_to_play = (
-                    player["hand"][card_index]
-                    if 0 <= int(card_index) < len(player["hand"])
-                    else None
-                )
-                if card_to_play and self._has_special_effect(card_to_play):
-                    effect_outcome = self._apply_action(
-                        current_state, apply_special_effect_action(card_to_play), context
-                    )
-                    current_state = effect_outcome["state"]
-                    last_result = effect_outcome["result"]
-                    self._push_action(actions, effect_outcome["result"])
-
-            if current_state["gameStatus"] != "finished":
-                next_outcome = self._apply_action(
-                    current_state, next_turn_action(), context
-                )
-                current_state = next_outcome["state"]
-                last_result = next_outcome["result"]
-                self._push_action(actions, next_outcome["result"])
+            outcome = self._apply_turn(state, first_action, context)
+            current_state = outcome["state"]
+            actions = outcome["actions"]
 
             return {
                 "state": current_state,
                 "done": current_state["gameStatus"] == "finished",
                 "info": {"aiActions": actions, "source": "onnx"},
             }
+        except ExecutorSaturatedError:
+            raise
         except Exception as error:  # broad catch to match JS fallback behaviour
             logger.error(
                 "[AI][ONNX] fallback to rule-based due to: %s",
@@ -226,6 +250,76 @@ class GameAiService:
                 }
             return None
 
+    async def _play_with_puct(
+        self, state: GameState, context: dict[str, Any] | None = None
+    ) -> dict:
+        config = self._puct_config
+        loaded = await self._onnx_policy_service.load_policy(state["settings"])
+        deadline = time.perf_counter() + config.time_budget_ms / 1000
+        result = await self._executor.run_inference(
+            functools.partial(
+                puct.search, state, loaded.session, loaded.spec, config, deadline=deadline
+            )
+        )
+        logger.info(
+            "[AI][PUCT] nodes=%s evaluations=%s elapsedMs=%.1f visits=%s",
+            result.nodes,
+            result.evaluations,
+            result.elapsed_ms,
+            result.visits,
+        )
+        outcome = self._apply_turn(state, result.action, context)
+        return {
+            "state": outcome["state"],
+            "done": outcome["state"]["gameStatus"] == "finished",
+            "info": {
+                "aiActions": outcome["actions"],
+                "source": "puct",
+                "nodes": result.nodes,
+                "evaluations": result.evaluations,
+            },
+        }
+
+    async def _play_with_search(
+        self, state: GameState, context: dict[str, Any] | None = None
+    ) -> dict | None:
+        if not self.is_ai_turn(state):
+            return None
+        # 마감 시각을 요청 시점에 고정해, 스레드 대기가 길어지면 탐색을 줄여서라도 제시간에 응답한다.
+        # perf_counter 는 시스템 전역 단조 시계라 워커 프로세스에서도 같은 마감 시각이 통한다.
+        deadline = time.perf_counter() + self._search_config.time_budget_ms / 1000
+        try:
+            result = await self._executor.run_search(
+                functools.partial(search, state, self._search_config, deadline=deadline)
+            )
+        except ValueError as error:  # 코드로 표현할 수 없는 카드가 섞인 상태
+            logger.error("[AI][ISMCTS] fallback to rule-based due to: %s", error)
+            fallback = self._execute_turn(state, context)
+            if fallback is None:
+                return None
+            return {
+                "state": fallback["state"],
+                "done": fallback["state"]["gameStatus"] == "finished",
+                "info": {"aiActions": fallback["actions"], "source": "fallback"},
+            }
+
+        logger.info(
+            "[AI][ISMCTS] iterations=%s elapsedMs=%.1f visits=%s",
+            result.iterations,
+            result.elapsed_ms,
+            result.visits,
+        )
+        outcome = self._apply_turn(state, result.action, context)
+        return {
+            "state": outcome["state"],
+            "done": outcome["state"]["gameStatus"] == "finished",
+            "info": {
+                "aiActions": outcome["actions"],
+                "source": "ismcts",
+                "iterations": result.iterations,
+            },
+        }
+
     def _describe_onnx_error(self, error: Exception) -> str:
         return f"{error.__class__.__name__}: {error}"
 
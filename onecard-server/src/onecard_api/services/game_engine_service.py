@@ -1,23 +1,43 @@
 from __future__ import annotations
 
+from typing import Literal
+
 from fastapi import HTTPException, status
 
 from onecard_api.domain.engine import (
     GameAction,
     apply_special_effect_action,
+    compact_play_turn,
+    compact_step,
     create_started_state,
     create_waiting_state,
     draw_card_action,
+    LegalActions,
     end_game_action,
+    legal_actions,
     next_turn_action,
     play_card_action,
+    play_turn,
     start_game_action,
     step,
 )
 from onecard_api.domain.types import GameSettings, GameState, PokerCard, RankValue, is_valid_rank, is_valid_suit
 
 
+EngineKind = Literal["dict", "compact"]
+ENGINE_KINDS: tuple[EngineKind, ...] = ("dict", "compact")
+
+
 class GameEngineService:
+    def __init__(self, engine: EngineKind = "dict") -> None:
+        if engine not in ENGINE_KINDS:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINE_KINDS}")
+        self._engine = engine
+
+    @property
+    def engine(self) -> EngineKind:
+        return self._engine
+
     def create_waiting_state(self, settings: GameSettings) -> GameState:
         return create_waiting_state(settings)
 
@@ -25,8 +45,18 @@ class GameEngineService:
         return create_started_state(settings)
 
     def step(self, state: GameState, action: GameAction) -> dict:
+        if self._engine == "compact":
+            return compact_step(state, action)
         return step(state, action)
 
+    def legal_actions(self, state: GameState, player_index: int | None = None) -> LegalActions:
+        return legal_actions(state, player_index)
+
+    def play_turn(self, state: GameState, action: GameAction) -> dict:
+        if self._engine == "compact":
+            return compact_play_turn(state, action)
+        return play_turn(state, action)
+
     def build_action(self, payload: dict) -> GameAction:
         action_type = payload.get("type")
         if action_type == "START_GAME":
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+
+class GameLocks:
+    """One asyncio lock per game id, so mutations of a game run one at a time.
+
+    Different games never wait for each other. A lock exists only while someone holds or
+    awaits it, so the registry does not grow with the number of games. Locks are per
+    process; across workers sharing a backend, `GameStateStore.update_state(expected_version=...)`
+    is checked by the backend, so the slower of two racing writes fails with a conflict.
+    """
+
+    def __init__(self) -> None:
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._users: dict[str, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, game_id: str) -> AsyncIterator[None]:
+        lock = self._locks.get(game_id)
+        if lock is None:
+            lock = self._locks[game_id] = asyncio.Lock()
+        self._users[game_id] = self._users.get(game_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._users[game_id] -= 1
+            if not self._users[game_id]:
+                del self._users[game_id]
+                del self._locks[game_id]
+
+    def __len__(self) -> int:
+        return len(self._locks)
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 
-from onecard_api.domain.card_utils import is_valid_play
 from onecard_api.domain.engine import GameAction
+from onecard_api.domain.state import public_settings, serialize_state
 from onecard_api.domain.types import GameState
+from onecard_api.services.ai_prefetch import AiMovePrefetcher
 from onecard_api.services.game_ai_service import GameAiService
 from onecard_api.services.game_engine_service import GameEngineService
-from onecard_api.services.game_state_store import GameSessionRecord, GameStateStore
+from onecard_api.services.game_locks import GameLocks
+from onecard_api.services.game_state_store import GameSessionRecord, GameStateStore, VersionConflictError
+from onecard_api.services.session_index import SessionQuery
+
+# 한 요청에서 연달아 둘 수 있는 AI 차례 수의 상한 (AI끼리만 남은 게임이 요청을 붙잡지 않도록).
+DEFAULT_MAX_AI_TURNS = 32
 
 
 class GameService:
@@ -16,22 +23,41 @@ class GameService:
         game_state_store: GameStateStore,
         game_engine: GameEngineService,
         game_ai_service: GameAiService,
+        game_locks: GameLocks | None = None,
+        max_ai_turns: int = DEFAULT_MAX_AI_TURNS,
+        ai_prefetcher: AiMovePrefetcher | None = None,
     ) -> None:
         self._game_state_store = game_state_store
         self._game_engine = game_engine
         self._game_ai_service = game_ai_service
+        # 같은 게임의 변경만 직렬화한다. 다른 게임은 계속 병렬로 진행된다.
+        self._game_locks = game_locks or GameLocks()
+        self._max_ai_turns = max(1, max_ai_turns)
+        self._ai_prefetcher = ai_prefetcher
 
-    def list_games(self) -> list[dict]:
-        return [
-            {
-                "id": record["id"],
-                "createdAt": record["created_at"].isoformat(),
-                "updatedAt": record["updated_at"].isoformat(),
-                "gameStatus": record["state"]["gameStatus"],
-                "currentPlayerIndex": record["state"]["currentPlayerIndex"],
-            }
-            for record in self._game_state_store.list()
-        ]
+    def list_games(self, query: SessionQuery | None = None) -> dict:
+        try:
+            summaries, next_cursor = self._game_state_store.page(query or SessionQuery())
+        except ValueError as error:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(error),
+            ) from None
+        return {
+            "items": [
+                {
+                    "id": summary.id,
+                    "createdAt": summary.created_at.isoformat(),
+                    "updatedAt": summary.updated_at.isoformat(),
+                    "gameStatus": summary.game_status,
+                    "currentPlayerIndex": summary.current_player_index,
+                    "settings": public_settings(summary.settings),
+                    "version": summary.version,
+                }
+                for summary in summaries
+            ],
+            "nextCursor": next_cursor,
+        }
 
     def create_game(self, settings: dict | None = None) -> dict:
         record = self._game_state_store.create(settings)
@@ -41,13 +67,27 @@ class GameService:
         record = self._find_game_or_throw(game_id)
         return self._to_resource(record)
 
-    def apply_action(self, game_id: str, action_payload: dict | None) -> dict:
+    async def apply_action(
+        self, game_id: str, action_payload: dict | None, expected_version: int | None = None
+    ) -> dict:
         if action_payload is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Action payload is required",
             )
+        async with self._game_locks.hold(game_id):
+            # 저장소가 백엔드에서 읽어 재생할 수도 있으므로 이벤트 루프 밖에서 처리한다.
+            result, updated = await run_in_threadpool(
+                self._apply_action, game_id, action_payload, expected_version
+            )
+            self._prefetch_ai_turn(updated)
+        return self._to_response(result, updated)
+
+    def _apply_action(
+        self, game_id: str, action_payload: dict, expected_version: int | None
+    ) -> tuple[dict, GameSessionRecord]:
         record = self._find_game_or_throw(game_id)
+        self._assert_version(record, expected_version)
 
         if (
             record["state"]["gameStatus"] == "waiting"
@@ -63,11 +103,31 @@ class GameService:
 
         action: GameAction = self._game_engine.build_action(action_payload)
         result = self._game_engine.step(record["state"], action)
-        self._game_state_store.update_state(game_id, result["state"])
-        return result
+        updated = self._update_state_or_throw(record, result["state"], [action])
+        return result, updated
 
-    async def execute_ai_turn(self, game_id: str) -> dict:
-        record = self._find_game_or_throw(game_id)
+    async def execute_ai_turn(
+        self,
+        game_id: str,
+        expected_version: int | None = None,
+        until_human: bool = False,
+        max_turns: int | None = None,
+    ) -> dict:
+        """Plays the current AI seat's turn, or with `until_human` every AI turn up to the next
+        human one (at most `max_turns`, capped by the service limit), and stores the result once."""
+
+        async with self._game_locks.hold(game_id):
+            return await self._execute_ai_turn(game_id, expected_version, until_human, max_turns)
+
+    async def _execute_ai_turn(
+        self,
+        game_id: str,
+        expected_version: int | None,
+        until_human: bool,
+        max_turns: int | None,
+    ) -> dict:
+        record = await run_in_threadpool(self._find_game_or_throw, game_id)
+        self._assert_version(record, expected_version)
         current_state: GameState = record["state"]
         if current_state["gameStatus"] != "playing":
             raise HTTPException(
@@ -80,25 +140,68 @@ class GameService:
                 detail="현재 차례는 AI가 아닙니다.",
             )
 
-        ai_result = await self._game_ai_service.play_while_ai_turn(
-            current_state, {"gameId": game_id}
-        )
+        context = {"gameId": game_id}
+        prefetched = await self._ai_prefetcher.take(record) if self._ai_prefetcher else None
+        if until_human:
+            limit = min(max_turns or self._max_ai_turns, self._max_ai_turns)
+            ai_result = await self._game_ai_service.play_until_human_turn(
+                current_state, limit, context, first_turn=prefetched
+            )
+        elif prefetched is not None:
+            ai_result = prefetched
+        else:
+            ai_result = await self._game_ai_service.play_while_ai_turn(current_state, context)
         if ai_result is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="AI가 수행할 수 있는 행동이 없습니다.",
             )
-        self._game_state_store.update_state(game_id, ai_result["state"])
-        return ai_result
+        updated = await run_in_threadpool(
+            self._update_state_or_throw, record, ai_result["state"], ai_result["info"].get("aiActions")
+        )
+        if prefetched is not None:
+            # 미리 계산한 수는 계산할 때 기록하지 않았으므로 실제로 적용한 지금 기록한다.
+            self._game_ai_service.log_ai_actions(current_state, prefetched["info"]["aiActions"], context)
+        # 다음 차례도 AI 라면(여러 AI 좌석을 한 턴씩 진행하는 클라이언트) 미리 계산해 둔다.
+        self._prefetch_ai_turn(updated)
+        return self._to_response(ai_result, updated)
+
+    def get_history(self, game_id: str) -> dict:
+        history = self._game_state_store.history(game_id)
+        if history is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No action log for game {game_id}",
+            )
+        return {
+            "id": game_id,
+            "actions": [{"seq": seq, "action": action} for seq, action in history],
+        }
 
-    def delete_game(self, game_id: str) -> None:
-        deleted = self._game_state_store.delete(game_id)
+    def get_state_at(self, game_id: str, seq: int) -> dict:
+        state = self._game_state_store.state_at(game_id, seq)
+        if state is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No logged state {seq} for game {game_id}",
+            )
+        return {"id": game_id, "seq": seq, "state": serialize_state(state)}
+
+    async def delete_game(self, game_id: str) -> None:
+        async with self._game_locks.hold(game_id):
+            deleted = await run_in_threadpool(self._game_state_store.delete, game_id)
+            if self._ai_prefetcher is not None:
+                self._ai_prefetcher.invalidate(game_id)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Game {game_id} not found",
             )
 
+    def _prefetch_ai_turn(self, record: GameSessionRecord) -> None:
+        if self._ai_prefetcher is not None:
+            self._ai_prefetcher.schedule(record)
+
     def _find_game_or_throw(self, game_id: str) -> GameSessionRecord:
         record = self._game_state_store.find(game_id)
         if not record:
@@ -108,14 +211,47 @@ class GameService:
             )
         return record
 
+    def _update_state_or_throw(
+        self, record: GameSessionRecord, state: GameState, actions: list[GameAction] | None
+    ) -> GameSessionRecord:
+        try:
+            updated = self._game_state_store.update_state(
+                record["id"], state, actions, expected_version=record["version"]
+            )
+        except VersionConflictError as error:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=str(error),
+            ) from None
+        if not updated:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Game {record['id']} not found",
+            )
+        return updated
+
+    def _assert_version(self, record: GameSessionRecord, expected_version: int | None) -> None:
+        if expected_version is not None and record["version"] != expected_version:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail=f"Game {record['id']} is at version {record['version']}, not {expected_version}",
+            )
+
     def _to_resource(self, record: GameSessionRecord) -> dict:
         return {
             "id": record["id"],
-            "state": record["state"],
+            "state": serialize_state(record["state"]),
             "createdAt": record["created_at"].isoformat(),
             "updatedAt": record["updated_at"].isoformat(),
+            "version": record["version"],
         }
 
+    def _to_response(self, result: dict, record: GameSessionRecord | None = None) -> dict:
+        response = {**result, "state": serialize_state(result["state"])}
+        if record is not None:
+            response["version"] = record["version"]
+        return response
+
     def _assert_playable_card(self, state: GameState, payload: dict) -> None:
         player_index = payload.get("playerIndex", -1)
         card_index = payload.get("cardIndex", -1)
@@ -139,10 +275,7 @@ class GameService:
                 detail="discardPile 이 비어 있습니다. 게임 상태를 확인하세요.",
             )
 
-        played_card = hand[card_index]
-        top_card = state["discardPile"][0]
-        damage = state["damage"]
-        if not is_valid_play(played_card, top_card, damage):
+        if not self._game_engine.legal_actions(state, player_index).can_play(card_index):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="규칙에 맞지 않는 카드입니다.",
@@ -1,13 +1,39 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Sequence
 from copy import deepcopy
-from datetime import datetime, timezone
-from typing import TypedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Literal, Protocol, TypedDict
 from uuid import uuid4
 
 from onecard_api.domain.constants import DEFAULT_GAME_SETTINGS
+from onecard_api.domain.state_codec import pack_state, unpack_state
 from onecard_api.domain.types import GameSettings, GameState
 from onecard_api.services.game_engine_service import GameEngineService
+from onecard_api.services.session_index import SessionIndex, SessionQuery, SessionSummary
+
+logger = logging.getLogger("onecard_api.game_state_store")
+
+GameAction = dict[str, Any]
+
+# 기본 설정에 없지만 요청으로 지정할 수 있는 설정 키
+OPTIONAL_SETTING_KEYS: tuple[str, ...] = ("seed",)
+
+EvictionReason = Literal["idle", "finished", "capacity", "memory"]
+
+# 리퍼가 잠금을 다시 잡기 전에 잠금 없이 압축하는 세션 수
+_PACK_BATCH = 64
+
+# 버린 카드 더미 노드(DiscardPile, __slots__ 3개) 하나의 크기
+_DISCARD_NODE_BYTES = 64
 
 
 class GameSessionRecord(TypedDict):
@@ -16,53 +42,783 @@ class GameSessionRecord(TypedDict):
     state: GameState
     created_at: datetime
     updated_at: datetime
+    version: int  # 생성 시 1, update_state 마다 1씩 증가
+
+
+class VersionConflictError(Exception):
+    """Raised by `update_state` when the game moved past the expected version.
+
+    `current` is the version found, in this process or in the backend (0 if the backend no
+    longer has the game).
+    """
+
+    def __init__(self, game_id: str, expected: int, current: int) -> None:
+        super().__init__(f"Game {game_id} is at version {current}, not {expected}")
+        self.game_id = game_id
+        self.expected = expected
+        self.current = current
+
+
+@dataclass(frozen=True, slots=True)
+class StoreLimits:
+    """Retention policy of the session store; `None` disables a limit.
+
+    Sessions untouched (no find/update) for `idle_ttl_seconds` expire, finished games
+    expire `finished_ttl_seconds` after they finish, and beyond `max_sessions` or
+    `max_memory_bytes` (approximate, see `estimate_record_bytes`) the least recently used
+    sessions are evicted. Sessions idle for `pack_idle_after_seconds` (finished ones after
+    `pack_finished_after_seconds`) are packed into compressed bytes until read again, at
+    most `max_packs_per_reap` per run. Expiry and packing run on `reap()`, which the app
+    calls every `reap_interval_seconds` off the event loop.
+    """
+
+    idle_ttl_seconds: float | None = 3600.0
+    finished_ttl_seconds: float | None = 300.0
+    max_sessions: int | None = None
+    max_memory_bytes: int | None = None
+    reap_interval_seconds: float = 30.0
+    pack_idle_after_seconds: float | None = 300.0
+    pack_finished_after_seconds: float | None = 30.0
+    max_packs_per_reap: int | None = 2000
+
+    @classmethod
+    def from_env(cls) -> StoreLimits:
+        defaults = cls()
+
+        def optional(name: str, default: float | None) -> float | None:
+            raw = os.getenv(name)
+            if raw is None:
+                return default
+            return float(raw) if float(raw) > 0 else None
+
+        max_sessions = optional("ONECARD_MAX_SESSIONS", defaults.max_sessions)
+        max_memory_mb = optional("ONECARD_MAX_SESSION_MB", None)
+        max_packs = optional("ONECARD_PACK_MAX_PER_REAP", defaults.max_packs_per_reap)
+        return cls(
+            idle_ttl_seconds=optional("ONECARD_SESSION_TTL_S", defaults.idle_ttl_seconds),
+            finished_ttl_seconds=optional("ONECARD_FINISHED_TTL_S", defaults.finished_ttl_seconds),
+            max_sessions=int(max_sessions) if max_sessions else None,
+            max_memory_bytes=int(max_memory_mb * 1024 * 1024) if max_memory_mb else None,
+            reap_interval_seconds=float(
+                os.getenv("ONECARD_REAP_INTERVAL_S", defaults.reap_interval_seconds)
+            ),
+            pack_idle_after_seconds=optional("ONECARD_PACK_IDLE_S", defaults.pack_idle_after_seconds),
+            pack_finished_after_seconds=optional(
+                "ONECARD_PACK_FINISHED_S", defaults.pack_finished_after_seconds
+            ),
+            max_packs_per_reap=int(max_packs) if max_packs else None,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FlushPolicy:
+    """Write-behind batching of a store with a backend.
+
+    Writes are buffered per game (later writes to the same game replace earlier ones) and
+    written by a background thread every `interval_seconds`, or as soon as `max_batch`
+    games are pending.
+    """
+
+    interval_seconds: float = 0.05
+    max_batch: int = 256
+
+    @classmethod
+    def from_env(cls) -> FlushPolicy:
+        defaults = cls()
+        return cls(
+            interval_seconds=float(
+                os.getenv("ONECARD_FLUSH_INTERVAL_MS", defaults.interval_seconds * 1000)
+            )
+            / 1000,
+            max_batch=int(os.getenv("ONECARD_FLUSH_BATCH", defaults.max_batch)),
+        )
+
+
+@dataclass(slots=True)
+class PendingJournal:
+    """Changes of one game since its last flush, for backends that log actions.
+
+    `base` is a state the log restarts from (a new game, or a state written without the
+    actions that produced it); `actions` were applied after it, in order, and lead to the
+    state of the record being written. `since_version` is the version the backend must
+    still hold for the journal to apply (0: the game must not be stored yet); `None`
+    writes unconditionally.
+    """
+
+    base: GameState | None = None
+    actions: list[GameAction] = field(default_factory=list)
+    since_version: int | None = None
+
+    def then(self, later: PendingJournal) -> PendingJournal:
+        if later.base is not None:
+            return PendingJournal(later.base, later.actions, self.since_version)
+        return PendingJournal(self.base, [*self.actions, *later.actions], self.since_version)
+
+
+class GameStateBackend(Protocol):
+    """Durable storage behind `GameStateStore` (see `services/sqlite_store.py`).
+
+    Methods may be called from any thread; `write_batch` is never called concurrently
+    with itself and must apply the whole batch atomically.
+    """
+
+    def load(self, game_id: str) -> GameSessionRecord | None: ...
+
+    def load_all(self) -> list[GameSessionRecord]: ...
+
+    def load_summaries(self) -> list[SessionSummary]:
+        """Listing metadata of every stored game, without loading states."""
+        ...
+
+    def write_batch(
+        self,
+        upserts: Sequence[GameSessionRecord],
+        deletes: Sequence[str],
+        journals: dict[str, PendingJournal],
+    ) -> dict[str, int]:
+        """Writes the batch; returns `{id: stored version}` of upserts skipped because the
+        backend no longer holds their journal's `since_version`."""
+        ...
+
+    def history(self, game_id: str) -> list[tuple[int, GameAction]] | None:
+        """`(seq, action)` of every action applied to the game, oldest first."""
+        ...
+
+    def state_at(self, game_id: str, seq: int) -> GameState | None: ...
+
+    def expired_ids(
+        self, idle_before: datetime | None, finished_before: datetime | None
+    ) -> list[tuple[str, bool]]:
+        """`(id, finished)` of games last written before the cutoff for their status."""
+        ...
+
+    def close(self) -> None: ...
+
+
+@dataclass(frozen=True, slots=True)
+class PackedSession:
+    """An idle session held as `pack_state` bytes (about 0.4 KB) until it is read again.
+
+    `settings` is `None` when the record shares the settings stored in the state.
+    """
+
+    id: str
+    settings: GameSettings | None
+    blob: bytes
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+    @classmethod
+    def pack(cls, record: GameSessionRecord) -> PackedSession:
+        state = record["state"]
+        settings = None if record["settings"] == state.get("settings") else record["settings"]
+        return cls(
+            record["id"],
+            settings,
+            pack_state(state),
+            record["created_at"],
+            record["updated_at"],
+            record["version"],
+        )
+
+    def unpack(self) -> GameSessionRecord:
+        state = unpack_state(self.blob)
+        return {
+            "id": self.id,
+            "settings": state["settings"] if self.settings is None else self.settings,
+            "state": state,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "version": self.version,
+        }
+
+    def estimate_bytes(self) -> int:
+        size = sys.getsizeof(self) + sys.getsizeof(self.blob)
+        return size + (sys.getsizeof(self.settings) if self.settings is not None else 0)
+
+
+def summarize(record: GameSessionRecord) -> SessionSummary:
+    state = record["state"]
+    return SessionSummary(
+        id=record["id"],
+        game_status=state["gameStatus"],
+        current_player_index=state["currentPlayerIndex"],
+        settings=record["settings"],
+        created_at=record["created_at"],
+        updated_at=record["updated_at"],
+        version=record["version"],
+    )
+
+
+def estimate_record_bytes(record: GameSessionRecord) -> int:
+    """Shallow size of the containers a session owns.
+
+    Cards are shared canonical objects and are not counted; lists, dicts and discard-pile
+    nodes are. Cheap enough to run on every write.
+    """
+
+    state = record["state"]
+    players = state["players"]
+    size = (
+        sys.getsizeof(record)
+        + sys.getsizeof(state)
+        + sys.getsizeof(record["settings"])
+        + sys.getsizeof(players)
+        + sys.getsizeof(state["deck"])
+        + len(state["discardPile"]) * _DISCARD_NODE_BYTES
+    )
+    for player in players:
+        size += sys.getsizeof(player) + sys.getsizeof(player.get("hand", ()))
+    return size
 
 
 class GameStateStore:
+    """Session store; in memory only, or a write-back cache in front of a backend.
+
+    With a `backend` the in-memory sessions are a cache: reads of cached games never touch
+    the backend, writes are buffered and flushed in batches (`FlushPolicy`), and capacity
+    or memory eviction only drops the cached copy (it is reloaded on the next `find`).
+    TTL expiry still deletes the game, from the backend too. `close()` flushes what is
+    pending. Caches of separate processes are not kept coherent with each other, but a
+    write with `expected_version` is written through and checked against the backend, so
+    workers sharing one never both store the same version (see `update_state`).
+
+    Listing goes through a `SessionIndex` of every game (cached or only in the backend),
+    so `page()` never loads states.
+    """
+
     def __init__(
         self,
         default_settings: GameSettings = DEFAULT_GAME_SETTINGS,
         game_engine: GameEngineService | None = None,
+        limits: StoreLimits | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        backend: GameStateBackend | None = None,
+        flush_policy: FlushPolicy | None = None,
     ) -> None:
-        self._sessions: dict[str, GameSessionRecord] = {}
+        # 접근 순서(LRU → MRU)로 유지한다.
+        self._sessions: OrderedDict[str, GameSessionRecord | PackedSession] = OrderedDict()
         self._default_settings = deepcopy(default_settings)
         self._game_engine = game_engine or GameEngineService()
+        self._limits = limits or StoreLimits()
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._touched: dict[str, float] = {}
+        self._finished: OrderedDict[str, float] = OrderedDict()  # 끝난 시각 순
+        self._sizes: dict[str, int] = {}
+        self._total_bytes = 0
+        self._evictions: Counter[EvictionReason] = Counter()
+        self._packed = 0
+        self._packing: Counter[str] = Counter()
+        self._backend = backend
+        self._flush_policy = flush_policy or FlushPolicy()
+        # 아직 백엔드에 쓰지 않은 변경: 게임당 최신 레코드 하나, 삭제는 id 만 남긴다.
+        self._dirty: dict[str, GameSessionRecord] = {}
+        self._deleted: set[str] = set()
+        self._journals: dict[str, PendingJournal] = {}
+        self._in_flight: dict[str, GameSessionRecord | None] = {}  # 쓰는 중인 배치(None=삭제)
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._backend_stats: Counter[str] = Counter()
+        self._index = SessionIndex()
+        self._last_write = datetime.min.replace(tzinfo=timezone.utc)
+        if backend is not None:
+            for summary in sorted(backend.load_summaries(), key=lambda item: item.sort_key):
+                self._index.put(summary)
+                self._last_write = max(self._last_write, summary.updated_at)
+
+    @property
+    def limits(self) -> StoreLimits:
+        return self._limits
+
+    @property
+    def backend(self) -> GameStateBackend | None:
+        return self._backend
 
     def create(self, settings: GameSettings | dict | None = None) -> GameSessionRecord:
         merged_settings = self._merge_with_defaults(settings)
         session_id = str(uuid4())
         state = self._game_engine.create_waiting_state(merged_settings)
-        now = datetime.now(timezone.utc)
-        record: GameSessionRecord = {
-            "id": session_id,
-            "settings": merged_settings,
-            "state": state,
-            "created_at": now,
-            "updated_at": now,
-        }
-        self._sessions[session_id] = record
+        with self._lock:
+            now = self._stamp()
+            record: GameSessionRecord = {
+                "id": session_id,
+                "settings": merged_settings,
+                "state": state,
+                "created_at": now,
+                "updated_at": now,
+                "version": 1,
+            }
+            self._index.put(summarize(record))
+            self._put(record)
+            self._mark_dirty(record, PendingJournal(base=state, since_version=0))
+            self._enforce_caps()
         return record
 
     def list(self) -> list[GameSessionRecord]:
-        return list(self._sessions.values())
+        with self._lock:
+            if self._backend is None:
+                return [self._readable(entry) for entry in self._sessions.values()]
+            records = {record["id"]: record for record in self._backend.load_all()}
+            for game_id, pending in (*self._in_flight.items(), *self._dirty.items()):
+                if pending is None:
+                    records.pop(game_id, None)
+                else:
+                    records[game_id] = pending
+            for game_id in self._deleted:
+                records.pop(game_id, None)
+            for game_id, entry in self._sessions.items():
+                records[game_id] = self._readable(entry)
+            return list(records.values())
 
     def find(self, game_id: str) -> GameSessionRecord | None:
-        return self._sessions.get(game_id)
+        with self._lock:
+            entry = self._sessions.get(game_id)
+            if entry is None:
+                return self._load(game_id)
+            if entry.__class__ is PackedSession:
+                record = entry.unpack()  # type: ignore[union-attr]
+                self._packing["unpacks"] += 1
+                self._put(record)
+                self._enforce_caps()
+                return record
+            self._sessions.move_to_end(game_id)
+            self._touched[game_id] = self._clock()
+            return entry  # type: ignore[return-value]
+
+    def update_state(
+        self,
+        game_id: str,
+        state: GameState,
+        actions: Sequence[GameAction] | None = None,
+        expected_version: int | None = None,
+    ) -> GameSessionRecord | None:
+        """Stores `state` as the next version; `actions` are what turned the current state into it.
 
-    def update_state(self, game_id: str, state: GameState) -> GameSessionRecord | None:
-        record = self._sessions.get(game_id)
+        Backends that log actions need them to record the step; without them the state is
+        stored as a fresh snapshot. With `expected_version` this is a compare-and-set that
+        raises `VersionConflictError` if another write got there first. With a backend the
+        write (and whatever of the game was still pending) is then flushed before returning,
+        and the backend rejects it if another process stored a newer version; the cached
+        copy is dropped so the next `find` reads the backend's.
+        """
+
+        if self._backend is None or expected_version is None:
+            with self._lock:
+                return self._update(game_id, state, actions, expected_version)
+        # 플러시 잠금을 쥐고 있어 그 사이 다른 배치가 이 게임을 쓰지 않는다.
+        with self._flush_lock:
+            with self._lock:
+                updated = self._update(game_id, state, actions, expected_version)
+                if updated is None:
+                    return None
+                journal = self._journals.pop(game_id)
+                del self._dirty[game_id]
+                self._in_flight = {game_id: updated}
+            try:
+                conflicts = self._backend.write_batch([updated], [], {game_id: journal})
+            except Exception:
+                with self._lock:
+                    self._in_flight = {}
+                    later = self._journals.get(game_id)
+                    self._dirty.setdefault(game_id, updated)
+                    self._journals[game_id] = journal.then(later) if later else journal
+                    self._backend_stats["flushErrors"] += 1
+                raise
+            with self._lock:
+                self._in_flight = {}
+                if game_id in conflicts:
+                    self._drop_conflicted(game_id, conflicts[game_id])
+                    raise VersionConflictError(game_id, expected_version, conflicts[game_id])
+                self._backend_stats["flushes"] += 1
+                self._backend_stats["flushedRecords"] += 1
+            return updated
+
+    def _update(
+        self,
+        game_id: str,
+        state: GameState,
+        actions: Sequence[GameAction] | None,
+        expected_version: int | None,
+    ) -> GameSessionRecord | None:
+        record = self.find(game_id)
         if not record:
             return None
-        updated = {
+        if expected_version is not None and record["version"] != expected_version:
+            raise VersionConflictError(game_id, expected_version, record["version"])
+        updated: GameSessionRecord = {
             **record,
             "state": state,
-            "updated_at": datetime.now(timezone.utc),
+            "updated_at": self._stamp(),
+            "version": record["version"] + 1,
         }
-        self._sessions[game_id] = updated
+        self._index.put(summarize(updated))
+        self._put(updated)
+        if actions is None:
+            journal = PendingJournal(base=state, since_version=record["version"])
+        else:
+            journal = PendingJournal(actions=[*actions], since_version=record["version"])
+        self._mark_dirty(updated, journal)
+        self._enforce_caps()
         return updated
 
+    def page(self, query: SessionQuery) -> tuple[list[SessionSummary], str | None]:
+        """One page of game summaries (see `SessionIndex.page`); raises `ValueError` on a bad cursor."""
+
+        with self._lock:
+            return self._index.page(query)
+
     def delete(self, game_id: str) -> bool:
-        return self._sessions.pop(game_id, None) is not None
+        with self._lock:
+            self._index.remove(game_id)
+            existed = self._remove(game_id) is not None
+            if self._backend is None:
+                return existed
+            existed = existed or self._load(game_id, cache=False) is not None
+            if existed:
+                self._mark_deleted(game_id)
+            return existed
+
+    def history(self, game_id: str) -> list[tuple[int, GameAction]] | None:
+        """Logged actions of a game; `None` if unknown or the store keeps no log."""
+
+        if self._backend is None:
+            return None
+        self.flush()
+        return self._backend.history(game_id)
+
+    def state_at(self, game_id: str, seq: int) -> GameState | None:
+        """State right after logged action `seq` (0 is the game as created)."""
+
+        if self._backend is None:
+            return None
+        self.flush()
+        return self._backend.state_at(game_id, seq)
+
+    def flush(self) -> int:
+        """Writes pending changes to the backend in one batch; returns how many games."""
+
+        if self._backend is None:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                upserts, deletes, journals = self._dirty, self._deleted, self._journals
+                if not upserts and not deletes:
+                    return 0
+                self._dirty, self._deleted, self._journals = {}, set(), {}
+                self._in_flight = {**upserts, **dict.fromkeys(deletes)}
+            try:
+                conflicts = self._backend.write_batch(list(upserts.values()), list(deletes), journals)
+            except Exception:
+                with self._lock:
+                    # 그 사이 새로 쓰이지 않은 변경만 되돌려 다음 배치에서 다시 쓴다.
+                    for game_id, record in upserts.items():
+                        if game_id in self._deleted:
+                            continue
+                        self._dirty.setdefault(game_id, record)
+                        failed = journals.get(game_id) or PendingJournal(base=record["state"])
+                        later = self._journals.get(game_id)
+                        self._journals[game_id] = failed.then(later) if later else failed
+                    for game_id in deletes:
+                        if game_id not in self._dirty:
+                            self._deleted.add(game_id)
+                    self._in_flight = {}
+                    self._backend_stats["flushErrors"] += 1
+                raise
+            with self._lock:
+                self._in_flight = {}
+                for game_id, stored_version in conflicts.items():
+                    logger.warning(
+                        "dropped write of game %s: another process stored version %s", game_id, stored_version
+                    )
+                    self._drop_conflicted(game_id, stored_version)
+                self._backend_stats["flushes"] += 1
+                self._backend_stats["flushedRecords"] += len(upserts) + len(deletes) - len(conflicts)
+            return len(upserts) + len(deletes) - len(conflicts)
+
+    def close(self) -> None:
+        """Stops the background writer and flushes; the store stays usable afterwards."""
+
+        if self._backend is None:
+            return
+        with self._lock:
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            self._stop.set()
+            self._wake.set()
+            flusher.join()
+            self._stop.clear()
+        self.flush()
+        self._backend.close()
+
+    def reap(self) -> int:
+        """Drops expired sessions and packs idle ones; returns how many were dropped.
+
+        The store lock is only held for the bookkeeping: the backend query and the packing
+        itself run without it, so requests keep being served during a long reap.
+        """
+
+        now = self._clock()
+        dropped = 0
+        with self._lock:
+            finished_ttl = self._limits.finished_ttl_seconds
+            if finished_ttl is not None:
+                while self._finished:
+                    game_id, finished_at = next(iter(self._finished.items()))
+                    if now - finished_at < finished_ttl:
+                        break
+                    self._expire(game_id, "finished")
+                    dropped += 1
+            idle_ttl = self._limits.idle_ttl_seconds
+            if idle_ttl is not None:
+                # LRU 순서이므로 만료되지 않은 첫 세션에서 멈춘다.
+                while self._sessions:
+                    game_id = next(iter(self._sessions))
+                    if now - self._touched[game_id] < idle_ttl:
+                        break
+                    self._expire(game_id, "idle")
+                    dropped += 1
+        if self._backend is not None:
+            dropped += self._reap_backend()
+        self._pack_idle(now)
+        return dropped
+
+    def _pack_idle(self, now: float) -> None:
+        with self._lock:
+            candidates = self._pack_candidates(now)
+        for start in range(0, len(candidates), _PACK_BATCH):
+            batch = candidates[start : start + _PACK_BATCH]
+            packed = [PackedSession.pack(entry) for _, entry, _ in batch]  # type: ignore[arg-type]
+            with self._lock:
+                for (game_id, entry, touched), session in zip(batch, packed):
+                    # 압축하는 사이 바뀌거나 읽히거나 지워진 세션은 그대로 둔다.
+                    if self._sessions.get(game_id) is entry and self._touched.get(game_id) == touched:
+                        self._install_packed(game_id, session)
+
+    def _pack_candidates(self, now: float) -> list[tuple[str, GameSessionRecord, float]]:
+        budget = self._limits.max_packs_per_reap
+        candidates: list[tuple[str, GameSessionRecord, float]] = []
+
+        def take(game_id: str) -> bool:
+            entry = self._sessions[game_id]
+            if entry.__class__ is not PackedSession:
+                candidates.append((game_id, entry, self._touched[game_id]))  # type: ignore[arg-type]
+            return budget is None or len(candidates) < budget
+
+        finished_after = self._limits.pack_finished_after_seconds
+        if finished_after is not None:
+            for game_id in self._finished:
+                if now - self._touched[game_id] >= finished_after and not take(game_id):
+                    return candidates
+        idle_after = self._limits.pack_idle_after_seconds
+        if idle_after is not None:
+            # LRU 순서이므로 충분히 쉬지 않은 첫 세션에서 멈춘다.
+            for game_id in self._sessions:
+                if now - self._touched[game_id] < idle_after or not take(game_id):
+                    break
+        return candidates
+
+    def _install_packed(self, game_id: str, packed: PackedSession) -> None:
+        # 기존 키에 다시 넣으므로 LRU 순서는 그대로다.
+        self._sessions[game_id] = packed
+        size = packed.estimate_bytes()
+        self._total_bytes += size - self._sizes.get(game_id, 0)
+        self._sizes[game_id] = size
+        self._packed += 1
+        self._packing["packs"] += 1
+
+    def _reap_backend(self) -> int:
+        # 캐시에 없는 게임은 마지막으로 저장된 시각을 기준으로 만료한다.
+        wall_now = datetime.now(timezone.utc)
+
+        def cutoff(ttl: float | None) -> datetime | None:
+            return None if ttl is None else wall_now - timedelta(seconds=ttl)
+
+        # 조회는 잠금 밖에서 한다. 그 사이 쓰인 게임은 아래에서 캐시/대기열 확인으로 걸러진다.
+        expired = self._backend.expired_ids(  # type: ignore[union-attr]
+            cutoff(self._limits.idle_ttl_seconds), cutoff(self._limits.finished_ttl_seconds)
+        )
+        dropped = 0
+        with self._lock:
+            for game_id, finished in expired:
+                if game_id in self._sessions or game_id in self._dirty or game_id in self._in_flight:
+                    continue
+                if game_id in self._deleted:
+                    continue
+                self._mark_deleted(game_id)
+                self._index.remove(game_id)
+                self._evictions["finished" if finished else "idle"] += 1
+                dropped += 1
+        return dropped
+
+    async def run_reaper(self) -> None:
+        """Calls `reap` every `reap_interval_seconds` until cancelled."""
+
+        while True:
+            await asyncio.sleep(self._limits.reap_interval_seconds)
+            try:
+                # 압축과 백엔드 조회가 이벤트 루프를 막지 않도록 스레드에서 돈다.
+                dropped = await asyncio.to_thread(self.reap)
+            except Exception:  # 리퍼가 죽으면 세션이 다시 무한히 쌓인다.
+                logger.exception("session reaper failed")
+                continue
+            if dropped:
+                logger.info("reaped %s expired sessions", dropped)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            metrics = {
+                "sessions": len(self._sessions),
+                "finishedSessions": len(self._finished),
+                "packedSessions": self._packed,
+                "approxBytes": self._total_bytes,
+                "packs": self._packing["packs"],
+                "unpacks": self._packing["unpacks"],
+                "evictions": {
+                    reason: self._evictions[reason]
+                    for reason in ("idle", "finished", "capacity", "memory")
+                },
+            }
+            if self._backend is not None:
+                metrics["backend"] = {
+                    "pendingWrites": len(self._dirty) + len(self._deleted),
+                    **{
+                        name: self._backend_stats[name]
+                        for name in ("flushes", "flushedRecords", "flushErrors", "conflicts", "loads")
+                    },
+                }
+            return metrics
+
+    def _load(self, game_id: str, cache: bool = True) -> GameSessionRecord | None:
+        """Cache miss: pending writes first, then the backend. Called with the lock held."""
+
+        if self._backend is None or game_id in self._deleted:
+            return None
+        if game_id in self._dirty:
+            record = self._dirty[game_id]
+        elif game_id in self._in_flight:
+            record = self._in_flight[game_id]
+        else:
+            record = self._backend.load(game_id)
+            self._backend_stats["loads"] += 1
+        if record is not None and cache:
+            self._put(record)
+            self._enforce_caps()
+        return record
+
+    def _drop_conflicted(self, game_id: str, stored_version: int) -> None:
+        """Forgets this process's copy of a game the backend rejected. Called with the lock held."""
+
+        # 거절된 쓰기 위에 쌓인 변경도 같은 이유로 거절되므로 함께 버린다.
+        self._remove(game_id)
+        self._dirty.pop(game_id, None)
+        self._journals.pop(game_id, None)
+        self._backend_stats["conflicts"] += 1
+        stored = self._backend.load(game_id) if stored_version else None  # type: ignore[union-attr]
+        if stored is None:
+            self._index.remove(game_id)
+        else:
+            self._index.put(summarize(stored))
+
+    def _mark_dirty(self, record: GameSessionRecord, journal: PendingJournal) -> None:
+        if self._backend is None:
+            return
+        game_id = record["id"]
+        self._dirty[game_id] = record
+        self._deleted.discard(game_id)
+        earlier = self._journals.get(game_id)
+        self._journals[game_id] = earlier.then(journal) if earlier else journal
+        self._schedule_flush()
+
+    def _mark_deleted(self, game_id: str) -> None:
+        self._dirty.pop(game_id, None)
+        self._journals.pop(game_id, None)
+        self._deleted.add(game_id)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name="onecard-store-flusher", daemon=True
+            )
+            self._flusher.start()
+        if len(self._dirty) + len(self._deleted) >= self._flush_policy.max_batch:
+            self._wake.set()
+
+    def _run_flusher(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self._flush_policy.interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:  # 실패한 배치는 되돌려졌으니 다음 주기에 다시 시도한다.
+                logger.exception("session flush failed")
+
+    def _readable(self, entry: GameSessionRecord | PackedSession) -> GameSessionRecord:
+        # 목록 조회는 세션을 다시 쓰지 않으므로 풀어서 돌려주기만 한다.
+        return entry.unpack() if entry.__class__ is PackedSession else entry  # type: ignore[union-attr,return-value]
+
+    def _put(self, record: GameSessionRecord) -> None:
+        game_id = record["id"]
+        if self._sessions.get(game_id).__class__ is PackedSession:
+            self._packed -= 1
+        self._sessions[game_id] = record
+        self._sessions.move_to_end(game_id)
+        now = self._clock()
+        self._touched[game_id] = now
+        if record["state"]["gameStatus"] == "finished":
+            self._finished.setdefault(game_id, now)
+        else:
+            self._finished.pop(game_id, None)
+        size = estimate_record_bytes(record)
+        self._total_bytes += size - self._sizes.get(game_id, 0)
+        self._sizes[game_id] = size
+
+    def _remove(self, game_id: str) -> GameSessionRecord | PackedSession | None:
+        record = self._sessions.pop(game_id, None)
+        if record is None:
+            return None
+        if record.__class__ is PackedSession:
+            self._packed -= 1
+        self._touched.pop(game_id, None)
+        self._finished.pop(game_id, None)
+        self._total_bytes -= self._sizes.pop(game_id, 0)
+        return record
+
+    def _stamp(self) -> datetime:
+        # updated_at 은 저장소 안에서 엄격히 증가시켜 목록 인덱스가 추가만으로 정렬되게 한다.
+        now = datetime.now(timezone.utc)
+        if now <= self._last_write:
+            now = self._last_write + timedelta(microseconds=1)
+        self._last_write = now
+        return now
+
+    def _expire(self, game_id: str, reason: EvictionReason) -> None:
+        self._index.remove(game_id)
+        self._remove(game_id)
+        if self._backend is not None:
+            self._mark_deleted(game_id)
+        self._evictions[reason] += 1
+
+    def _evict_oldest(self, reason: EvictionReason) -> None:
+        # 백엔드가 있으면 캐시에서만 내린다(다음 find 때 다시 읽는다).
+        game_id = next(iter(self._sessions))
+        self._remove(game_id)
+        if self._backend is None:
+            self._index.remove(game_id)
+        self._evictions[reason] += 1
+
+    def _enforce_caps(self) -> None:
+        # 방금 쓴 세션(MRU)은 남긴다.
+        max_sessions = self._limits.max_sessions
+        while max_sessions is not None and len(self._sessions) > max(max_sessions, 1):
+            self._evict_oldest("capacity")
+        cap = self._limits.max_memory_bytes
+        while cap is not None and self._total_bytes > cap and len(self._sessions) > 1:
+            self._evict_oldest("memory")
 
     def _merge_with_defaults(self, settings: GameSettings | dict | None) -> GameSettings:
         base = deepcopy(self._default_settings)
@@ -71,6 +827,6 @@ class GameStateStore:
         for key, value in settings.items():
             if value is None:
                 continue
-            if key in base:
+            if key in base or key in OPTIONAL_SETTING_KEYS:
                 base[key] = value
         return base
@@ -11,11 +11,12 @@ import numpy as np
 import onnxruntime as ort
 from fastapi import HTTPException, status
 
+from onecard_api.domain.legal_actions import legal_actions
 from onecard_api.domain.types import GameSettings, GameState
 from onecard_api.inference.action_mask import (
     EngineActionPayload,
+    action_mask_from_legal,
     apply_action_mask,
-    build_action_mask,
     map_action_index_to_payload,
     select_action,
 )
@@ -24,6 +25,7 @@ from onecard_api.inference.observation_encoder import (
     build_observation_spec,
     encode_observation,
 )
+from onecard_api.services.ai_executor import AiExecutor, ExecutorSaturatedError, default_executor
 
 
 @dataclass(frozen=True)
@@ -42,7 +44,9 @@ class LoadedModel:
 
 
 class OnnxPolicyService:
-    def __init__(self, model_dir: str | Path | None = None) -> None:
+    def __init__(
+        self, model_dir: str | Path | None = None, executor: AiExecutor | None = None
+    ) -> None:
         package_root = Path(__file__).resolve().parents[3]
         default_dir = package_root / "assets" / "onnx"
         cwd_fallback = Path.cwd() / "assets" / "onnx"
@@ -53,6 +57,7 @@ class OnnxPolicyService:
         )
         self._model_dir = resolved_dir.expanduser()
         self._cache: dict[str, LoadedModel] = {}
+        self._executor = executor or default_executor()
 
     def _rotate_players_to_current(
         self, players: list[dict], current_index: int, direction: str
@@ -179,9 +184,15 @@ class OnnxPolicyService:
             "settings": loaded.metadata.settings,
         }
 
+    async def load_policy(self, settings: GameSettings) -> LoadedModel:
+        """Loaded model for `settings`, for callers (the search AI) that run the session directly."""
+
+        loaded = await self._load_model_if_needed(settings)
+        self._assert_settings_compatible(loaded.metadata.settings, settings)
+        return loaded
+
     async def predict_action(self, state: GameState) -> dict[str, Any]:
-        loaded = await self._load_model_if_needed(state["settings"])
-        self._assert_settings_compatible(loaded.metadata.settings, state["settings"])
+        loaded = await self.load_policy(state["settings"])
 
         normalized_state: GameState = {
             **state,
@@ -197,7 +208,8 @@ class OnnxPolicyService:
                 detail="관측 차원이 모델과 일치하지 않습니다.",
             )
 
-        mask = build_action_mask(normalized_state, loaded.spec.maxHandSize)
+        # 회전된 상태의 0번 플레이어는 원래 상태의 현재 플레이어이므로 같은 합법 수를 공유한다.
+        mask = action_mask_from_legal(legal_actions(state), loaded.spec.maxHandSize)
         if len(mask) != loaded.metadata.action_dim:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -206,7 +218,11 @@ class OnnxPolicyService:
 
         obs_array = np.array(observation, dtype=np.float32).reshape(1, -1)
         try:
-            outputs = loaded.session.run(None, {"observation": obs_array})
+            outputs = await self._executor.run_inference(
+                loaded.session.run, None, {"observation": obs_array}
+            )
+        except ExecutorSaturatedError:
+            raise
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Literal
+
+from onecard_api.domain.types import GameSettings, GameStatus
+
+SortOrder = Literal["desc", "asc"]
+
+# 설정 중 값의 종류가 적어 목록 필터로 자주 쓰는 키만 인덱스를 둔다. 나머지 설정은 후보를 걸러 낸다.
+INDEXED_SETTINGS: tuple[str, ...] = ("mode", "difficulty", "numberOfPlayers")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+# 무효 항목이 이보다 많고 절반을 넘으면 로그를 다시 만든다.
+_COMPACT_MIN_STALE = 64
+
+
+def to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+@dataclass(frozen=True, slots=True)
+class SessionSummary:
+    """What the listing shows of a session; kept for every game, cached or not."""
+
+    id: str
+    game_status: GameStatus
+    current_player_index: int
+    settings: GameSettings
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+    @property
+    def sort_key(self) -> tuple[int, str]:
+        return to_micros(self.updated_at), self.id
+
+
+@dataclass(frozen=True, slots=True)
+class SessionQuery:
+    game_status: GameStatus | None = None
+    settings: dict[str, Any] | None = None
+    updated_since: datetime | None = None
+    order: SortOrder = "desc"
+    limit: int = 50
+    cursor: str | None = None
+
+
+def encode_cursor(key: tuple[int, str]) -> str:
+    return base64.urlsafe_b64encode(f"{key[0]}:{key[1]}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        micros, game_id = raw.split(":", 1)
+        return int(micros), game_id
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"invalid cursor {cursor!r}") from None
+
+
+class SessionIndex:
+    """Sessions ordered by `updated_at`, with secondary indexes on status and settings.
+
+    Every index is an append-only list of `(updated_at µs, id)` keys; because the store
+    hands out strictly increasing `updated_at` values, appending keeps each list sorted.
+    A key becomes stale when its game is written again or removed and is skipped while
+    reading; lists are rebuilt once most of their keys are stale. A page bisects to the
+    cursor in the smallest matching index and walks it, so it costs O(page size) plus the
+    stale keys and non-matching games it passes over.
+    """
+
+    def __init__(self) -> None:
+        self._summaries: dict[str, SessionSummary] = {}
+        self._logs: dict[tuple[str, Any], list[tuple[int, str]]] = {}
+        self._stale: dict[tuple[str, Any], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def get(self, game_id: str) -> SessionSummary | None:
+        return self._summaries.get(game_id)
+
+    def put(self, summary: SessionSummary) -> None:
+        previous = self._summaries.get(summary.id)
+        if previous is not None:
+            self._mark_stale(previous)
+        self._summaries[summary.id] = summary
+        key = summary.sort_key
+        for name in self._index_names(summary):
+            log = self._logs.setdefault(name, [])
+            if log and log[-1] > key:
+                # 시계가 거꾸로 간 경우 등: 정렬을 지키도록 제자리에 넣는다.
+                log.insert(bisect_left(log, key), key)
+            else:
+                log.append(key)
+
+    def remove(self, game_id: str) -> None:
+        summary = self._summaries.pop(game_id, None)
+        if summary is not None:
+            self._mark_stale(summary)
+
+    def page(self, query: SessionQuery) -> tuple[list[SessionSummary], str | None]:
+        """One page of matching sessions and the cursor of the next one (`None` at the end)."""
+
+        settings = query.settings or {}
+        candidates = [("all", None)]
+        if query.game_status is not None:
+            candidates.append(("gameStatus", query.game_status))
+        candidates.extend(
+            (f"settings.{name}", settings[name]) for name in INDEXED_SETTINGS if name in settings
+        )
+        log = min((self._logs.get(name, []) for name in candidates), key=len)
+
+        descending = query.order == "desc"
+        since = to_micros(query.updated_since) if query.updated_since is not None else None
+        if query.cursor is not None:
+            cursor = decode_cursor(query.cursor)
+            position = bisect_left(log, cursor) - 1 if descending else bisect_right(log, cursor)
+        else:
+            position = len(log) - 1 if descending else 0
+        if not descending and since is not None:
+            position = max(position, bisect_left(log, (since, "")))
+
+        items: list[SessionSummary] = []
+        step = -1 if descending else 1
+        while 0 <= position < len(log) and len(items) < query.limit:
+            key = log[position]
+            position += step
+            if descending and since is not None and key[0] < since:
+                break
+            summary = self._summaries.get(key[1])
+            if summary is None or summary.sort_key != key:
+                continue
+            if query.game_status is not None and summary.game_status != query.game_status:
+                continue
+            if any(summary.settings.get(name) != value for name, value in settings.items()):
+                continue
+            items.append(summary)
+        more = len(items) == query.limit and 0 <= position < len(log)
+        return items, encode_cursor(items[-1].sort_key) if more else None
+
+    def _index_names(self, summary: SessionSummary) -> list[tuple[str, Any]]:
+        names: list[tuple[str, Any]] = [("all", None), ("gameStatus", summary.game_status)]
+        names.extend(
+            (f"settings.{name}", summary.settings.get(name))  # type: ignore[misc]
+            for name in INDEXED_SETTINGS
+        )
+        return names
+
+    def _mark_stale(self, summary: SessionSummary) -> None:
+        for name in self._index_names(summary):
+            stale = self._stale.get(name, 0) + 1
+            log = self._logs.get(name, [])
+            if stale >= _COMPACT_MIN_STALE and stale * 2 > len(log):
+                log[:] = [key for key in log if self._is_live(key)]
+                # 아직 _summaries 에 남아 있는(바뀌기 직전의) 자신의 키도 곧 무효가 된다.
+                stale = sum(1 for key in log if key == summary.sort_key)
+            self._stale[name] = stale
+
+    def _is_live(self, key: tuple[int, str]) -> bool:
+        summary = self._summaries.get(key[1])
+        return summary is not None and summary.sort_key == key
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+
+from onecard_api.domain.engine import apply_actions
+from onecard_api.domain.state_codec import dump_action, dump_state, load_action, load_state
+from onecard_api.domain.types import GameState
+from onecard_api.services.game_state_store import GameAction, GameSessionRecord, PendingJournal
+from onecard_api.services.session_index import SessionSummary
+
+SCHEMA_VERSION = 3
+DEFAULT_SNAPSHOT_EVERY = 32
+
+# 상태는 스냅샷 + 그 뒤의 액션 로그로 저장한다. game_sessions 에는 메타데이터만 둔다.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS game_sessions (
+    id TEXT PRIMARY KEY,
+    settings TEXT NOT NULL,
+    game_status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    snapshot_seq INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    current_player INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS game_sessions_expiry ON game_sessions (game_status, updated_at);
+CREATE TABLE IF NOT EXISTS game_events (
+    game_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    PRIMARY KEY (game_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS game_snapshots (
+    game_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (game_id, seq)
+);
+"""
+
+# 이전 스키마 버전에서 한 단계씩 올리는 문장들
+MIGRATIONS: dict[int, str] = {
+    1: "ALTER TABLE game_sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 1",
+    2: "ALTER TABLE game_sessions ADD COLUMN current_player INTEGER NOT NULL DEFAULT 0",
+}
+
+# 액션 없이 통째로 바뀐 상태를 로그에 표시한다. 재생할 수 없는 지점이라 같은 seq 의 스냅샷은 지우지 않는다.
+REPLACE_STATE = "REPLACE_STATE"
+_REPLACE_ACTION = dump_action({"type": REPLACE_STATE})
+
+_UPSERT = """
+INSERT INTO game_sessions
+    (id, settings, game_status, created_at, updated_at, seq, snapshot_seq, version, current_player)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    settings = excluded.settings,
+    game_status = excluded.game_status,
+    updated_at = excluded.updated_at,
+    seq = excluded.seq,
+    snapshot_seq = excluded.snapshot_seq,
+    version = excluded.version,
+    current_player = excluded.current_player
+"""
+
+_COLUMNS = "id, settings, created_at, updated_at, version, snapshot_seq"
+
+
+def _timestamp(value: datetime) -> str:
+    # 고정 폭 UTC 문자열이라 사전순 비교가 시간순 비교와 같다.
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+class SqliteGameStateBackend:
+    """`GameStateBackend` on one SQLite file in WAL mode, stored as snapshots plus an action log.
+
+    Every flushed action is appended to `game_events`; the full state (JSON, see
+    `domain/state_codec.py`) is only written when a game is created, replaced, finished,
+    or `snapshot_every` actions after its previous snapshot. Loading replays the actions
+    after the latest snapshot, which is exact because shuffles draw from the counter-based
+    generator stored in the state. Besides the latest snapshot only the one at creation and
+    those of replaced states (which no action leads to) are kept, so `state_at` can rebuild
+    any point of a game for analytics or replays.
+
+    A journal with a `since_version` is only written if the stored row is still at that
+    version, checked inside the write transaction, so processes sharing the file cannot
+    both append to the same game from the same version.
+
+    Each thread gets its own connection, so readers never wait for the writer.
+    `synchronous=NORMAL` means a power loss may drop the last committed batches, never
+    corrupt the file. The path must be a file: every `:memory:` connection would see a
+    different database.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+        busy_timeout_ms: int = 5000,
+    ) -> None:
+        if snapshot_every < 1:
+            raise ValueError("snapshot_every must be at least 1")
+        self._path = str(path)
+        self._snapshot_every = snapshot_every
+        self._busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._migrate()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def snapshot_every(self) -> int:
+        return self._snapshot_every
+
+    def _migrate(self) -> None:
+        connection = self._connection()
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+        tables = connection.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]
+        if version == 0 and not tables:
+            connection.executescript(SCHEMA)
+        elif all(step in MIGRATIONS for step in range(version, SCHEMA_VERSION)) and version > 0:
+            for step in range(version, SCHEMA_VERSION):
+                connection.execute(MIGRATIONS[step])
+        else:
+            raise RuntimeError(
+                f"{self._path} uses session schema {version}; expected {SCHEMA_VERSION} (or an empty file)"
+            )
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+        connection = sqlite3.connect(self._path, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA busy_timeout={int(self._busy_timeout_ms)}")
+        self._local.connection = connection
+        with self._connections_lock:
+            self._connections.append(connection)
+        return connection
+
+    def load(self, game_id: str) -> GameSessionRecord | None:
+        connection = self._connection()
+        row = connection.execute(f"SELECT {_COLUMNS} FROM game_sessions WHERE id = ?", (game_id,)).fetchone()
+        return self._record(connection, row) if row is not None else None
+
+    def load_all(self) -> list[GameSessionRecord]:
+        connection = self._connection()
+        rows = connection.execute(f"SELECT {_COLUMNS} FROM game_sessions ORDER BY created_at").fetchall()
+        return [self._record(connection, row) for row in rows]
+
+    def load_summaries(self) -> list[SessionSummary]:
+        rows = self._connection().execute(
+            "SELECT id, game_status, current_player, settings, created_at, updated_at, version"
+            " FROM game_sessions"
+        )
+        return [
+            SessionSummary(
+                id=game_id,
+                game_status=game_status,
+                current_player_index=current_player,
+                settings=json.loads(settings),
+                created_at=datetime.fromisoformat(created_at),
+                updated_at=datetime.fromisoformat(updated_at),
+                version=version,
+            )
+            for game_id, game_status, current_player, settings, created_at, updated_at, version in rows
+        ]
+
+    def _record(
+        self, connection: sqlite3.Connection, row: tuple[str, str, str, str, int, int]
+    ) -> GameSessionRecord:
+        game_id, settings, created_at, updated_at, version, snapshot_seq = row
+        return {
+            "id": game_id,
+            "settings": json.loads(settings),
+            "state": self._replay(connection, game_id, snapshot_seq, None),
+            "created_at": datetime.fromisoformat(created_at),
+            "updated_at": datetime.fromisoformat(updated_at),
+            "version": version,
+        }
+
+    def _replay(
+        self, connection: sqlite3.Connection, game_id: str, snapshot_seq: int, until: int | None
+    ) -> GameState:
+        (state,) = connection.execute(
+            "SELECT state FROM game_snapshots WHERE game_id = ? AND seq = ?", (game_id, snapshot_seq)
+        ).fetchone()
+        query = "SELECT action FROM game_events WHERE game_id = ? AND seq > ?"
+        params: tuple = (game_id, snapshot_seq)
+        if until is not None:
+            query += " AND seq <= ?"
+            params += (until,)
+        actions = [load_action(action) for (action,) in connection.execute(query + " ORDER BY seq", params)]
+        return apply_actions(load_state(state), actions)["state"]
+
+    def write_batch(
+        self,
+        upserts: Sequence[GameSessionRecord],
+        deletes: Sequence[str],
+        journals: dict[str, PendingJournal],
+    ) -> dict[str, int]:
+        connection = self._connection()
+        conflicts: dict[str, int] = {}
+        # IMMEDIATE 로 쓰기 잠금을 먼저 잡아 버전 확인과 쓰기 사이에 다른 프로세스가 끼지 못한다.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for record in upserts:
+                stored_version = self._write_record(connection, record, journals.get(record["id"]))
+                if stored_version is not None:
+                    conflicts[record["id"]] = stored_version
+            for table, column in (("game_sessions", "id"), ("game_events", "game_id"), ("game_snapshots", "game_id")):
+                connection.executemany(
+                    f"DELETE FROM {table} WHERE {column} = ?", [(game_id,) for game_id in deletes]
+                )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return conflicts
+
+    def _write_record(
+        self, connection: sqlite3.Connection, record: GameSessionRecord, journal: PendingJournal | None
+    ) -> int | None:
+        """Writes one record; returns the stored version instead if the journal expected another."""
+
+        game_id = record["id"]
+        row = connection.execute(
+            "SELECT seq, snapshot_seq, version FROM game_sessions WHERE id = ?", (game_id,)
+        ).fetchone()
+        if journal is not None and journal.since_version is not None:
+            stored_version = row[2] if row is not None else 0
+            if stored_version != journal.since_version:
+                return stored_version
+        if journal is None or (row is None and journal.base is None):
+            # 이어 붙일 로그가 없으면 지금 상태에서 새로 시작한다.
+            journal = PendingJournal(base=record["state"])
+        snapshots: list[tuple[str, int, str]] = []
+        events: list[tuple[str, int, str]] = []
+        if row is None:
+            seq = snapshot_seq = 0
+            snapshots.append((game_id, 0, dump_state(journal.base)))  # type: ignore[arg-type]
+        else:
+            seq, snapshot_seq, _ = row
+            if journal.base is not None:
+                seq = snapshot_seq = seq + 1
+                events.append((game_id, seq, _REPLACE_ACTION))
+                snapshots.append((game_id, seq, dump_state(journal.base)))
+        for action in journal.actions:
+            seq += 1
+            events.append((game_id, seq, dump_action(action)))
+        state = record["state"]
+        if seq > snapshot_seq and (
+            seq - snapshot_seq >= self._snapshot_every or state["gameStatus"] == "finished"
+        ):
+            snapshot_seq = seq
+            snapshots.append((game_id, seq, dump_state(state)))
+        connection.executemany("INSERT INTO game_events (game_id, seq, action) VALUES (?, ?, ?)", events)
+        connection.executemany(
+            "INSERT OR REPLACE INTO game_snapshots (game_id, seq, state) VALUES (?, ?, ?)", snapshots
+        )
+        if snapshots and snapshot_seq > 0:
+            # 생성 시점(0), 상태 교체 지점, 최신 스냅샷만 남긴다. 그 사이 상태는 앞 스냅샷부터 재생해 만든다.
+            connection.execute(
+                "DELETE FROM game_snapshots WHERE game_id = ? AND seq > 0 AND seq < ? AND seq NOT IN"
+                " (SELECT seq FROM game_events WHERE game_id = ? AND action = ?)",
+                (game_id, snapshot_seq, game_id, _REPLACE_ACTION),
+            )
+        connection.execute(
+            _UPSERT,
+            (
+                game_id,
+                json.dumps(record["settings"], ensure_ascii=False),
+                state["gameStatus"],
+                _timestamp(record["created_at"]),
+                _timestamp(record["updated_at"]),
+                seq,
+                snapshot_seq,
+                record["version"],
+                state["currentPlayerIndex"],
+            ),
+        )
+        return None
+
+    def history(self, game_id: str) -> list[tuple[int, GameAction]] | None:
+        connection = self._connection()
+        if connection.execute("SELECT 1 FROM game_sessions WHERE id = ?", (game_id,)).fetchone() is None:
+            return None
+        rows = connection.execute(
+            "SELECT seq, action FROM game_events WHERE game_id = ? ORDER BY seq", (game_id,)
+        )
+        return [(seq, load_action(action)) for seq, action in rows]
+
+    def state_at(self, game_id: str, seq: int) -> GameState | None:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT MAX(seq) FROM game_snapshots WHERE game_id = ? AND seq <= ?", (game_id, seq)
+        ).fetchone()
+        if row[0] is None:
+            return None
+        last = connection.execute("SELECT seq FROM game_sessions WHERE id = ?", (game_id,)).fetchone()
+        if last is None or seq > last[0]:
+            return None
+        return self._replay(connection, game_id, row[0], seq)
+
+    def expired_ids(
+        self, idle_before: datetime | None, finished_before: datetime | None
+    ) -> list[tuple[str, bool]]:
+        connection = self._connection()
+        expired: list[tuple[str, bool]] = []
+        if finished_before is not None:
+            rows = connection.execute(
+                "SELECT id FROM game_sessions WHERE game_status = 'finished' AND updated_at < ?",
+                (_timestamp(finished_before),),
+            )
+            expired.extend((game_id, True) for (game_id,) in rows)
+        if idle_before is not None:
+            rows = connection.execute(
+                "SELECT id FROM game_sessions WHERE game_status != 'finished' AND updated_at < ?",
+                (_timestamp(idle_before),),
+            )
+            expired.extend((game_id, False) for (game_id,) in rows)
+        return expired
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM game_sessions").fetchone()[0]
+
+    def close(self) -> None:
+        """Closes every thread's connection; later calls open new ones."""
+
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
@@ -0,0 +1,282 @@
+"""Headless simulator: plays complete games with the AI strategies in every seat.
+
+    PYTHONPATH=src python -m onecard_api.sim --games 1000 --players 4 --jokers \\
+        --seats easy,medium,easy,easy --seed 1 --stream
+
+Per-game results are streamed as JSON lines to stdout (`--stream`) as soon as each game
+finishes; the summary (games/sec, turns/game, win rates per seat and per strategy) is
+printed at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import secrets
+import sys
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, TextIO, get_args
+
+from onecard_api.domain.constants import DEFAULT_GAME_SETTINGS
+from onecard_api.domain.types import AIDifficulty, GameSettings, GameState
+from onecard_api.search.ismcts import SearchConfig
+from onecard_api.search.puct import PuctConfig
+from onecard_api.services.game_ai_service import GameAiService
+from onecard_api.services.game_engine_service import ENGINE_KINDS, EngineKind, GameEngineService
+from onecard_api.services.onnx_policy_service import OnnxPolicyService
+
+DEFAULT_MAX_TURNS = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class GameResult:
+    index: int
+    seed: int
+    winner: int | None  # 승자 좌석, 턴 제한에 걸리면 None
+    turns: int
+    seconds: float
+    truncated: bool
+
+
+@dataclass(slots=True)
+class SimSummary:
+    games: int = 0
+    turns: int = 0
+    truncated: int = 0
+    seconds: float = 0.0
+    wins_by_seat: Counter[int] = field(default_factory=Counter)
+    wins_by_strategy: Counter[str] = field(default_factory=Counter)
+    games_by_strategy: Counter[str] = field(default_factory=Counter)
+
+    def add(self, result: GameResult, seats: Sequence[AIDifficulty]) -> None:
+        self.games += 1
+        self.turns += result.turns
+        self.truncated += result.truncated
+        self.games_by_strategy.update(set(seats))
+        if result.winner is not None:
+            self.wins_by_seat[result.winner] += 1
+            self.wins_by_strategy[seats[result.winner]] += 1
+
+    def to_dict(self, seats: Sequence[AIDifficulty]) -> dict[str, Any]:
+        games = max(self.games, 1)
+        return {
+            "games": self.games,
+            "seconds": round(self.seconds, 3),
+            "gamesPerSecond": round(self.games / self.seconds, 1) if self.seconds else None,
+            "turnsPerGame": round(self.turns / games, 2),
+            "truncated": self.truncated,
+            "winRateBySeat": {
+                f"{seat}:{strategy}": round(self.wins_by_seat[seat] / games, 4)
+                for seat, strategy in enumerate(seats)
+            },
+            "winRateByStrategy": {
+                strategy: round(self.wins_by_strategy[strategy] / games, 4)
+                for strategy in sorted(self.games_by_strategy)
+            },
+        }
+
+
+def build_ai_service(
+    engine: EngineKind = "dict",
+    model_dir: str | Path | None = None,
+    search_config: SearchConfig | None = None,
+    puct_config: PuctConfig | None = None,
+) -> GameAiService:
+    engine_service = GameEngineService(engine)
+    return GameAiService(
+        engine_service,
+        OnnxPolicyService(model_dir=model_dir),
+        search_config,
+        puct_config,
+    )
+
+
+def search_config_from_args(args: argparse.Namespace) -> SearchConfig:
+    return SearchConfig(time_budget_ms=args.hard_budget_ms, max_iterations=args.hard_iterations)
+
+
+def puct_config_from_args(args: argparse.Namespace) -> PuctConfig:
+    return PuctConfig(
+        enabled=args.medium_search,
+        node_budget=args.medium_nodes,
+        time_budget_ms=args.medium_budget_ms,
+        batch_size=args.medium_batch,
+    )
+
+
+def seat_state(state: GameState, seats: Sequence[AIDifficulty]) -> GameState:
+    """Turns every seat into an AI player with its own strategy."""
+
+    players = [
+        {**player, "isAI": True, "difficulty": seats[idx]}
+        for idx, player in enumerate(state["players"])
+    ]
+    return {**state, "players": players}  # type: ignore[typeddict-item]
+
+
+async def simulate_game(
+    ai_service: GameAiService,
+    settings: GameSettings,
+    seats: Sequence[AIDifficulty],
+    *,
+    index: int = 0,
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> GameResult:
+    started = time.perf_counter()
+    engine = ai_service.game_engine
+    state = seat_state(engine.create_started_state(settings), seats)
+    turns = 0
+    while state["gameStatus"] == "playing" and turns < max_turns:
+        result = await ai_service.play_turn_as(state, seats[state["currentPlayerIndex"]])
+        if result is None:
+            break
+        state = result["state"]
+        turns += 1
+
+    winner = state.get("winner")
+    winner_seat = (
+        next(
+            (idx for idx, player in enumerate(state["players"]) if player["id"] == winner["id"]),
+            None,
+        )
+        if winner
+        else None
+    )
+    return GameResult(
+        index=index,
+        seed=settings.get("seed", 0),
+        winner=winner_seat,
+        turns=turns,
+        seconds=time.perf_counter() - started,
+        truncated=state["gameStatus"] != "finished",
+    )
+
+
+async def iter_games(
+    ai_service: GameAiService,
+    settings: GameSettings,
+    seats: Sequence[AIDifficulty],
+    *,
+    games: int,
+    seed: int,
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> AsyncIterator[GameResult]:
+    """Plays `games` games; game `i` is seeded with `seed + i`, so runs are reproducible."""
+
+    for index in range(games):
+        game_settings: GameSettings = {**settings, "seed": seed + index}
+        yield await simulate_game(
+            ai_service, game_settings, seats, index=index, max_turns=max_turns
+        )
+
+
+async def run_simulation(
+    ai_service: GameAiService,
+    settings: GameSettings,
+    seats: Sequence[AIDifficulty],
+    *,
+    games: int,
+    seed: int,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    on_result: Callable[[GameResult], None] | None = None,
+) -> SimSummary:
+    summary = SimSummary()
+    started = time.perf_counter()
+    async for result in iter_games(
+        ai_service, settings, seats, games=games, seed=seed, max_turns=max_turns
+    ):
+        summary.add(result, seats)
+        if on_result is not None:
+            on_result(result)
+    summary.seconds = time.perf_counter() - started
+    return summary
+
+
+def _parse_seats(value: str, players: int) -> list[AIDifficulty]:
+    difficulties = get_args(AIDifficulty)
+    seats = [seat.strip() for seat in value.split(",") if seat.strip()]
+    if len(seats) == 1:
+        seats = seats * players
+    if len(seats) != players:
+        raise argparse.ArgumentTypeError(f"--seats needs 1 or {players} strategies, got {len(seats)}")
+    unknown = [seat for seat in seats if seat not in difficulties]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown strategies {unknown}; expected {difficulties}")
+    return seats  # type: ignore[return-value]
+
+
+def add_search_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = SearchConfig()
+    parser.add_argument("--hard-budget-ms", type=float, default=defaults.time_budget_ms, help="'hard' seat time per move")
+    parser.add_argument("--hard-iterations", type=int, default=None, help="'hard' seat iteration cap per move")
+    puct_defaults = PuctConfig()
+    parser.add_argument("--medium-search", action="store_true", help="'medium' seats search with the policy/value heads")
+    parser.add_argument("--medium-nodes", type=int, default=puct_defaults.node_budget, help="'medium' search leaves per move")
+    parser.add_argument("--medium-budget-ms", type=float, default=puct_defaults.time_budget_ms, help="'medium' search time per move")
+    parser.add_argument("--medium-batch", type=int, default=puct_defaults.batch_size, help="leaves per inference call")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m onecard_api.sim", description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=DEFAULT_GAME_SETTINGS["numberOfPlayers"])
+    parser.add_argument("--jokers", action="store_true", default=DEFAULT_GAME_SETTINGS["includeJokers"])
+    parser.add_argument("--init-hand", type=int, default=DEFAULT_GAME_SETTINGS["initHandSize"])
+    parser.add_argument("--max-hand", type=int, default=DEFAULT_GAME_SETTINGS["maxHandSize"])
+    parser.add_argument("--seats", default="easy", help="comma-separated strategy per seat, or one for all")
+    parser.add_argument("--seed", type=int, default=None, help="base seed; game i uses seed + i")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--engine", choices=ENGINE_KINDS, default="dict")
+    parser.add_argument("--model-dir", default=None, help="ONNX model directory for 'medium' seats")
+    add_search_arguments(parser)
+    parser.add_argument("--stream", action="store_true", help="print one JSON line per finished game")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None, out: TextIO = sys.stdout) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        seats = _parse_seats(args.seats, args.players)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+
+    settings: GameSettings = {
+        **DEFAULT_GAME_SETTINGS,
+        "numberOfPlayers": args.players,
+        "includeJokers": args.jokers,
+        "initHandSize": args.init_hand,
+        "maxHandSize": args.max_hand,
+        "difficulty": seats[-1],
+    }
+    seed = args.seed if args.seed is not None else secrets.randbits(62)
+    ai_service = build_ai_service(
+        args.engine, args.model_dir, search_config_from_args(args), puct_config_from_args(args)
+    )
+
+    def stream(result: GameResult) -> None:
+        out.write(json.dumps(asdict(result)) + "\n")
+        out.flush()
+
+    summary = asyncio.run(
+        run_simulation(
+            ai_service,
+            settings,
+            seats,
+            games=args.games,
+            seed=seed,
+            max_turns=args.max_turns,
+            on_result=stream if args.stream else None,
+        )
+    )
+    out.write(json.dumps({"summary": summary.to_dict(seats), "seed": seed, "engine": args.engine}) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,437 @@
+"""AI tournament runner: seeded match-ups sharded over a process pool with early stopping.
+
+    PYTHONPATH=src python -m onecard_api.tournament --matchups medium:easy --cases all \\
+        --max-games 200000 --workers 8 --seed 1
+
+In every game one seat plays the challenger strategy and the other seats play the
+opponent; the challenger seat rotates with the game seed. The challenger's win rate is
+compared with the fair share `1 / players` using a Wilson score interval, and a match-up
+stops as soon as the interval excludes the fair share (after `--min-games`). The interval
+is checked after every wave, so its confidence is Bonferroni-adjusted over the number of
+looks the configuration allows; the overall chance of a wrong verdict stays below
+`1 - --confidence`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import math
+import sys
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, TextIO, get_args
+
+from fastapi import HTTPException
+
+from onecard_api.domain.constants import DEFAULT_GAME_SETTINGS
+from onecard_api.domain.types import AIDifficulty, GameSettings
+from onecard_api.services.game_ai_service import GameAiService
+from onecard_api.services.game_engine_service import ENGINE_KINDS, EngineKind
+from onecard_api.services.onnx_policy_service import OnnxPolicyService
+from onecard_api.search.ismcts import SearchConfig
+from onecard_api.search.puct import PuctConfig
+from onecard_api.sim import (
+    DEFAULT_MAX_TURNS,
+    add_search_arguments,
+    build_ai_service,
+    puct_config_from_args,
+    search_config_from_args,
+    simulate_game,
+)
+
+logger = logging.getLogger("onecard_api.tournament")
+
+# ONNX 모델이 학습된 6개 조합 (p2~p4 x 조커 on/off)
+ALL_CASES: tuple[tuple[int, bool], ...] = tuple(
+    (players, jokers) for players in (2, 3, 4) for jokers in (False, True)
+)
+
+
+@dataclass(frozen=True, slots=True)
+class MatchUp:
+    challenger: AIDifficulty
+    opponent: AIDifficulty
+
+    def seats(self, players: int, challenger_seat: int) -> list[AIDifficulty]:
+        seats: list[AIDifficulty] = [self.opponent] * players
+        seats[challenger_seat] = self.challenger
+        return seats
+
+    def __str__(self) -> str:
+        return f"{self.challenger}:{self.opponent}"
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkTask:
+    players: int
+    jokers: bool
+    matchup: MatchUp
+    seed: int
+    games: int
+    max_turns: int
+
+
+@dataclass(slots=True)
+class MatchStats:
+    games: int = 0
+    wins: int = 0
+    turns: int = 0
+    truncated: int = 0
+    games_by_seat: list[int] = field(default_factory=list)
+    wins_by_seat: list[int] = field(default_factory=list)
+
+    def merge(self, other: MatchStats) -> None:
+        self.games += other.games
+        self.wins += other.wins
+        self.turns += other.turns
+        self.truncated += other.truncated
+        if not self.games_by_seat:
+            self.games_by_seat = [0] * len(other.games_by_seat)
+            self.wins_by_seat = [0] * len(other.wins_by_seat)
+        for seat, (games, wins) in enumerate(zip(other.games_by_seat, other.wins_by_seat)):
+            self.games_by_seat[seat] += games
+            self.wins_by_seat[seat] += wins
+
+
+def wilson_interval(successes: int, trials: int, z: float = 1.96) -> tuple[float, float]:
+    """Wilson score interval of a binomial proportion (stays inside [0, 1] for small n)."""
+
+    if trials <= 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def case_settings(players: int, jokers: bool) -> GameSettings:
+    return {**DEFAULT_GAME_SETTINGS, "numberOfPlayers": players, "includeJokers": jokers}
+
+
+# --- worker side -----------------------------------------------------------------------
+# 워커 프로세스마다 한 번만 서비스(ONNX 세션 포함)를 만들고 이후 모든 청크에서 재사용한다.
+_worker_ai_service: GameAiService | None = None
+_worker_models: frozenset[tuple[int, bool]] = frozenset()
+
+
+def _init_worker(
+    engine: EngineKind,
+    model_dir: str | None,
+    models: frozenset[tuple[int, bool]],
+    search_config: SearchConfig | None = None,
+    puct_config: PuctConfig | None = None,
+) -> None:
+    """Process pool initializer; only ever runs in a worker process."""
+
+    global _worker_ai_service, _worker_models
+    _worker_ai_service = _build_chunk_service(engine, model_dir, models, search_config, puct_config)
+    _worker_models = models
+    # 수백만 게임 동안 턴마다 AI 액션 로그를 남기지 않는다. 워커 프로세스에만 적용된다.
+    logging.getLogger("onecard_api.game_ai").setLevel(logging.WARNING)
+
+
+def _build_chunk_service(
+    engine: EngineKind,
+    model_dir: str | None,
+    models: frozenset[tuple[int, bool]],
+    search_config: SearchConfig | None,
+    puct_config: PuctConfig | None,
+) -> GameAiService:
+    ai_service = build_ai_service(engine, model_dir, search_config, puct_config)
+    for players, jokers in models:
+        asyncio.run(ai_service.onnx_policy_service.check_health(case_settings(players, jokers)))
+    return ai_service
+
+
+def available_models(
+    cases: Iterable[tuple[int, bool]], model_dir: str | Path | None = None
+) -> frozenset[tuple[int, bool]]:
+    """Cases whose ONNX model loads; 'medium' seats of the other cases play rule-based."""
+
+    onnx_policy = OnnxPolicyService(model_dir=model_dir)
+    available = set()
+    for players, jokers in cases:
+        try:
+            asyncio.run(onnx_policy.check_health(case_settings(players, jokers)))
+        except HTTPException as exc:
+            logger.warning("[tournament] p%s joker=%s: %s", players, jokers, exc.detail)
+            continue
+        available.add((players, jokers))
+    return frozenset(available)
+
+
+def _play_chunk(task: ChunkTask) -> MatchStats:
+    assert _worker_ai_service is not None, "worker not initialized"
+    return _play_chunk_with(_worker_ai_service, _worker_models, task)
+
+
+def _play_chunk_with(
+    ai_service: GameAiService, models: frozenset[tuple[int, bool]], task: ChunkTask
+) -> MatchStats:
+    return asyncio.run(_play_chunk_async(ai_service, models, task))
+
+
+async def _play_chunk_async(
+    ai_service: GameAiService, models: frozenset[tuple[int, bool]], task: ChunkTask
+) -> MatchStats:
+    stats = MatchStats(
+        games_by_seat=[0] * task.players, wins_by_seat=[0] * task.players
+    )
+    settings = case_settings(task.players, task.jokers)
+    matchup = task.matchup
+    if (task.players, task.jokers) not in models:
+        # 모델이 없으면 ONNX 경로가 매 턴 로드에 실패한 뒤 규칙 기반으로 대체되므로 바로 대체한다.
+        matchup = MatchUp(*(
+            "easy" if strategy == "medium" else strategy
+            for strategy in (matchup.challenger, matchup.opponent)
+        ))
+    for offset in range(task.games):
+        seed = task.seed + offset
+        challenger_seat = seed % task.players
+        result = await simulate_game(
+            ai_service,
+            {**settings, "seed": seed},
+            matchup.seats(task.players, challenger_seat),
+            index=offset,
+            max_turns=task.max_turns,
+        )
+        stats.games += 1
+        stats.turns += result.turns
+        stats.truncated += result.truncated
+        stats.games_by_seat[challenger_seat] += 1
+        if result.winner == challenger_seat:
+            stats.wins += 1
+            stats.wins_by_seat[challenger_seat] += 1
+    return stats
+
+
+# --- coordinator side ------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class TournamentConfig:
+    max_games: int = 100_000
+    min_games: int = 1_000
+    chunk_size: int = 250
+    confidence: float = 0.95
+    seed: int = 0
+    max_turns: int = DEFAULT_MAX_TURNS
+
+    @property
+    def z(self) -> float:
+        return NormalDist().inv_cdf(0.5 + self.confidence / 2)
+
+    def looks(self, wave_games: int) -> int:
+        """How many times `run_matchup` may test the interval when waves hold `wave_games`."""
+
+        waves = math.ceil(self.max_games / wave_games)
+        before_min = max(0, math.ceil(self.min_games / wave_games) - 1)
+        return max(1, waves - before_min)
+
+    def sequential_z(self, looks: int) -> float:
+        # Bonferroni: 매 검사를 (1 - confidence) / looks 수준으로 하면 전체 오판 확률이 1 - confidence 이하다.
+        return NormalDist().inv_cdf(1 - (1 - self.confidence) / (2 * looks))
+
+
+def run_matchup(
+    pool: ProcessPoolExecutor | None,
+    players: int,
+    jokers: bool,
+    matchup: MatchUp,
+    config: TournamentConfig,
+    workers: int = 1,
+    onnx_available: bool | None = None,
+    play_chunk: Callable[[ChunkTask], MatchStats] | None = None,
+) -> dict[str, Any]:
+    """Plays waves of seeded chunks until the interval is decisive or `max_games` is reached.
+
+    Chunks are aggregated wave by wave in submission order, so a given seed and configuration
+    always stop after the same number of games regardless of scheduling. The reported
+    interval uses the sequentially adjusted `z` that the stopping rule uses. Without a
+    `pool` chunks run in this process through `play_chunk`.
+    """
+
+    started = time.perf_counter()
+    stats = MatchStats()
+    fair_share = 1 / players
+    next_seed = config.seed
+    wave_size = max(1, workers) * 2
+    looks = config.looks(wave_size * config.chunk_size)
+    z = config.sequential_z(looks)
+    play_inline = play_chunk or _play_chunk
+    low, high = 0.0, 1.0
+
+    while stats.games < config.max_games:
+        tasks = []
+        for _ in range(wave_size):
+            games = min(config.chunk_size, config.max_games - stats.games - sum(t.games for t in tasks))
+            if games <= 0:
+                break
+            tasks.append(ChunkTask(players, jokers, matchup, next_seed, games, config.max_turns))
+            next_seed += games
+        results: Iterable[MatchStats] = (
+            pool.map(_play_chunk, tasks) if pool is not None else map(play_inline, tasks)
+        )
+        for chunk_stats in results:
+            stats.merge(chunk_stats)
+
+        low, high = wilson_interval(stats.wins, stats.games, z)
+        if stats.games >= config.min_games and not low <= fair_share <= high:
+            break
+
+    elapsed = time.perf_counter() - started
+    significant = not low <= fair_share <= high
+    return {
+        "case": f"p{players}_joker{'on' if jokers else 'off'}",
+        "matchup": str(matchup),
+        "onnxAvailable": onnx_available,
+        "games": stats.games,
+        "winRate": round(stats.wins / max(stats.games, 1), 4),
+        "ci": [round(low, 4), round(high, 4)],
+        "fairShare": round(fair_share, 4),
+        "looks": looks,
+        "significant": significant,
+        "verdict": (
+            "challenger stronger" if significant and low > fair_share
+            else "challenger weaker" if significant
+            else "no significant difference"
+        ),
+        "turnsPerGame": round(stats.turns / max(stats.games, 1), 2),
+        "truncated": stats.truncated,
+        "seats": [
+            {
+                "seat": seat,
+                "games": games,
+                "winRate": round(wins / games, 4) if games else None,
+                "ci": [round(v, 4) for v in wilson_interval(wins, games, config.z)],
+            }
+            for seat, (games, wins) in enumerate(zip(stats.games_by_seat, stats.wins_by_seat))
+        ],
+        "seconds": round(elapsed, 3),
+        "gamesPerSecond": round(stats.games / elapsed, 1) if elapsed else None,
+    }
+
+
+def run_tournament(
+    cases: Sequence[tuple[int, bool]],
+    matchups: Sequence[MatchUp],
+    config: TournamentConfig,
+    *,
+    workers: int = 0,
+    engine: EngineKind = "dict",
+    model_dir: str | Path | None = None,
+    search_config: SearchConfig | None = None,
+    puct_config: PuctConfig | None = None,
+) -> Iterable[dict[str, Any]]:
+    """Yields one report per (case, match-up); `workers=0` plays in this process."""
+
+    def uses_onnx(matchup: MatchUp) -> bool:
+        return "medium" in (matchup.challenger, matchup.opponent)
+
+    def onnx_available(players: int, jokers: bool, matchup: MatchUp) -> bool | None:
+        return (players, jokers) in models if uses_onnx(matchup) else None
+
+    models = available_models(cases, model_dir) if any(map(uses_onnx, matchups)) else frozenset()
+    init_args = (engine, str(model_dir) if model_dir else None, models, search_config, puct_config)
+    if workers <= 0:
+        # 이 프로세스의 전역 상태(워커용 서비스, 로그 레벨)는 건드리지 않는다.
+        play_chunk = functools.partial(_play_chunk_with, _build_chunk_service(*init_args), models)
+        for players, jokers in cases:
+            for matchup in matchups:
+                yield run_matchup(
+                    None,
+                    players,
+                    jokers,
+                    matchup,
+                    config,
+                    onnx_available=onnx_available(players, jokers, matchup),
+                    play_chunk=play_chunk,
+                )
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+        for players, jokers in cases:
+            for matchup in matchups:
+                yield run_matchup(
+                    pool,
+                    players,
+                    jokers,
+                    matchup,
+                    config,
+                    workers,
+                    onnx_available=onnx_available(players, jokers, matchup),
+                )
+
+
+def _parse_matchup(value: str) -> MatchUp:
+    difficulties = get_args(AIDifficulty)
+    challenger, _, opponent = value.partition(":")
+    if challenger not in difficulties or opponent not in difficulties:
+        raise argparse.ArgumentTypeError(f"match-up must be 'challenger:opponent' from {difficulties}")
+    return MatchUp(challenger, opponent)  # type: ignore[arg-type]
+
+
+def _parse_cases(value: str) -> list[tuple[int, bool]]:
+    if value == "all":
+        return list(ALL_CASES)
+    cases = []
+    for item in value.split(","):
+        players, _, jokers = item.strip().partition("-")
+        if not players.startswith("p") or jokers not in ("on", "off"):
+            raise argparse.ArgumentTypeError(f"case {item!r} must look like 'p3-on'")
+        cases.append((int(players[1:]), jokers == "on"))
+    return cases
+
+
+def build_parser() -> argparse.ArgumentParser:
+    defaults = TournamentConfig()
+    parser = argparse.ArgumentParser(prog="python -m onecard_api.tournament", description=__doc__.splitlines()[0])
+    parser.add_argument("--matchups", type=_parse_matchup, nargs="+", default=[MatchUp("medium", "easy")])
+    parser.add_argument("--cases", type=_parse_cases, default=list(ALL_CASES), help="'all' or e.g. 'p2-off,p4-on'")
+    parser.add_argument("--max-games", type=int, default=defaults.max_games)
+    parser.add_argument("--min-games", type=int, default=defaults.min_games)
+    parser.add_argument("--chunk-size", type=int, default=defaults.chunk_size)
+    parser.add_argument("--confidence", type=float, default=defaults.confidence)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--max-turns", type=int, default=defaults.max_turns)
+    parser.add_argument("--workers", type=int, default=0, help="process pool size (0: run inline)")
+    parser.add_argument("--engine", choices=ENGINE_KINDS, default="dict")
+    parser.add_argument("--model-dir", default=None)
+    add_search_arguments(parser)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None, out: TextIO = sys.stdout) -> int:
+    args = build_parser().parse_args(argv)
+    config = TournamentConfig(
+        max_games=args.max_games,
+        min_games=args.min_games,
+        chunk_size=args.chunk_size,
+        confidence=args.confidence,
+        seed=args.seed,
+        max_turns=args.max_turns,
+    )
+    for report in run_tournament(
+        args.cases,
+        args.matchups,
+        config,
+        workers=args.workers,
+        engine=args.engine,
+        model_dir=args.model_dir,
+        search_config=search_config_from_args(args),
+        puct_config=puct_config_from_args(args),
+    ):
+        out.write(json.dumps(report) + "\n")
+        out.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+import pytest
+from httpx import AsyncClient
+
+from onecard_api.container import get_container
+from onecard_api.main import create_app
+
+
+@pytest.fixture
+def app():
+    return create_app(get_container(), debug_endpoints=True)
+
+
+@pytest.mark.asyncio
+async def test_debug_endpoints_are_off_by_default(monkeypatch):
+    monkeypatch.delenv("ONECARD_DEBUG_ENDPOINTS", raising=False)
+    async with AsyncClient(app=create_app(get_container()), base_url="http://testserver") as client:
+        assert (await client.get("/debug/store")).status_code == 404
+        assert (await client.put("/debug/transitions", json={"enabled": True})).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_transition_profile_endpoint(client, container):
+    try:
+        enabled = await client.put("/debug/transitions", json={"enabled": True})
+        assert enabled.status_code == 200
+        assert enabled.json()["enabled"] is True
+        await client.delete("/debug/transitions")
+
+        created = await client.post("/games", json={})
+        game_id = created.json()["id"]
+        await client.patch(f"/games/{game_id}", json={"action": {"type": "START_GAME"}})
+
+        profile = (await client.get("/debug/transitions")).json()
+        assert profile["actions"]["START_GAME"]["count"] == 1
+        assert container.transition_profiler.snapshot() == profile
+    finally:
+        disabled = await client.put("/debug/transitions", json={"enabled": False})
+    assert disabled.json()["enabled"] is False
+
+
+@pytest.mark.asyncio
+async def test_store_metrics_endpoint(client, container):
+    before = (await client.get("/debug/store")).json()
+    await client.post("/games", json={})
+    after = (await client.get("/debug/store")).json()
+    assert after["sessions"] == before["sessions"] + 1
+    assert after["approxBytes"] > before["approxBytes"]
+    assert set(after["evictions"]) == {"idle", "finished", "capacity", "memory"}
+
+
+@pytest.mark.asyncio
+async def test_ai_prefetch_metrics_endpoint(client, container):
+    metrics = (await client.get("/debug/ai-prefetch")).json()
+    assert metrics == container.ai_prefetcher.metrics()
+    assert {"enabled", "hits", "misses", "invalidated", "hitRate"} <= metrics.keys()
@@ -1,4 +1,10 @@
+import asyncio
+
 import pytest
+from httpx import AsyncClient
+
+from onecard_api.container import ServiceContainer
+from onecard_api.main import create_app
 
 
 @pytest.mark.asyncio
@@ -87,3 +93,162 @@ async def test_ai_turn_rejected_when_not_ai_round(client):
     ai_turn = await client.post(f"/games/{game_id}/ai-turns")
     assert ai_turn.status_code == 400
     assert "AI" in ai_turn.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_seeded_games_are_reproducible(client):
+    states = []
+    for _ in range(2):
+        created = await client.post("/games", json={"settings": {"seed": 1234}})
+        game_id = created.json()["id"]
+        start = await client.patch(
+            f"/games/{game_id}", json={"action": {"type": "START_GAME"}}
+        )
+        states.append(start.json()["state"])
+        fetched = await client.get(f"/games/{game_id}")
+        assert "seed" not in fetched.json()["state"]["settings"]
+
+    assert states[0] == states[1]
+    assert "seed" not in states[0]["settings"]
+    assert "rng" not in states[0]
+
+
+@pytest.mark.asyncio
+async def test_history_endpoints_replay_the_action_log(monkeypatch, tmp_path):
+    monkeypatch.setenv("ONECARD_STORE", "sqlite")
+    monkeypatch.setenv("ONECARD_SQLITE_PATH", str(tmp_path / "sessions.sqlite3"))
+    container = ServiceContainer()
+    async with AsyncClient(app=create_app(container), base_url="http://testserver") as client:
+        game_id = (await client.post("/games", json={})).json()["id"]
+        started = await client.patch(f"/games/{game_id}", json={"action": {"type": "START_GAME"}})
+        await client.patch(f"/games/{game_id}", json={"action": {"type": "DRAW_CARD", "amount": 1}})
+
+        history = await client.get(f"/games/{game_id}/history")
+        assert history.status_code == 200
+        assert [entry["action"]["type"] for entry in history.json()["actions"]] == ["START_GAME", "DRAW_CARD"]
+        at_start = await client.get(f"/games/{game_id}/history/1")
+        assert at_start.json()["state"] == started.json()["state"]
+        assert (await client.get(f"/games/{game_id}/history/5")).status_code == 404
+    container.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_history_needs_a_persistent_store(client):
+    game_id = (await client.post("/games", json={})).json()["id"]
+    assert (await client.get(f"/games/{game_id}/history")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_patch_honours_if_match(client):
+    created = await client.post("/games", json={})
+    game_id = created.json()["id"]
+    assert created.json()["version"] == 1
+    fetched = await client.get(f"/games/{game_id}")
+    assert fetched.headers["etag"] == '"1"'
+
+    started = await client.patch(
+        f"/games/{game_id}", json={"action": {"type": "START_GAME"}}, headers={"If-Match": '"1"'}
+    )
+    assert started.status_code == 200
+    assert started.headers["etag"] == '"2"'
+    assert started.json()["version"] == 2
+
+    stale = await client.patch(
+        f"/games/{game_id}", json={"action": {"type": "DRAW_CARD", "amount": 1}}, headers={"If-Match": '"1"'}
+    )
+    assert stale.status_code == 412
+    malformed = await client.patch(
+        f"/games/{game_id}", json={"action": {"type": "DRAW_CARD", "amount": 1}}, headers={"If-Match": "abc"}
+    )
+    assert malformed.status_code == 400
+    assert (await client.get(f"/games/{game_id}")).json()["version"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_patches_with_the_same_version_apply_once(client):
+    game_id = (await client.post("/games", json={})).json()["id"]
+    await client.patch(f"/games/{game_id}", json={"action": {"type": "START_GAME"}})
+
+    draw = {"action": {"type": "DRAW_CARD", "amount": 1}}
+    responses = await asyncio.gather(
+        *(client.patch(f"/games/{game_id}", json=draw, headers={"If-Match": '"2"'}) for _ in range(4))
+    )
+
+    assert sorted(response.status_code for response in responses) == [200, 412, 412, 412]
+    assert (await client.get(f"/games/{game_id}")).json()["version"] == 3
+
+
+@pytest.mark.asyncio
+async def test_list_games_pages_and_filters():
+    container = ServiceContainer()
+    async with AsyncClient(app=create_app(container), base_url="http://testserver") as client:
+        created = [
+            (
+                await client.post("/games", json={"settings": {"numberOfPlayers": 2 + index % 2, "seed": index}})
+            ).json()["id"]
+            for index in range(5)
+        ]
+        await client.patch(f"/games/{created[0]}", json={"action": {"type": "START_GAME"}})
+
+        first = (await client.get("/games", params={"limit": 2})).json()
+        assert [item["id"] for item in first["items"]] == [created[0], created[4]]
+        assert first["items"][0]["gameStatus"] == "playing"
+        assert first["items"][0]["version"] == 2
+        assert all("seed" not in item["settings"] for item in first["items"])
+        rest = (await client.get("/games", params={"limit": 10, "cursor": first["nextCursor"]})).json()
+        assert [item["id"] for item in rest["items"]] == created[3:0:-1]
+        assert rest["nextCursor"] is None
+
+        three = (await client.get("/games", params={"numberOfPlayers": 3, "gameStatus": "waiting"})).json()
+        assert [item["id"] for item in three["items"]] == [created[3], created[1]]
+        oldest = (await client.get("/games", params={"order": "asc", "limit": 1})).json()
+        assert oldest["items"][0]["id"] == created[1]
+
+        assert (await client.get("/games", params={"cursor": "!!"})).status_code == 400
+        assert (await client.get("/games", params={"limit": 0})).status_code == 422
+    container.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_ai_turns_run_until_the_human_moves_with_one_write():
+    container = ServiceContainer()
+    async with AsyncClient(app=create_app(container), base_url="http://testserver") as client:
+        created = await client.post("/games", json={"settings": {"numberOfPlayers": 4, "seed": 7}})
+        game_id = created.json()["id"]
+        await client.patch(f"/games/{game_id}", json={"action": {"type": "START_GAME"}})
+        await client.patch(f"/games/{game_id}", json={"action": {"type": "DRAW_CARD", "amount": 1}})
+        human = await client.patch(f"/games/{game_id}", json={"action": {"type": "NEXT_TURN"}})
+        assert human.json()["state"]["currentPlayerIndex"] != 0
+
+        chained = await client.post(f"/games/{game_id}/ai-turns", params={"untilHuman": "true"})
+        assert chained.status_code == 200
+        body = chained.json()
+        state = body["state"]
+        assert state["gameStatus"] == "finished" or not state["players"][state["currentPlayerIndex"]]["isAI"]
+        assert body["info"]["truncated"] is False
+        assert {turn["playerIndex"] for turn in body["info"]["turns"]} <= {1, 2, 3}
+        assert body["info"]["aiActions"] == [
+            action for turn in body["info"]["turns"] for action in turn["aiActions"]
+        ]
+        assert body["version"] == human.json()["version"] + 1
+        assert chained.headers["etag"] == f'"{body["version"]}"'
+    container.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_ai_turn_chains_stop_at_the_cap():
+    container = ServiceContainer()
+    async with AsyncClient(app=create_app(container), base_url="http://testserver") as client:
+        game_id = (await client.post("/games", json={"settings": {"numberOfPlayers": 3}})).json()["id"]
+        await client.patch(f"/games/{game_id}", json={"action": {"type": "START_GAME"}})
+        store = container.game_state_store
+        state = store.find(game_id)["state"]
+        # 사람이 없는 게임: 상한이 없으면 끝날 때까지 돈다.
+        store.update_state(game_id, {**state, "players": [{**player, "isAI": True} for player in state["players"]]})
+
+        capped = await client.post(f"/games/{game_id}/ai-turns", params={"untilHuman": "true", "maxTurns": 2})
+        info = capped.json()["info"]
+        assert len(info["turns"]) == 2 or capped.json()["state"]["gameStatus"] == "finished"
+        assert info["truncated"] is (capped.json()["state"]["gameStatus"] != "finished")
+        assert (await client.post(f"/games/{game_id}/ai-turns", params={"maxTurns": 0})).status_code == 422
+    container.shutdown()
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from onecard_api.domain.batch import (
+    legal_action_mask,
+    play_rule_based_turns,
+    stack_games,
+    unstack_game,
+)
+from onecard_api.domain.card_utils import playable_indices
+from onecard_api.domain.compact import from_compact, to_compact
+from onecard_api.domain.engine import (
+    apply_special_effect_action,
+    create_started_state,
+    draw_card_action,
+    next_turn_action,
+    play_card_action,
+)
+from onecard_api.domain.players import find_playable_card_brute_force
+from onecard_api.domain.transitions import transition_game_state
+
+SPECIAL_RANKS = {1, 2, 11, 12, 13}
+
+
+def _settings(players: int, jokers: bool, max_hand: int):
+    return {
+        "mode": "single",
+        "numberOfPlayers": players,
+        "includeJokers": jokers,
+        "initHandSize": 5,
+        "maxHandSize": max_hand,
+        "difficulty": "easy",
+    }
+
+
+def _scalar_rule_based_turn(state):
+    # GameAiService._execute_turn 과 같은 순서의 한 턴
+    index = state["currentPlayerIndex"]
+    hand = state["players"][index]["hand"]
+    top = state["discardPile"][0] if state["discardPile"] else None
+    card = find_playable_card_brute_force(hand, top, state["damage"]) if top else None
+    if card is not None:
+        state = transition_game_state(state, play_card_action(index, hand.index(card)))
+        if card.get("isJoker") or card.get("rank") in SPECIAL_RANKS:
+            state = transition_game_state(state, apply_special_effect_action(card))
+    else:
+        state = transition_game_state(state, draw_card_action(max(1, state["damage"])))
+    if state["gameStatus"] != "finished":
+        state = transition_game_state(state, next_turn_action())
+    return state
+
+
+def _seeded_games(count: int, settings):
+    return [create_started_state({**settings, "seed": seed}) for seed in range(count)]
+
+
+@pytest.mark.parametrize("players, jokers, max_hand", [(2, False, 15), (3, True, 8), (4, True, 20)])
+def test_batch_rule_based_turns_match_scalar_reducer(players, jokers, max_hand):
+    states = _seeded_games(12, _settings(players, jokers, max_hand))
+    games = stack_games([to_compact(state) for state in states])
+
+    turns = 150
+    for _ in range(turns):
+        play_rule_based_turns(games)
+
+    for g, state in enumerate(states):
+        for _ in range(turns):
+            if state["gameStatus"] == "finished":
+                break
+            state = _scalar_rule_based_turn(state)
+        assert from_compact(unstack_game(games, g)) == state
+
+
+def test_legal_action_mask_matches_scalar_rules():
+    states = _seeded_games(8, _settings(3, True, 15))
+    states = [{**state, "damage": 2 if idx % 2 else 0} for idx, state in enumerate(states)]
+    games = stack_games([to_compact(state) for state in states])
+    mask = legal_action_mask(games, 15)
+
+    for g, state in enumerate(states):
+        hand = state["players"][state["currentPlayerIndex"]]["hand"]
+        expected = np.zeros(16, dtype=bool)
+        expected[playable_indices(hand, state["discardPile"][0], state["damage"])] = True
+        expected[15] = len(hand) < 15
+        assert (mask[g] == expected).all()
@@ -0,0 +1,49 @@
+import copy
+import pickle
+
+import pytest
+
+from onecard_api.domain.card_codes import CANONICAL_CARDS, CARD_CODE_COUNT, encode_card
+from onecard_api.domain.card_utils import create_deck
+from onecard_api.domain.state import initialize_game_state
+
+
+def test_canonical_cards_have_stable_ids_and_codes():
+    assert len(CANONICAL_CARDS) == CARD_CODE_COUNT
+    assert CANONICAL_CARDS[0]["id"] == "hearts-1"
+    assert CANONICAL_CARDS[51]["id"] == "spades-13"
+    assert [card["id"] for card in CANONICAL_CARDS[52:]] == ["joker-1", "joker-2"]
+    assert len({card["id"] for card in CANONICAL_CARDS}) == CARD_CODE_COUNT
+    for code, card in enumerate(CANONICAL_CARDS):
+        assert encode_card(card) == min(code, 52)
+        assert encode_card(dict(card)) == encode_card(card)
+
+
+def test_canonical_cards_are_immutable_and_shared():
+    card = CANONICAL_CARDS[5]
+    with pytest.raises(TypeError):
+        card["rank"] = 9  # type: ignore[index]
+    with pytest.raises(TypeError):
+        card.update(rank=9)
+    assert copy.copy(card) is card
+    assert copy.deepcopy({"hand": [card]})["hand"][0] is card
+    assert pickle.loads(pickle.dumps(card)) is card
+
+
+def test_every_game_reuses_the_same_card_objects():
+    settings = {
+        "mode": "single",
+        "numberOfPlayers": 3,
+        "includeJokers": True,
+        "initHandSize": 5,
+        "maxHandSize": 15,
+        "difficulty": "easy",
+        "seed": 1,
+    }
+    first = initialize_game_state(settings, {"seed": 1, "counter": 0})
+    second = initialize_game_state(settings, {"seed": 2, "counter": 0})
+    first_cards = {id(card) for card in first["deck"]}
+    second_cards = {id(card) for card in second["deck"]}
+    assert first_cards <= {id(card) for card in CANONICAL_CARDS}
+    assert second_cards <= {id(card) for card in CANONICAL_CARDS}
+    assert len(create_deck(False)) == 52
@@ -0,0 +1,46 @@
+import itertools
+
+from onecard_api.domain.card_codes import CARD_CODE_COUNT, code_to_card_fields
+from onecard_api.domain.card_utils import (
+    _is_able_to_block_rule,
+    _is_valid_play_rule,
+    hand_mask,
+    is_able_to_block,
+    is_valid_play,
+    playable_code_mask,
+    playable_indices,
+)
+
+ALL_CARDS = [code_to_card_fields(code) for code in range(CARD_CODE_COUNT)]
+
+
+def test_lookup_table_matches_rule_for_every_card_pair():
+    for played, top in itertools.product(ALL_CARDS, ALL_CARDS):
+        for damage in (0, 2, 7):
+            assert is_valid_play(played, top, damage) == _is_valid_play_rule(
+                played, top, damage
+            )
+        assert is_able_to_block(played, top) == _is_able_to_block_rule(played, top)
+
+
+def test_partial_cards_fall_back_to_rule():
+    top = {"id": "t", "isJoker": False, "rank": 2}
+    ace = {"id": "a", "isJoker": False, "rank": 1, "suit": "hearts"}
+    two = {"id": "b", "isJoker": False, "rank": 2}
+    assert is_valid_play(two, top, 2) is True
+    assert is_valid_play(ace, top, 2) is False
+    assert playable_indices([ace, two], top, 2) == [1]
+
+
+def test_hand_mask_and_playable_indices():
+    top = {"isJoker": False, "rank": 7, "suit": "clubs"}
+    hand = [
+        {"isJoker": False, "rank": 7, "suit": "hearts"},
+        {"isJoker": False, "rank": 3, "suit": "spades"},
+        {"isJoker": True},
+        {"isJoker": False, "rank": 10, "suit": "clubs"},
+    ]
+    legal_codes = hand_mask(hand) & playable_code_mask(top, 0)
+    assert legal_codes == hand_mask([hand[0], hand[2], hand[3]])
+    assert playable_indices(hand, top, 0) == [0, 2, 3]
+    assert playable_indices(hand, None, 0) == [0, 1, 2, 3]
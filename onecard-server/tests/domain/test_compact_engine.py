@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from onecard_api.domain.card_utils import is_valid_play
+from onecard_api.domain.compact import from_compact, to_compact, transition_compact_state
+from onecard_api.domain.engine import (
+    apply_special_effect_action,
+    compact_step,
+    create_started_state,
+    draw_card_action,
+    next_turn_action,
+    play_card_action,
+)
+from onecard_api.domain.transitions import transition_game_state
+
+
+def _settings(players: int, jokers: bool, max_hand: int = 15):
+    return {
+        "mode": "single",
+        "numberOfPlayers": players,
+        "includeJokers": jokers,
+        "initHandSize": 5,
+        "maxHandSize": max_hand,
+        "difficulty": "easy",
+    }
+
+
+def _turn_actions(state, chooser: random.Random):
+    player = state["players"][state["currentPlayerIndex"]]
+    top = state["discardPile"][0]
+    playable = [
+        idx
+        for idx, card in enumerate(player["hand"])
+        if is_valid_play(card, top, state["damage"])
+    ]
+    if playable and chooser.random() < 0.8:
+        idx = chooser.choice(playable)
+        card = player["hand"][idx]
+        return [
+            play_card_action(state["currentPlayerIndex"], idx),
+            apply_special_effect_action(card),
+            next_turn_action(),
+        ]
+    return [draw_card_action(max(1, state["damage"])), next_turn_action()]
+
+
+@pytest.mark.parametrize(
+    "seed, players, jokers, max_hand",
+    [(1, 2, False, 15), (2, 3, True, 15), (3, 4, True, 6), (4, 2, True, 20)],
+)
+def test_compact_engine_matches_dict_reducer(seed, players, jokers, max_hand):
+    chooser = random.Random(seed)
+    state = create_started_state({**_settings(players, jokers, max_hand), "seed": seed})
+    compact = to_compact(state)
+
+    for _ in range(200):
+        if state["gameStatus"] == "finished":
+            break
+        for action in _turn_actions(state, chooser):
+            if state["gameStatus"] == "finished":
+                break
+            state = transition_game_state(state, action)
+            compact = transition_compact_state(compact, action)
+            assert from_compact(compact) == state
+
+
+def test_compact_round_trip_is_lossless():
+    state = create_started_state({**_settings(3, True), "seed": 7})
+    restored = from_compact(to_compact(state))
+    assert restored == state
+    assert restored["deck"][0] is state["deck"][0]
+
+
+def test_compact_step_falls_back_for_unencodable_effect_card():
+    state = create_started_state(_settings(2, False))
+    effect = {"id": "x", "isJoker": False, "isFlipped": True, "rank": 2}
+    result = compact_step(state, apply_special_effect_action(effect))
+    assert result["state"]["damage"] == 2
@@ -0,0 +1,60 @@
+import copy
+import json
+import pickle
+import random
+
+from onecard_api.domain.discard_pile import DiscardPile
+from onecard_api.domain.engine import create_started_state
+from onecard_api.domain.state import serialize_state
+from onecard_api.domain.transitions import play_card_status
+
+CARDS = [{"id": f"c{i}", "isJoker": False, "rank": i + 1, "suit": "hearts"} for i in range(4)]
+
+
+def test_push_shares_the_previous_pile():
+    pile = DiscardPile.from_cards(CARDS[1:])
+    pushed = pile.push(CARDS[0])
+
+    assert pushed[0] is CARDS[0]
+    assert pushed.top is CARDS[0]
+    assert pushed == CARDS
+    assert pile == CARDS[1:]
+    assert len(pushed) == 4 and pushed[-1] is CARDS[3]
+    assert pushed._below is pile
+
+
+def test_split_top_extracts_all_but_top():
+    top_only, below = DiscardPile.from_cards(CARDS).split_top()
+    assert top_only == [CARDS[0]]
+    assert below == CARDS[1:]
+    assert DiscardPile().split_top() == (DiscardPile(), [])
+
+
+def test_copy_and_pickle_round_trip():
+    pile = DiscardPile.from_cards(CARDS)
+    assert copy.deepcopy(pile) == pile
+    assert pickle.loads(pickle.dumps(pile)) == CARDS
+
+
+def test_play_card_keeps_json_shape():
+    random.seed(1)
+    state = create_started_state(
+        {
+            "mode": "single",
+            "numberOfPlayers": 2,
+            "includeJokers": False,
+            "initHandSize": 5,
+            "maxHandSize": 15,
+            "difficulty": "easy",
+        }
+    )
+    played = state["players"][0]["hand"][0]
+    next_state = play_card_status(state, 0, 0)
+
+    assert next_state["discardPile"][0] is played
+    assert next_state["discardPile"]._below is state["discardPile"]
+    payload = json.loads(json.dumps(serialize_state(next_state)))
+    assert [c["id"] for c in payload["discardPile"]] == [
+        played["id"],
+        state["discardPile"][0]["id"],
+    ]
@@ -0,0 +1,56 @@
+from onecard_api.domain.card_utils import is_valid_play
+from onecard_api.domain.engine import (
+    create_started_state,
+    draw_card_action,
+    legal_actions,
+    legal_actions_scope,
+    step,
+)
+
+
+def _settings(max_hand: int = 15):
+    return {
+        "mode": "single",
+        "numberOfPlayers": 3,
+        "includeJokers": True,
+        "initHandSize": 5,
+        "maxHandSize": max_hand,
+        "difficulty": "easy",
+        "seed": 5,
+    }
+
+
+def test_legal_actions_match_rules_and_are_memoized_within_a_scope():
+    state = create_started_state(_settings())
+    with legal_actions_scope():
+        legal = legal_actions(state)
+        with legal_actions_scope():
+            assert legal_actions(state) is legal
+        assert legal_actions(state) is legal
+        assert legal_actions({**state}) is not legal
+        assert legal_actions({**state}) == legal
+    # 범위를 벗어나면 캐시가 사라져 상태를 붙잡지 않는다.
+    assert legal_actions(state) is not legal
+    assert legal_actions(state) == legal
+    hand = state["players"][state["currentPlayerIndex"]]["hand"]
+    top = state["discardPile"][0]
+
+    assert legal.player_index == state["currentPlayerIndex"]
+    assert legal.play_indices == tuple(
+        idx for idx, card in enumerate(hand) if is_valid_play(card, top, state["damage"])
+    )
+    assert legal.can_draw is True
+    assert legal.draw_amount == 1
+
+
+def test_draw_is_illegal_at_max_hand_size():
+    state = create_started_state(_settings(max_hand=6))
+    state = step(state, draw_card_action(1))["state"]
+    legal = legal_actions(state)
+    assert legal.hand_size == 6
+    assert legal.can_draw is False
+
+
+def test_empty_discard_pile_allows_every_card():
+    state = {**create_started_state(_settings()), "discardPile": []}
+    assert legal_actions(state, 1).play_indices == tuple(range(5))
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from onecard_api.domain.card_utils import has_special_effect, playable_indices
+from onecard_api.domain.engine import (
+    apply_special_effect_action,
+    compact_play_turn,
+    create_started_state,
+    draw_card_action,
+    next_turn_action,
+    play_card_action,
+    play_turn,
+    step,
+)
+from onecard_api.domain.state import serialize_state
+
+
+def _settings(players: int, jokers: bool, seed: int):
+    return {
+        "mode": "single",
+        "numberOfPlayers": players,
+        "includeJokers": jokers,
+        "initHandSize": 5,
+        "maxHandSize": 15,
+        "difficulty": "easy",
+        "seed": seed,
+    }
+
+
+def _stepwise_turn(state, action):
+    actions = [action]
+    next_state = step(state, action)["state"]
+    if action["type"] == "PLAY_CARD":
+        payload = action["payload"]
+        card = state["players"][payload["playerIndex"]]["hand"][payload["cardIndex"]]
+        if has_special_effect(card):
+            actions.append(apply_special_effect_action(card))
+            next_state = step(next_state, actions[-1])["state"]
+    if next_state["gameStatus"] != "finished":
+        actions.append(next_turn_action())
+        next_state = step(next_state, actions[-1])["state"]
+    return next_state, actions
+
+
+@pytest.mark.parametrize("fused", [play_turn, compact_play_turn])
+@pytest.mark.parametrize("seed, players, jokers", [(1, 2, False), (2, 3, True), (3, 4, True)])
+def test_play_turn_matches_stepwise_actions(fused, seed, players, jokers):
+    chooser = random.Random(seed)
+    state = create_started_state(_settings(players, jokers, seed))
+
+    for _ in range(300):
+        if state["gameStatus"] == "finished":
+            break
+        hand = state["players"][state["currentPlayerIndex"]]["hand"]
+        playable = playable_indices(hand, state["discardPile"][0], state["damage"])
+        if playable and chooser.random() < 0.8:
+            action = play_card_action(state["currentPlayerIndex"], chooser.choice(playable))
+        else:
+            action = draw_card_action(max(1, state["damage"]))
+
+        expected_state, expected_actions = _stepwise_turn(state, action)
+        result = fused(state, action)
+        assert result["info"]["actions"] == expected_actions
+        assert result["done"] == (expected_state["gameStatus"] == "finished")
+        assert serialize_state(result["state"]) == serialize_state(expected_state)
+        state = result["state"]
+
+
+def test_play_turn_rejects_other_actions():
+    state = create_started_state(_settings(2, False, 1))
+    with pytest.raises(ValueError):
+        play_turn(state, next_turn_action())
@@ -0,0 +1,73 @@
+import tracemalloc
+
+import pytest
+
+from onecard_api.domain import transitions
+from onecard_api.domain.engine import (
+    create_started_state,
+    create_waiting_state,
+    draw_card_action,
+    next_turn_action,
+    start_game_action,
+    step,
+)
+from onecard_api.domain.profiling import TransitionProfiler
+
+SETTINGS = {
+    "mode": "single",
+    "numberOfPlayers": 3,
+    "includeJokers": True,
+    "initHandSize": 5,
+    "maxHandSize": 15,
+    "difficulty": "easy",
+    "seed": 1,
+}
+
+
+@pytest.fixture
+def profiler():
+    profiler = TransitionProfiler()
+    yield profiler
+    profiler.disable()
+
+
+def test_disabled_profiler_is_not_installed(profiler):
+    assert transitions._profiler is None
+    step(create_started_state(SETTINGS), next_turn_action())
+    assert profiler.snapshot() == {"enabled": False, "trackAllocations": False, "actions": {}}
+
+
+def test_counts_and_latency_per_action_type(profiler):
+    profiler.enable()
+    state = step(create_waiting_state(SETTINGS), start_game_action())["state"]
+    for _ in range(3):
+        state = step(state, draw_card_action(1))["state"]
+    state = step(state, next_turn_action())["state"]
+
+    actions = profiler.snapshot()["actions"]
+    assert {name: stats["count"] for name, stats in actions.items()} == {
+        "DRAW_CARD": 3,
+        "NEXT_TURN": 1,
+        "START_GAME": 1,
+    }
+    draw = actions["DRAW_CARD"]
+    assert 0 < draw["maxUs"] <= draw["totalMs"] * 1000
+    assert "allocBytes" not in draw
+
+    profiler.reset()
+    assert profiler.snapshot()["actions"] == {}
+
+
+def test_allocation_tracking_starts_and_stops_tracemalloc(profiler):
+    was_tracing = tracemalloc.is_tracing()
+    profiler.enable(track_allocations=True)
+    assert tracemalloc.is_tracing()
+    step(create_waiting_state(SETTINGS), start_game_action())
+
+    start = profiler.snapshot()["actions"]["START_GAME"]
+    assert start["allocBytes"] > 0
+    assert start["maxAllocBytes"] >= start["meanAllocBytes"]
+
+    profiler.disable()
+    assert transitions._profiler is None
+    assert tracemalloc.is_tracing() == was_tracing
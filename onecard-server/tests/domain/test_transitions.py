@@ -0,0 +1,81 @@
+import copy
+import random
+
+from onecard_api.domain.engine import create_started_state
+from onecard_api.domain.state import initialize_game_state
+from onecard_api.domain.transitions import draw_card_status, transition_game_state
+
+
+def _settings(**overrides):
+    settings = {
+        "mode": "single",
+        "numberOfPlayers": 3,
+        "includeJokers": True,
+        "initHandSize": 5,
+        "maxHandSize": 15,
+        "difficulty": "easy",
+    }
+    settings.update(overrides)
+    return settings
+
+
+def test_draw_shares_untouched_objects_and_keeps_input_intact():
+    random.seed(3)
+    state = create_started_state(_settings())
+    snapshot = copy.deepcopy(state)
+
+    drawn = draw_card_status(state, 7)
+
+    assert state == snapshot
+    assert drawn["damage"] == 0
+    assert len(drawn["players"][0]["hand"]) == 12
+    assert drawn["players"][0]["hand"][5:] == state["deck"][:7]
+    assert drawn["players"][0]["hand"][0] is state["players"][0]["hand"][0]
+    assert drawn["players"][1] is state["players"][1]
+    assert drawn["players"][2] is state["players"][2]
+    assert drawn["settings"] is state["settings"]
+
+
+def test_draw_respects_max_hand_size():
+    random.seed(4)
+    state = create_started_state(_settings(maxHandSize=7))
+    drawn = draw_card_status({**state, "damage": 5}, 5)
+    assert len(drawn["players"][0]["hand"]) == 7
+    assert drawn["deck"] == state["deck"][2:]
+    assert drawn["damage"] == 0
+
+
+def test_draw_refills_from_discard_pile_once():
+    random.seed(5)
+    state = create_started_state(_settings())
+    discard = [*state["deck"][2:], *state["discardPile"]]
+    state = {**state, "deck": state["deck"][:2], "discardPile": discard}
+
+    drawn = draw_card_status(state, 5)
+
+    assert len(drawn["players"][0]["hand"]) == 10
+    assert drawn["discardPile"] == [discard[0]]
+    assert len(drawn["deck"]) == len(discard) - 1 - 3
+
+
+def test_seeded_games_replay_bit_for_bit():
+    def refill_twice(seed):
+        state = create_started_state(_settings(seed=seed))
+        for _ in range(2):
+            discard = [*state["deck"], *state["discardPile"]]
+            state = draw_card_status({**state, "deck": [], "discardPile": discard}, 1)
+        return state
+
+    first, second, other = refill_twice(42), refill_twice(42), refill_twice(43)
+    assert first == second
+    assert first["rng"]["counter"] == 3
+    assert [(c.get("suit"), c.get("rank")) for c in first["deck"]] != [
+        (c.get("suit"), c.get("rank")) for c in other["deck"]
+    ]
+
+
+def test_start_game_continues_game_rng():
+    waiting = initialize_game_state(_settings(seed=5))
+    started = transition_game_state(waiting, {"type": "START_GAME"})
+    assert started["rng"]["counter"] == waiting["rng"]["counter"] + 1
+    assert started == transition_game_state(waiting, {"type": "START_GAME"})
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from onecard_api.domain.card_utils import playable_indices
+from onecard_api.domain.engine import (
+    apply_special_effect_action,
+    create_started_state,
+    draw_card_action,
+    next_turn_action,
+    play_card_action,
+    play_turn,
+    step,
+)
+from onecard_api.domain.zobrist import compute_state_hash, state_hash
+
+
+def _settings(players: int, jokers: bool, seed: int, max_hand: int = 15):
+    return {
+        "mode": "single",
+        "numberOfPlayers": players,
+        "includeJokers": jokers,
+        "initHandSize": 5,
+        "maxHandSize": max_hand,
+        "difficulty": "easy",
+        "seed": seed,
+    }
+
+
+@pytest.mark.parametrize("fused", [False, True])
+@pytest.mark.parametrize("seed, players, jokers, max_hand", [(1, 2, False, 15), (2, 4, True, 7)])
+def test_incremental_hash_matches_full_recompute(fused, seed, players, jokers, max_hand):
+    chooser = random.Random(seed)
+    state = create_started_state(_settings(players, jokers, seed, max_hand))
+    assert state["zobrist"] == compute_state_hash(state)
+
+    for _ in range(300):
+        if state["gameStatus"] == "finished":
+            break
+        index = state["currentPlayerIndex"]
+        hand = state["players"][index]["hand"]
+        playable = playable_indices(hand, state["discardPile"][0], state["damage"])
+        if playable and chooser.random() < 0.8:
+            card_index = chooser.choice(playable)
+            actions = [
+                play_card_action(index, card_index),
+                apply_special_effect_action(hand[card_index]),
+                next_turn_action(),
+            ]
+        else:
+            actions = [draw_card_action(max(1, state["damage"])), next_turn_action()]
+
+        if fused:
+            state = play_turn(state, actions[0])["state"]
+            assert state["zobrist"] == compute_state_hash(state)
+            continue
+        for action in actions:
+            if state["gameStatus"] == "finished":
+                break
+            state = step(state, action)["state"]
+            assert state["zobrist"] == compute_state_hash(state)
+
+
+def test_public_hash_ignores_hidden_hand_contents():
+    state = create_started_state(_settings(3, True, 9))
+    players = state["players"]
+    # 상대 패 한 장을 덱의 카드와 바꿔도 공개 정보는 같다.
+    swapped_hand = [state["deck"][0], *players[1]["hand"][1:]]
+    other = {**state, "players": [players[0], {**players[1], "hand": swapped_hand}, players[2]]}
+    other.pop("zobrist")
+
+    original, changed = state_hash(state), state_hash(other)
+    assert changed.public == original.public
+    assert changed.observer(0) == original.observer(0)
+    assert changed.observer(1) != original.observer(1)
+    assert changed.full != original.full
+
+
+def test_hash_is_stable_for_the_same_seed():
+    first = create_started_state(_settings(2, True, 3))
+    second = create_started_state(_settings(2, True, 3))
+    assert first["zobrist"].full == second["zobrist"].full
+    assert 0 <= first["zobrist"].full < 2**64
@@ -0,0 +1,74 @@
+import random
+import time
+
+import pytest
+
+from onecard_api.domain.compact import to_compact
+from onecard_api.domain.engine import create_started_state, legal_actions
+from onecard_api.search.ismcts import DRAW, SearchConfig, determinize, legal_moves, search
+from onecard_api.services.game_ai_service import GameAiService
+from onecard_api.services.game_engine_service import GameEngineService
+from onecard_api.services.onnx_policy_service import OnnxPolicyService
+
+
+def _state(seed: int = 1, players: int = 3):
+    return create_started_state(
+        {
+            "mode": "single",
+            "numberOfPlayers": players,
+            "includeJokers": True,
+            "initHandSize": 5,
+            "maxHandSize": 15,
+            "difficulty": "hard",
+            "seed": seed,
+        }
+    )
+
+
+def test_determinize_keeps_observer_view_and_card_counts():
+    compact = to_compact(_state())
+    sample = determinize(compact, 0, random.Random(3))
+    assert sample.hands[0] == compact.hands[0]
+    assert sample.discard == compact.discard
+    assert [len(h) for h in sample.hands] == [len(h) for h in compact.hands]
+    assert len(sample.deck) == len(compact.deck)
+    hidden = sorted(compact.deck + compact.hands[1] + compact.hands[2])
+    assert sorted(sample.deck + sample.hands[1] + sample.hands[2]) == hidden
+
+
+def test_search_returns_a_legal_move_and_is_reproducible():
+    state = _state(seed=4)
+    config = SearchConfig(time_budget_ms=10_000, max_iterations=200, seed=7)
+    first = search(state, config)
+    second = search(state, config)
+    assert first.iterations == 200
+    assert first.action == second.action
+    assert first.visits == second.visits
+
+    legal = legal_actions(state)
+    if first.action["type"] == "PLAY_CARD":
+        assert legal.can_play(first.action["payload"]["cardIndex"])
+    moves = legal_moves(to_compact(state))
+    assert set(first.visits) <= set(moves)
+    assert (moves == [DRAW]) == (not legal.play_indices)
+
+
+def test_search_respects_time_budget():
+    started = time.perf_counter()
+    result = search(_state(seed=2), SearchConfig(time_budget_ms=30))
+    assert time.perf_counter() - started < 0.5
+    assert result.iterations >= 1
+
+
+@pytest.mark.asyncio
+async def test_hard_difficulty_uses_search():
+    service = GameAiService(
+        GameEngineService(), OnnxPolicyService(), SearchConfig(time_budget_ms=20, seed=1)
+    )
+    state = _state(seed=5, players=2)
+    state = {**state, "currentPlayerIndex": 1}
+    result = await service.play_while_ai_turn(state)
+    assert result is not None
+    assert result["info"]["source"] == "ismcts"
+    assert result["info"]["iterations"] >= 1
+    assert result["info"]["aiActions"][0]["type"] in ("PLAY_CARD", "DRAW_CARD")
@@ -0,0 +1,141 @@
+import time
+
+import numpy as np
+import pytest
+
+from onecard_api.domain.compact import PLAYING, from_compact, to_compact
+from onecard_api.domain.engine import create_started_state, legal_actions
+from onecard_api.inference.observation_encoder import build_observation_spec, encode_observation
+from onecard_api.search.ismcts import apply_move, legal_moves
+from onecard_api.search.puct import CompactObservationEncoder, PuctConfig, search
+from onecard_api.services.game_ai_service import GameAiService
+from onecard_api.services.game_engine_service import GameEngineService
+from onecard_api.services.onnx_policy_service import LoadedModel, OnnxMetadata, OnnxPolicyService
+
+
+class FakeSession:
+    """Prefers low hand indices and values every state as even; records batch sizes."""
+
+    def __init__(self, action_dim: int, with_value: bool = True) -> None:
+        self.action_dim = action_dim
+        self.with_value = with_value
+        self.batches: list[int] = []
+
+    def run(self, output_names, input_feed):
+        observation = input_feed["observation"]
+        self.batches.append(observation.shape[0])
+        logits = np.tile(-np.arange(self.action_dim, dtype=np.float32), (observation.shape[0], 1))
+        if not self.with_value:
+            return [logits]
+        return [logits, np.zeros((observation.shape[0], 1), dtype=np.float32)]
+
+
+def _settings(players: int = 3):
+    return {
+        "mode": "single",
+        "numberOfPlayers": players,
+        "includeJokers": True,
+        "initHandSize": 5,
+        "maxHandSize": 15,
+        "difficulty": "medium",
+    }
+
+
+def _state(seed: int = 1, players: int = 3):
+    return create_started_state({**_settings(players), "seed": seed})
+
+
+def _rotated(state, compact):
+    total = len(compact.hands)
+    current = compact.current
+    step = compact.direction
+    players = [state["players"][(current + i * step) % total] for i in range(total)]
+    return {**state, "players": players, "currentPlayerIndex": 0}
+
+
+def test_compact_encoder_matches_observation_encoder():
+    spec = build_observation_spec(_settings())
+    encoder = CompactObservationEncoder(spec)
+    state = _state(seed=3)
+    compact = to_compact(state)
+    for _ in range(30):
+        if compact.status != PLAYING:
+            break
+        expected = encode_observation(_rotated(from_compact(compact), compact), spec)
+        np.testing.assert_allclose(encoder.encode(compact), expected, rtol=1e-6)
+        compact = apply_move(compact, legal_moves(compact)[0])
+
+
+def test_search_batches_leaves_within_node_budget():
+    state = _state(seed=4)
+    spec = build_observation_spec(state["settings"])
+    session = FakeSession(spec.maxHandSize + 1)
+    config = PuctConfig(node_budget=33, batch_size=8, time_budget_ms=10_000, seed=7)
+
+    result = search(state, session, spec, config)
+
+    assert result.nodes == 33
+    assert session.batches[0] == 1  # 루트만 먼저 평가
+    assert max(session.batches) <= 8
+    assert result.evaluations == len(session.batches) <= 1 + 4
+    assert sum(result.visits.values()) == 32
+    if result.action["type"] == "PLAY_CARD":
+        assert legal_actions(state).can_play(result.action["payload"]["cardIndex"])
+
+    again = search(state, FakeSession(spec.maxHandSize + 1), spec, config)
+    assert again.action == result.action
+    assert again.visits == result.visits
+
+
+def test_search_without_value_head_uses_rollouts():
+    state = _state(seed=6)
+    spec = build_observation_spec(state["settings"])
+    result = search(
+        state, FakeSession(spec.maxHandSize + 1, with_value=False), spec, PuctConfig(node_budget=16, seed=1)
+    )
+    assert result.nodes == 16
+
+
+def test_search_respects_time_budget_and_plays_the_prior_when_out_of_time():
+    state = _state(seed=2)
+    spec = build_observation_spec(state["settings"])
+    started = time.perf_counter()
+    result = search(
+        state,
+        FakeSession(spec.maxHandSize + 1),
+        spec,
+        PuctConfig(node_budget=10**9, time_budget_ms=20),
+    )
+    assert time.perf_counter() - started < 0.5
+
+    expired = search(state, FakeSession(spec.maxHandSize + 1), spec, deadline=0.0)
+    assert expired.evaluations == 1
+    legal = legal_actions(state)
+    if legal.play_indices:
+        # 가짜 정책은 낮은 인덱스를 선호하므로 예산이 없으면 첫 합법 카드를 낸다.
+        assert expired.action["payload"]["cardIndex"] == legal.play_indices[0]
+    assert result.nodes >= 1
+
+
+@pytest.mark.asyncio
+async def test_medium_difficulty_uses_puct_when_enabled():
+    settings = _settings(players=2)
+    spec = build_observation_spec(settings)
+    onnx = OnnxPolicyService()
+    session = FakeSession(spec.maxHandSize + 1)
+    onnx._cache[onnx._build_suffix(settings)] = LoadedModel(
+        session=session,  # type: ignore[arg-type]
+        metadata=OnnxMetadata(spec.vectorSize, spec.maxHandSize + 1, settings),
+        spec=spec,
+    )
+    service = GameAiService(
+        GameEngineService(), onnx, puct_config=PuctConfig(enabled=True, node_budget=17, seed=1)
+    )
+    state = {**_state(seed=5, players=2), "currentPlayerIndex": 1}
+
+    result = await service.play_while_ai_turn(state)
+
+    assert result is not None
+    assert result["info"]["source"] == "puct"
+    assert result["info"]["nodes"] == 17
+    assert result["info"]["evaluations"] == len(session.batches) == 3
@@ -0,0 +1,172 @@
+import asyncio
+import functools
+import statistics
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from onecard_api.api.disconnect import CLIENT_CLOSED_REQUEST, cancel_on_disconnect
+from onecard_api.container import ServiceContainer
+from onecard_api.domain.engine import create_started_state
+from onecard_api.main import create_app
+from onecard_api.search.ismcts import SearchConfig, search
+from onecard_api.services.ai_executor import (
+    AiExecutor,
+    ExecutorConfig,
+    ExecutorSaturatedError,
+    default_executor,
+)
+from onecard_api.services.game_ai_service import GameAiService
+from onecard_api.services.game_engine_service import GameEngineService
+from onecard_api.services.onnx_policy_service import OnnxPolicyService
+
+
+def _state(seed: int = 1):
+    return create_started_state(
+        {
+            "mode": "single",
+            "numberOfPlayers": 2,
+            "includeJokers": False,
+            "initHandSize": 5,
+            "maxHandSize": 15,
+            "difficulty": "hard",
+            "seed": seed,
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_rejects_jobs_beyond_max_pending():
+    executor = AiExecutor(ExecutorConfig(inference_threads=1, max_pending=1))
+    release = threading.Event()
+    running = asyncio.ensure_future(executor.run_inference(release.wait, 5))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(ExecutorSaturatedError) as exc_info:
+        await executor.run_inference(time.sleep, 0)
+    assert exc_info.value.status_code == 503
+
+    release.set()
+    assert await running is True
+    await asyncio.sleep(0.01)
+    assert executor.stats() == {
+        "pending": 0,
+        "maxPending": 1,
+        "submitted": 1,
+        "completed": 1,
+        "cancelled": 0,
+        "rejected": 1,
+    }
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelling_a_queued_job_drops_it():
+    executor = AiExecutor(ExecutorConfig(inference_threads=1, max_pending=4))
+    release = threading.Event()
+    calls: list[str] = []
+    blocker = asyncio.ensure_future(executor.run_inference(release.wait, 5))
+    queued = asyncio.ensure_future(executor.run_inference(calls.append, "queued"))
+    await asyncio.sleep(0.01)
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    release.set()
+    await blocker
+    await asyncio.sleep(0.01)
+
+    assert calls == []
+    assert executor.stats()["cancelled"] == 1
+    assert executor.stats()["pending"] == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_search_runs_in_worker_process():
+    executor = AiExecutor(ExecutorConfig(search_processes=1))
+    state = _state(seed=3)
+    config = SearchConfig(time_budget_ms=60_000, max_iterations=50, seed=1)
+    try:
+        result = await executor.run_search(functools.partial(search, state, config))
+    finally:
+        executor.shutdown(wait=True)
+    assert result.action == search(state, config).action
+
+
+class _DisconnectingRequest:
+    async def receive(self):
+        await asyncio.sleep(0.02)
+        return {"type": "http.disconnect"}
+
+
+@pytest.mark.asyncio
+async def test_cancel_on_disconnect_cancels_the_work():
+    cancelled = asyncio.Event()
+
+    async def slow_turn():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(HTTPException) as exc_info:
+        await cancel_on_disconnect(_DisconnectingRequest(), slow_turn())  # type: ignore[arg-type]
+    assert exc_info.value.status_code == CLIENT_CLOSED_REQUEST
+    assert cancelled.is_set()
+
+
+async def _timed_listing(client) -> float:
+    started = time.perf_counter()
+    response = await client.get("/games")
+    assert response.status_code == 200
+    return time.perf_counter() - started
+
+
+@pytest.mark.asyncio
+async def test_listing_latency_stays_flat_while_an_ai_turn_searches(monkeypatch):
+    monkeypatch.setenv("ONECARD_HARD_BUDGET_MS", "600")
+    container = ServiceContainer()
+    assert container.ai_executor.config.search_processes >= 1
+    store = container.game_state_store
+    app = create_app(container)
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        for _ in range(20):
+            await client.post("/games", json={"settings": {"difficulty": "hard"}})
+        game_id = store.create({"difficulty": "hard"})["id"]
+        await client.patch(f"/games/{game_id}", json={"action": {"type": "START_GAME"}})
+
+        def hand_turn_to_ai():
+            record = store.find(game_id)
+            store.update_state(game_id, {**record["state"], "currentPlayerIndex": 1})
+
+        # 첫 탐색은 워커 프로세스를 띄우므로 기준 측정 전에 한 번 둔다.
+        hand_turn_to_ai()
+        assert (await client.post(f"/games/{game_id}/ai-turns")).status_code == 200
+        idle = [await _timed_listing(client) for _ in range(30)]
+
+        hand_turn_to_ai()
+        ai_turn = asyncio.ensure_future(client.post(f"/games/{game_id}/ai-turns"))
+        while container.ai_executor.stats()["pending"] == 0:
+            await asyncio.sleep(0.001)
+        busy = []
+        while not ai_turn.done():
+            busy.append(await _timed_listing(client))
+        assert (await ai_turn).status_code == 200
+    container.shutdown()
+
+    # 같은 스레드 풀에서 탐색하면 중앙값이 2~3배로 늘어난다. 절대 시간이 아니라 유휴 기준과 비교한다.
+    assert len(busy) >= 10
+    assert statistics.median(busy) < 1.5 * statistics.median(idle) + 0.002
+
+
+def test_services_built_without_an_executor_share_one_bound():
+    ai = GameAiService(GameEngineService(), OnnxPolicyService())
+    other = GameAiService(GameEngineService(), OnnxPolicyService())
+    assert ai.executor is other.executor is default_executor()
+    assert ai.onnx_policy_service._executor is default_executor()
+    assert ServiceContainer().ai_executor is default_executor()
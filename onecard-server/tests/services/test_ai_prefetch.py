@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from onecard_api.services.ai_prefetch import AiMovePrefetcher, PrefetchConfig
+from onecard_api.services.game_ai_service import GameAiService
+from onecard_api.services.game_engine_service import GameEngineService
+from onecard_api.services.game_service import GameService
+from onecard_api.services.game_state_store import GameStateStore, StoreLimits
+from onecard_api.services.onnx_policy_service import OnnxPolicyService
+
+
+class CountingAiService(GameAiService):
+    def __init__(self, engine: GameEngineService) -> None:
+        super().__init__(engine, OnnxPolicyService())
+        self.computed = 0
+
+    async def play_while_ai_turn(self, state, context=None):
+        self.computed += 1
+        return await super().play_while_ai_turn(state, context)
+
+
+def _service(enabled=True):
+    engine = GameEngineService()
+    store = GameStateStore(
+        game_engine=engine, limits=StoreLimits(idle_ttl_seconds=None, finished_ttl_seconds=None)
+    )
+    ai = CountingAiService(engine)
+    prefetcher = AiMovePrefetcher(ai, PrefetchConfig(enabled=enabled))
+    return GameService(store, engine, ai, ai_prefetcher=prefetcher), store, ai, prefetcher
+
+
+async def _hand_turn_to_ai(service, store):
+    game_id = store.create({"difficulty": "easy"})["id"]
+    await service.apply_action(game_id, {"type": "START_GAME"})
+    await service.apply_action(game_id, {"type": "DRAW_CARD", "amount": 1})
+    return game_id, await service.apply_action(game_id, {"type": "NEXT_TURN"})
+
+
+@pytest.mark.asyncio
+async def test_human_move_prefetches_the_ai_turn():
+    service, store, ai, prefetcher = _service()
+    game_id, handed = await _hand_turn_to_ai(service, store)
+    expected = await GameAiService(GameEngineService(), OnnxPolicyService()).play_while_ai_turn(
+        store.find(game_id)["state"]
+    )
+    await asyncio.sleep(0)
+    assert prefetcher.metrics()["entries"] == 1
+
+    played = await service.execute_ai_turn(game_id)
+
+    assert ai.computed == 1
+    assert played["version"] == handed["version"] + 1
+    assert played["info"]["aiActions"] == expected["info"]["aiActions"]
+    metrics = prefetcher.metrics()
+    assert (metrics["hits"], metrics["misses"]) == (1, 0)
+    # AI 뒤에 다시 AI 차례가 오는 경우(점프 등)에만 다음 수를 또 계산해 둔다.
+    after = store.find(game_id)["state"]
+    assert metrics["entries"] == int(after["players"][after["currentPlayerIndex"]]["isAI"])
+
+
+@pytest.mark.asyncio
+async def test_a_write_in_between_invalidates_the_prefetch():
+    service, store, ai, prefetcher = _service()
+    game_id, _ = await _hand_turn_to_ai(service, store)
+    await asyncio.sleep(0)
+    assert ai.computed == 1
+    record = store.find(game_id)
+    store.update_state(game_id, {**record["state"], "damage": 2})
+
+    stale = store.find(game_id)
+    await service.execute_ai_turn(game_id)
+
+    # 미리 계산한 수는 버리고 바뀐 상태로 다시 계산한다.
+    assert ai.computed == 2
+    assert store.find(game_id)["version"] == stale["version"] + 1
+    metrics = prefetcher.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["invalidated"]) == (0, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_disabled_prefetcher_computes_on_demand():
+    service, store, ai, prefetcher = _service(enabled=False)
+    game_id, _ = await _hand_turn_to_ai(service, store)
+    await service.execute_ai_turn(game_id)
+
+    assert ai.computed == 1
+    assert prefetcher.metrics()["scheduled"] == 0
+    assert prefetcher.metrics()["misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_prefetched_moves_are_logged_only_when_applied(caplog):
+    service, store, ai, prefetcher = _service()
+    caplog.set_level("INFO", logger="onecard_api.game_ai")
+    game_id, _ = await _hand_turn_to_ai(service, store)
+    await asyncio.sleep(0.01)
+    assert ai.computed == 1
+    assert not [line for line in caplog.messages if "ai-action" in line]
+
+    played = await service.execute_ai_turn(game_id)
+
+    logged = [line for line in caplog.messages if "ai-action" in line]
+    assert len(logged) == len(played["info"]["aiActions"])
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from onecard_api.services.game_locks import GameLocks
+
+
+@pytest.mark.asyncio
+async def test_serializes_the_same_game_only():
+    locks = GameLocks()
+    events: list[str] = []
+
+    async def mutate(game_id: str, name: str) -> None:
+        async with locks.hold(game_id):
+            events.append(f"{name}:start")
+            await asyncio.sleep(0.02)
+            events.append(f"{name}:end")
+
+    await asyncio.gather(mutate("a", "a1"), mutate("a", "a2"), mutate("b", "b1"))
+
+    assert events.index("a1:end") < events.index("a2:start")
+    assert events.index("b1:start") < events.index("a1:end")
+    assert len(locks) == 0
+
+
+@pytest.mark.asyncio
+async def test_lock_is_released_when_the_holder_is_cancelled():
+    locks = GameLocks()
+
+    async def hold_forever() -> None:
+        async with locks.hold("a"):
+            await asyncio.sleep(10)
+
+    holder = asyncio.ensure_future(hold_forever())
+    await asyncio.sleep(0.01)
+    holder.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await holder
+
+    async with locks.hold("a"):
+        pass
+    assert len(locks) == 0
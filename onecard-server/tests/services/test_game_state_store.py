@@ -0,0 +1,244 @@
+import asyncio
+import threading
+
+import pytest
+
+from onecard_api.services.game_engine_service import GameEngineService
+from onecard_api.services.game_state_store import (
+    GameStateStore,
+    PackedSession,
+    StoreLimits,
+    VersionConflictError,
+    estimate_record_bytes,
+)
+from onecard_api.services.session_index import SessionQuery
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _store(**limits):
+    clock = FakeClock()
+    defaults = {"idle_ttl_seconds": None, "finished_ttl_seconds": None}
+    return GameStateStore(limits=StoreLimits(**{**defaults, **limits}), clock=clock), clock
+
+
+def _finish(store, record):
+    state = {**record["state"], "gameStatus": "finished"}
+    return store.update_state(record["id"], state)
+
+
+def test_idle_sessions_expire_and_reads_keep_them_alive():
+    store, clock = _store(idle_ttl_seconds=60)
+    stale = store.create()
+    active = store.create()
+    clock.now = 50
+    store.find(active["id"])
+    clock.now = 70
+
+    assert store.reap() == 1
+    assert store.find(stale["id"]) is None
+    assert store.find(active["id"]) is not None
+    assert store.metrics()["evictions"]["idle"] == 1
+
+
+def test_finished_games_use_the_shorter_timer():
+    store, clock = _store(idle_ttl_seconds=600, finished_ttl_seconds=30)
+    finished = _finish(store, store.create())
+    playing = store.create()
+    clock.now = 31
+    store.find(finished["id"])  # 읽어도 종료 타이머는 연장되지 않는다.
+
+    assert store.reap() == 1
+    assert store.find(finished["id"]) is None
+    assert store.find(playing["id"]) is not None
+    assert store.metrics()["evictions"]["finished"] == 1
+
+
+def test_max_sessions_evicts_least_recently_used():
+    store, _ = _store(max_sessions=2)
+    first = store.create()
+    second = store.create()
+    store.find(first["id"])
+    third = store.create()
+
+    assert store.find(second["id"]) is None
+    assert {r["id"] for r in store.list()} == {first["id"], third["id"]}
+    assert store.metrics()["evictions"]["capacity"] == 1
+
+
+def test_memory_cap_evicts_until_under_the_cap():
+    probe, _ = _store()
+    one = estimate_record_bytes(probe.create())
+    store, _ = _store(max_memory_bytes=int(one * 3.5))
+    records = [store.create() for _ in range(5)]
+
+    metrics = store.metrics()
+    assert metrics["sessions"] == 3
+    assert metrics["approxBytes"] <= one * 3.5
+    assert metrics["evictions"]["memory"] == 2
+    assert store.find(records[-1]["id"]) is not None
+
+
+def test_size_accounting_follows_updates_and_deletes():
+    store, _ = _store()
+    engine = GameEngineService()
+    record = store.create()
+    waiting = store.metrics()["approxBytes"]
+    started = engine.create_started_state(record["settings"])
+    store.update_state(record["id"], started)
+    assert store.metrics()["approxBytes"] == estimate_record_bytes(store.find(record["id"]))
+    assert store.metrics()["approxBytes"] != waiting
+
+    store.delete(record["id"])
+    assert store.metrics() == {
+        "sessions": 0,
+        "finishedSessions": 0,
+        "packedSessions": 0,
+        "approxBytes": 0,
+        "packs": 0,
+        "unpacks": 0,
+        "evictions": {"idle": 0, "finished": 0, "capacity": 0, "memory": 0},
+    }
+
+
+def test_listing_index_follows_writes_and_expiry():
+    store, clock = _store(idle_ttl_seconds=60, max_sessions=2)
+    first = store.create()
+    second = store.create()
+    third = store.create()  # 용량 초과로 first 가 축출된다
+    clock.now = 30
+    _finish(store, second)
+
+    items, _ = store.page(SessionQuery())
+    assert [item.id for item in items] == [second["id"], third["id"]]
+    assert items[0].game_status == "finished"
+    assert items[0].updated_at > items[1].updated_at
+    assert store.find(first["id"]) is None
+
+    clock.now = 80
+    store.reap()
+    assert [item.id for item in store.page(SessionQuery())[0]] == [second["id"]]
+
+
+def test_idle_sessions_are_packed_and_unpacked_on_read():
+    store, clock = _store(pack_idle_after_seconds=60, pack_finished_after_seconds=None)
+    engine = GameEngineService()
+    idle = store.create()
+    started = store.update_state(idle["id"], engine.create_started_state(idle["settings"]))
+    clock.now = 30
+    active = store.create()
+    resident = store.metrics()["approxBytes"]
+    clock.now = 61
+
+    store.reap()
+    metrics = store.metrics()
+    assert metrics["packedSessions"] == 1
+    assert metrics["approxBytes"] < resident
+
+    found = store.find(started["id"])
+    assert found == started
+    assert found["state"]["deck"][0] is started["state"]["deck"][0]
+    assert store.find(active["id"]) is active
+    assert store.metrics()["packedSessions"] == 0
+    assert store.metrics()["unpacks"] == 1
+
+
+def test_finished_games_are_packed_sooner_and_keep_their_timer():
+    store, clock = _store(finished_ttl_seconds=100, pack_idle_after_seconds=None, pack_finished_after_seconds=10)
+    finished = _finish(store, store.create())
+    playing = store.create()
+    clock.now = 11
+    store.reap()
+    assert store.metrics()["packedSessions"] == 1
+    assert {record["id"] for record in store.list()} == {finished["id"], playing["id"]}
+    assert store.metrics()["packedSessions"] == 1  # 목록 조회는 다시 풀어 두지 않는다.
+
+    clock.now = 101
+    assert store.reap() == 1
+    assert store.find(finished["id"]) is None
+    assert store.metrics()["packedSessions"] == 0
+
+
+def test_packing_is_capped_per_reap():
+    store, clock = _store(pack_idle_after_seconds=10, pack_finished_after_seconds=None, max_packs_per_reap=2)
+    for _ in range(5):
+        store.create()
+    clock.now = 11
+    store.reap()
+    assert store.metrics()["packedSessions"] == 2
+    store.reap()
+    store.reap()
+    assert store.metrics()["packedSessions"] == 5
+
+
+def test_sessions_read_while_packing_stay_unpacked(monkeypatch):
+    store, clock = _store(pack_idle_after_seconds=10, pack_finished_after_seconds=None)
+    record = store.create()
+    clock.now = 11
+    pack = PackedSession.pack
+
+    def read_meanwhile(entry):
+        # 잠금 밖에서 압축하는 동안 요청이 같은 세션을 읽는다.
+        clock.now = 12
+        assert store.find(record["id"]) is record
+        return pack(entry)
+
+    monkeypatch.setattr(PackedSession, "pack", staticmethod(read_meanwhile))
+    store.reap()
+    assert store.metrics()["packedSessions"] == 0
+    assert store.find(record["id"]) is record
+
+
+@pytest.mark.asyncio
+async def test_reaper_runs_off_the_event_loop(monkeypatch):
+    store, _ = _store(reap_interval_seconds=0)
+    started, release = threading.Event(), threading.Event()
+    released: list[bool] = []
+
+    def slow_reap():
+        started.set()
+        released.append(release.wait(5))
+        return 0
+
+    monkeypatch.setattr(store, "reap", slow_reap)
+    reaper = asyncio.create_task(store.run_reaper())
+    while not started.is_set():
+        await asyncio.sleep(0.001)
+    # 리퍼가 루프에서 돌았다면 여기까지 오지 못한다.
+    release.set()
+    while not released:
+        await asyncio.sleep(0.001)
+    reaper.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await reaper
+    assert released[0] is True
+
+
+def test_versions_increase_and_guard_compare_and_set():
+    store, _ = _store()
+    record = store.create()
+    assert record["version"] == 1
+    updated = store.update_state(record["id"], record["state"], expected_version=1)
+    assert updated["version"] == 2
+
+    with pytest.raises(VersionConflictError) as exc_info:
+        store.update_state(record["id"], record["state"], expected_version=1)
+    assert (exc_info.value.expected, exc_info.value.current) == (1, 2)
+    assert store.find(record["id"]) is updated
+
+
+@pytest.mark.asyncio
+async def test_reaper_task_runs_periodically():
+    store, clock = _store(idle_ttl_seconds=1, reap_interval_seconds=0.01)
+    store.create()
+    clock.now = 5
+    reaper = asyncio.create_task(store.run_reaper())
+    await asyncio.sleep(0.05)
+    reaper.cancel()
+    assert store.metrics()["sessions"] == 0
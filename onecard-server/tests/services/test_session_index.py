@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from onecard_api.services.session_index import SessionIndex, SessionQuery, SessionSummary, decode_cursor
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _summary(game_id, seconds, status="waiting", players=4, version=1):
+    return SessionSummary(
+        id=game_id,
+        game_status=status,
+        current_player_index=0,
+        settings={"mode": "single", "numberOfPlayers": players, "includeJokers": True, "difficulty": "medium"},
+        created_at=START,
+        updated_at=START + timedelta(seconds=seconds),
+        version=version,
+    )
+
+
+def _ids(items):
+    return [item.id for item in items]
+
+
+def test_pages_walk_every_game_once_newest_first():
+    index = SessionIndex()
+    for number in range(7):
+        index.put(_summary(f"g{number}", number))
+
+    seen, cursor = [], None
+    while True:
+        items, cursor = index.page(SessionQuery(limit=3, cursor=cursor))
+        seen.extend(_ids(items))
+        if cursor is None:
+            break
+    assert seen == [f"g{number}" for number in reversed(range(7))]
+
+    items, cursor = index.page(SessionQuery(order="asc", limit=4))
+    assert _ids(items) == ["g0", "g1", "g2", "g3"]
+    assert _ids(index.page(SessionQuery(order="asc", cursor=cursor))[0]) == ["g4", "g5", "g6"]
+
+
+def test_filters_by_status_settings_and_update_time():
+    index = SessionIndex()
+    index.put(_summary("a", 1, players=2))
+    index.put(_summary("b", 2, status="playing"))
+    index.put(_summary("c", 3, status="playing", players=2))
+    index.put(_summary("d", 4, players=2))
+
+    assert _ids(index.page(SessionQuery(game_status="playing"))[0]) == ["c", "b"]
+    assert _ids(index.page(SessionQuery(settings={"numberOfPlayers": 2}))[0]) == ["d", "c", "a"]
+    both = SessionQuery(game_status="playing", settings={"numberOfPlayers": 2, "includeJokers": True})
+    assert _ids(index.page(both)[0]) == ["c"]
+    since = START + timedelta(seconds=2)
+    assert _ids(index.page(SessionQuery(updated_since=since))[0]) == ["d", "c", "b"]
+    assert _ids(index.page(SessionQuery(updated_since=since, order="asc"))[0]) == ["b", "c", "d"]
+
+
+def test_updates_move_a_game_and_removed_games_disappear():
+    index = SessionIndex()
+    for number in range(3):
+        index.put(_summary(f"g{number}", number))
+    index.put(_summary("g0", 10, status="playing", version=2))
+    index.remove("g1")
+
+    assert _ids(index.page(SessionQuery())[0]) == ["g0", "g2"]
+    assert _ids(index.page(SessionQuery(game_status="waiting"))[0]) == ["g2"]
+    assert index.get("g0").version == 2
+    assert len(index) == 2
+
+
+def test_stale_keys_are_compacted():
+    index = SessionIndex()
+    for seconds in range(1_000):
+        index.put(_summary("hot", seconds))
+    assert len(index._logs[("all", None)]) < 200
+    assert _ids(index.page(SessionQuery())[0]) == ["hot"]
+
+
+def test_cursor_round_trip_and_rejection():
+    index = SessionIndex()
+    index.put(_summary("a", 1))
+    index.put(_summary("b", 2))
+    items, cursor = index.page(SessionQuery(limit=1))
+    assert decode_cursor(cursor) == items[0].sort_key
+    with pytest.raises(ValueError):
+        index.page(SessionQuery(cursor="not a cursor"))
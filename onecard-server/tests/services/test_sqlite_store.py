@@ -0,0 +1,365 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from onecard_api.domain.card_codes import CANONICAL_CARDS
+from onecard_api.domain.engine import draw_card_action, play_card_action, start_game_action
+from onecard_api.domain.zobrist import with_state_hash
+from onecard_api.services.game_engine_service import GameEngineService
+from onecard_api.services.game_state_store import (
+    FlushPolicy,
+    GameStateStore,
+    StoreLimits,
+    VersionConflictError,
+)
+from onecard_api.services.session_index import SessionQuery
+from onecard_api.services.sqlite_store import SqliteGameStateBackend
+
+NO_TTL = StoreLimits(idle_ttl_seconds=None, finished_ttl_seconds=None)
+
+
+class RecordingBackend(SqliteGameStateBackend):
+    def __init__(self, path) -> None:
+        super().__init__(path)
+        self.batches: list[tuple[int, int]] = []
+
+    def write_batch(self, upserts, deletes, journals) -> dict[str, int]:
+        self.batches.append((len(upserts), len(deletes)))
+        return super().write_batch(upserts, deletes, journals)
+
+
+def _store(path, limits=NO_TTL, backend=None):
+    # 긴 주기로 두어 테스트에서 flush 시점을 직접 정한다.
+    engine = GameEngineService()
+    backend = backend or SqliteGameStateBackend(path)
+    policy = FlushPolicy(interval_seconds=60, max_batch=10_000)
+    return GameStateStore(game_engine=engine, limits=limits, backend=backend, flush_policy=policy), engine
+
+
+def _start(store, engine, record):
+    started = engine.step(record["state"], start_game_action())["state"]
+    return store.update_state(record["id"], started)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "sessions.sqlite3"
+
+
+def test_sessions_survive_a_restart(db_path):
+    store, engine = _store(db_path)
+    record = _start(store, engine, store.create({"numberOfPlayers": 3, "seed": 5}))
+    store.close()
+
+    reopened, _ = _store(db_path)
+    loaded = reopened.find(record["id"])
+    assert loaded["state"] == record["state"]
+    assert loaded["settings"] == record["settings"]
+    assert loaded["created_at"] == record["created_at"]
+    card = loaded["state"]["deck"][0]
+    assert card is CANONICAL_CARDS[card.code]
+    assert loaded["state"]["zobrist"] == record["state"]["zobrist"]
+    reopened.close()
+
+
+def test_updates_are_coalesced_into_one_batch(db_path):
+    backend = RecordingBackend(db_path)
+    store, engine = _store(db_path, backend=backend)
+    records = [store.create() for _ in range(5)]
+    for record in records:
+        for _ in range(3):
+            store.update_state(record["id"], {**record["state"], "damage": 1})
+    store.delete(records[0]["id"])
+
+    assert backend.count() == 0
+    assert store.flush() == 5
+    assert backend.batches == [(4, 1)]
+    assert backend.count() == 4
+    assert store.metrics()["backend"]["pendingWrites"] == 0
+    store.close()
+
+
+def test_hot_reads_do_not_touch_the_backend(db_path):
+    store, _ = _store(db_path)
+    record = store.create()
+    store.flush()
+    for _ in range(100):
+        assert store.find(record["id"]) is record
+    assert store.metrics()["backend"]["loads"] == 0
+    store.close()
+
+
+def test_capacity_eviction_only_drops_the_cached_copy(db_path):
+    store, _ = _store(db_path, StoreLimits(idle_ttl_seconds=None, finished_ttl_seconds=None, max_sessions=1))
+    first = store.create()
+    second = store.create()  # first 는 아직 flush 전이지만 쓰기 대기열에 남아 있다.
+
+    assert store.find(first["id"])["id"] == first["id"]
+    store.flush()
+    assert store.find(second["id"])["id"] == second["id"]
+    assert store.metrics()["backend"]["loads"] == 1
+    assert {record["id"] for record in store.list()} == {first["id"], second["id"]}
+    store.close()
+
+
+def test_delete_reaches_the_backend(db_path):
+    store, _ = _store(db_path)
+    record = store.create()
+    store.flush()
+    store.close()
+
+    reopened, _ = _store(db_path)
+    assert reopened.delete(record["id"]) is True
+    assert reopened.find(record["id"]) is None
+    assert reopened.delete(record["id"]) is False
+    reopened.close()
+    assert SqliteGameStateBackend(db_path).count() == 0
+
+
+def test_reap_expires_uncached_games_by_last_write(db_path):
+    backend = SqliteGameStateBackend(db_path)
+    store, _ = _store(db_path, StoreLimits(idle_ttl_seconds=3600, finished_ttl_seconds=None), backend)
+    record = store.create()
+    old = datetime.now(timezone.utc) - timedelta(hours=2)
+    backend.write_batch([{**record, "id": "stale", "updated_at": old}], [], {})
+
+    assert store.reap() == 1
+    store.flush()
+    assert backend.load("stale") is None
+    assert store.find(record["id"]) is not None
+    store.close()
+
+
+def test_failed_flush_keeps_the_changes(db_path, monkeypatch):
+    backend = SqliteGameStateBackend(db_path)
+    store, _ = _store(db_path, backend=backend)
+    record = store.create()
+
+    def disk_full(upserts, deletes, journals):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(backend, "write_batch", disk_full)
+        with pytest.raises(OSError):
+            store.flush()
+    assert store.metrics()["backend"]["pendingWrites"] == 1
+    assert store.metrics()["backend"]["flushErrors"] == 1
+
+    assert store.flush() == 1
+    assert backend.load(record["id"])["id"] == record["id"]
+    store.close()
+
+
+def test_background_writer_flushes_on_its_own(db_path):
+    backend = SqliteGameStateBackend(db_path)
+    store = GameStateStore(limits=NO_TTL, backend=backend, flush_policy=FlushPolicy(interval_seconds=0.01))
+    store.create()
+    deadline = time.monotonic() + 2
+    while backend.count() == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert backend.count() == 1
+    store.close()
+
+
+def _play_game(store, engine, game_id, turns):
+    # GameService 처럼 액션과 함께 저장하고, 매 단계의 상태를 기록해 둔다.
+    states = [store.find(game_id)["state"]]
+    action = start_game_action()
+    state = engine.step(states[0], action)["state"]
+    store.update_state(game_id, state, [action])
+    states.append(state)
+    return states + _play_turns(store, engine, game_id, turns)
+
+
+def _play_turns(store, engine, game_id, turns):
+    state = store.find(game_id)["state"]
+    states = []
+    for _ in range(turns):
+        if state["gameStatus"] != "playing":
+            break
+        legal = engine.legal_actions(state)
+        if legal.play_indices:
+            action = play_card_action(legal.player_index, legal.play_indices[0])
+        else:
+            action = draw_card_action(legal.draw_amount)
+        result = engine.play_turn(state, action)
+        state = result["state"]
+        store.update_state(game_id, state, result["info"]["actions"])
+        states.extend([None] * (len(result["info"]["actions"]) - 1) + [state])
+    return states
+
+
+def test_games_are_rebuilt_from_snapshots_and_the_action_log(db_path):
+    backend = SqliteGameStateBackend(db_path, snapshot_every=4)
+    store, engine = _store(db_path, backend=backend)
+    record = store.create({"numberOfPlayers": 3})
+    states = _play_game(store, engine, record["id"], turns=25)
+    store.close()
+
+    reopened = SqliteGameStateBackend(db_path, snapshot_every=4)
+    assert reopened.load(record["id"])["state"] == states[-1]
+    history = reopened.history(record["id"])
+    assert [seq for seq, _ in history] == list(range(1, len(states)))
+    assert history[0][1] == start_game_action()
+    for seq, state in enumerate(states):
+        if state is not None:
+            assert reopened.state_at(record["id"], seq) == state
+    assert reopened.state_at(record["id"], len(states)) is None
+    snapshots = reopened._connection().execute("SELECT COUNT(*) FROM game_snapshots").fetchone()[0]
+    assert snapshots == 2  # 생성 시점 + 최신
+
+
+def test_a_state_written_without_actions_restarts_the_log(db_path):
+    store, engine = _store(db_path)
+    record = store.create()
+    _play_game(store, engine, record["id"], turns=2)
+    store.flush()
+    replaced = with_state_hash({**store.find(record["id"])["state"], "damage": 3})
+    store.update_state(record["id"], replaced)
+    store.close()
+
+    reopened, _ = _store(db_path)
+    assert reopened.find(record["id"])["state"] == replaced
+    assert reopened.history(record["id"])[-1][1] == {"type": "REPLACE_STATE"}
+    reopened.close()
+
+
+def test_state_at_rebuilds_states_around_a_replace(db_path):
+    backend = SqliteGameStateBackend(db_path, snapshot_every=4)
+    store, engine = _store(db_path, backend=backend)
+    record = store.create({"numberOfPlayers": 3, "seed": 11})
+    states = _play_game(store, engine, record["id"], turns=6)
+    store.flush()
+    replaced = with_state_hash({**store.find(record["id"])["state"], "damage": 2})
+    store.update_state(record["id"], replaced)
+    states.append(replaced)
+    states.extend(_play_turns(store, engine, record["id"], turns=12))
+    store.close()
+
+    assert len(states) > 12
+    for seq, state in enumerate(states):
+        if state is not None:
+            assert backend.state_at(record["id"], seq) == state, seq
+
+
+def test_memory_store_keeps_no_history():
+    store = GameStateStore(limits=NO_TTL)
+    record = store.create()
+    assert store.history(record["id"]) is None
+
+
+def test_versions_survive_a_restart(db_path):
+    store, engine = _store(db_path)
+    record = _start(store, engine, store.create())
+    store.close()
+
+    reopened, _ = _store(db_path)
+    assert reopened.find(record["id"])["version"] == record["version"] == 2
+    reopened.close()
+
+
+def test_versioned_writes_are_written_through(db_path):
+    backend = RecordingBackend(db_path)
+    store, engine = _store(db_path, backend=backend)
+    record = store.create()
+    started = engine.step(record["state"], start_game_action())["state"]
+
+    updated = store.update_state(record["id"], started, [start_game_action()], expected_version=1)
+    assert backend.batches == [(1, 0)]
+    assert backend.load(record["id"])["version"] == updated["version"] == 2
+    assert backend.history(record["id"]) == [(1, start_game_action())]
+    assert store.metrics()["backend"]["pendingWrites"] == 0
+    store.close()
+
+
+def test_workers_sharing_a_file_cannot_both_write_a_version(db_path):
+    first, engine = _store(db_path)
+    record = _start(first, engine, first.create({"numberOfPlayers": 3}))
+    first.flush()
+    second, _ = _store(db_path)
+    assert second.find(record["id"])["version"] == 2
+
+    # 두 워커가 같은 버전 2에서 서로 다른 수를 계산한다.
+    state = record["state"]
+    legal = engine.legal_actions(state)
+    draw = engine.play_turn(state, draw_card_action(legal.draw_amount))
+    first.update_state(record["id"], draw["state"], draw["info"]["actions"], expected_version=2)
+    other = engine.step(state, draw_card_action(1))
+    with pytest.raises(VersionConflictError) as exc_info:
+        second.update_state(record["id"], other["state"], [draw_card_action(1)], expected_version=2)
+    assert (exc_info.value.expected, exc_info.value.current) == (2, 2 + 1)
+    assert second.metrics()["backend"]["conflicts"] == 1
+
+    # 거절된 쪽은 캐시를 버리고 다음 조회에서 이긴 쪽의 상태를 읽는다.
+    reloaded = second.find(record["id"])
+    assert reloaded["version"] == 3
+    assert reloaded["state"] == draw["state"]
+    assert second.page(SessionQuery())[0][0].version == 3
+    # 로그에는 이긴 쪽의 액션만 남는다.
+    assert [action for _, action in second.history(record["id"])] == draw["info"]["actions"]
+    first.close()
+    second.close()
+
+
+def test_flushed_writes_over_a_newer_stored_version_are_dropped(db_path):
+    first, engine = _store(db_path)
+    record = _start(first, engine, first.create())
+    first.flush()
+    second, _ = _store(db_path)
+    second.find(record["id"])
+
+    first.update_state(record["id"], {**record["state"], "damage": 2}, expected_version=2)
+    second.update_state(record["id"], {**record["state"], "damage": 1})
+    assert second.flush() == 0
+    assert second.metrics()["backend"]["conflicts"] == 1
+    assert second.find(record["id"])["state"]["damage"] == 2
+    first.close()
+    second.close()
+
+
+def test_migrates_schema_1_files(db_path):
+    import sqlite3
+
+    from onecard_api.services.sqlite_store import SCHEMA
+
+    with sqlite3.connect(db_path) as connection:
+        connection.executescript(
+            SCHEMA.replace(",\n    version INTEGER NOT NULL", "").replace(",\n    current_player INTEGER NOT NULL", "")
+        )
+        connection.execute(
+            "INSERT INTO game_sessions VALUES ('old', '{}', 'waiting', '2026-01-01', '2026-01-01', 0, 0)"
+        )
+        connection.execute("PRAGMA user_version = 1")
+    backend = SqliteGameStateBackend(db_path)
+    row = backend._connection().execute(
+        "SELECT version, current_player FROM game_sessions WHERE id = 'old'"
+    ).fetchone()
+    assert row == (1, 0)
+
+
+def test_listing_survives_a_restart_without_loading_states(db_path):
+    store, engine = _store(db_path)
+    first = _start(store, engine, store.create({"numberOfPlayers": 3}))
+    second = store.create({"mode": "ai"})
+    store.close()
+
+    reopened, _ = _store(db_path)
+    items, cursor = reopened.page(SessionQuery())
+    assert [item.id for item in items] == [second["id"], first["id"]]
+    assert cursor is None
+    assert items[1].game_status == "playing"
+    assert items[1].current_player_index == first["state"]["currentPlayerIndex"]
+    assert items[1].version == 2
+    assert reopened.page(SessionQuery(settings={"mode": "ai"}))[0] == [items[0]]
+    assert reopened.metrics()["backend"]["loads"] == 0
+    reopened.close()
+
+
+def test_rejects_files_with_another_schema(db_path):
+    import sqlite3
+
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("CREATE TABLE game_sessions (id TEXT PRIMARY KEY, state TEXT)")
+    with pytest.raises(RuntimeError, match="schema"):
+        SqliteGameStateBackend(db_path)
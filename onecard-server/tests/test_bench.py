@@ -0,0 +1,43 @@
+import io
+import json
+
+from onecard_api.bench import BENCHMARKS, compare, main, run_benchmarks, select_benchmarks
+
+
+def _report(**results):
+    return {"results": {name: {"usPerCall": value} for name, value in results.items()}}
+
+
+def test_compare_classifies_changes_against_threshold():
+    baseline = _report(a=10.0, b=10.0, c=10.0, gone=1.0)
+    current = _report(a=12.0, b=13.0, c=7.0, added=1.0)
+    statuses = {item.name: item.status for item in compare(baseline, current, threshold=0.25)}
+    assert statuses == {
+        "a": "ok",
+        "b": "regression",
+        "c": "improvement",
+        "gone": "missing",
+        "added": "new",
+    }
+
+
+def test_every_benchmark_runs_once():
+    report = run_benchmarks(BENCHMARKS, repeat=1, scale=1e-9)
+    assert set(report["results"]) == {bench.name for bench in BENCHMARKS}
+    assert all(result["number"] == 1 for result in report["results"].values())
+    assert "draw_card_status[damage=7]" in report["results"]
+
+
+def test_cli_writes_baseline_and_flags_regressions(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    assert main(["run", "--only", "create_deck", "--repeat", "1", "--scale", "0.001", "--out", str(baseline_path)]) == 0
+    baseline = json.loads(baseline_path.read_text())
+    assert list(baseline["results"]) == [bench.name for bench in select_benchmarks(["create_deck"])]
+
+    slower = {"results": {"create_deck": {"usPerCall": baseline["results"]["create_deck"]["usPerCall"] * 3}}}
+    current_path = tmp_path / "current.json"
+    current_path.write_text(json.dumps(slower))
+    out = io.StringIO()
+    assert main(["compare", str(baseline_path), str(current_path)], out=out) == 1
+    assert "regression" in out.getvalue()
+    assert main(["compare", str(current_path), str(baseline_path)], out=io.StringIO()) == 0
@@ -0,0 +1,26 @@
+import json
+from io import StringIO
+
+from onecard_api.sim import main
+
+
+def test_sim_streams_results_and_summary():
+    out = StringIO()
+    assert main(["--games", "5", "--players", "3", "--jokers", "--seed", "11", "--stream"], out) == 0
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    results, summary = lines[:-1], lines[-1]["summary"]
+
+    assert [result["index"] for result in results] == list(range(5))
+    assert [result["seed"] for result in results] == list(range(11, 16))
+    assert summary["games"] == 5
+    assert summary["turnsPerGame"] == sum(r["turns"] for r in results) / 5
+    assert sum(summary["winRateBySeat"].values()) + summary["truncated"] / 5 == 1
+
+
+def test_sim_is_reproducible_for_a_seed():
+    runs = []
+    for _ in range(2):
+        out = StringIO()
+        main(["--games", "3", "--seed", "4", "--stream"], out)
+        runs.append([(r["winner"], r["turns"]) for r in map(json.loads, out.getvalue().splitlines()[:-1])])
+    assert runs[0] == runs[1]
@@ -0,0 +1,78 @@
+import pytest
+
+from onecard_api import tournament
+from onecard_api.tournament import MatchStats, MatchUp, TournamentConfig, run_tournament, wilson_interval
+
+
+def test_wilson_interval_known_values():
+    low, high = wilson_interval(50, 100)
+    assert low == pytest.approx(0.4038, abs=1e-4)
+    assert high == pytest.approx(0.5962, abs=1e-4)
+    assert wilson_interval(0, 10)[0] == 0.0
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_inline_tournament_reports_per_seat_breakdown():
+    config = TournamentConfig(max_games=60, min_games=60, chunk_size=20, seed=3)
+    reports = list(run_tournament([(3, True)], [MatchUp("easy", "easy")], config))
+    assert len(reports) == 1
+    report = reports[0]
+    assert report["case"] == "p3_jokeron"
+    assert report["games"] == 60
+    assert report["onnxAvailable"] is None
+    assert sum(seat["games"] for seat in report["seats"]) == 60
+    assert [seat["games"] for seat in report["seats"]] == [20, 20, 20]
+    assert report["ci"][0] <= report["winRate"] <= report["ci"][1]
+    rerun = next(run_tournament([(3, True)], [MatchUp("easy", "easy")], config))
+    timing = ("seconds", "gamesPerSecond")
+    assert {k: v for k, v in rerun.items() if k not in timing} == {
+        k: v for k, v in report.items() if k not in timing
+    }
+
+
+def test_matchup_stops_early_once_significant(monkeypatch):
+    calls = []
+
+    def always_win(task):
+        calls.append(task)
+        return MatchStats(
+            games=task.games,
+            wins=task.games,
+            games_by_seat=[task.games, 0],
+            wins_by_seat=[task.games, 0],
+        )
+
+    monkeypatch.setattr(tournament, "_play_chunk", always_win)
+    config = TournamentConfig(max_games=10_000, min_games=100, chunk_size=50)
+    report = tournament.run_matchup(None, 2, False, MatchUp("hard", "easy"), config)
+    assert report["significant"] is True
+    assert report["verdict"] == "challenger stronger"
+    assert report["games"] == 100
+    assert [task.seed for task in calls] == [0, 50]
+
+
+def test_repeated_looks_use_an_adjusted_interval(monkeypatch):
+    def sixty_percent(task):
+        wins = task.games * 3 // 5
+        return MatchStats(
+            games=task.games, wins=wins, games_by_seat=[task.games, 0], wins_by_seat=[wins, 0]
+        )
+
+    config = TournamentConfig(max_games=10_000, min_games=100, chunk_size=50)
+    # 한 번만 본다면 100게임의 60%로 충분하지만(Wilson 하한 0.502), 100번 보는 검정은 더 기다린다.
+    assert wilson_interval(60, 100, config.z)[0] > 0.5
+    report = tournament.run_matchup(None, 2, False, MatchUp("hard", "easy"), config, play_chunk=sixty_percent)
+    assert report["looks"] == 100
+    assert report["games"] > 100
+    assert report["verdict"] == "challenger stronger"
+
+
+def test_inline_tournament_leaves_process_state_alone():
+    import logging
+
+    logger = logging.getLogger("onecard_api.game_ai")
+    level = logger.level
+    config = TournamentConfig(max_games=20, min_games=20, chunk_size=20)
+    next(run_tournament([(2, False)], [MatchUp("easy", "easy")], config))
+    assert logger.level == level
+    assert tournament._worker_ai_service is None
@@ -41,7 +41,23 @@ def default_reward(
     return reward
 
 
-def _is_able_to_block(
+_CODE_SUITS = ("hearts", "diamonds", "clubs", "spades")
+_JOKER_CODE = 52
+_CODE_BY_SUIT_RANK: Dict[Tuple[str, int], int] = {
+    (suit, rank): suit_idx * 13 + rank - 1
+    for suit_idx, suit in enumerate(_CODE_SUITS)
+    for rank in range(1, 14)
+}
+
+
+def _card_code(card: Dict[str, Any]) -> Optional[int]:
+    # 서버 domain/card_codes.encode_card 와 같은 코드 체계 (0~51, 조커 52)
+    if card.get("isJoker"):
+        return _JOKER_CODE
+    return _CODE_BY_SUIT_RANK.get((card.get("suit"), card.get("rank")))
+
+
+def _is_able_to_block_rule(
     played_card: Dict[str, Any], top_card: Dict[str, Any],
 ) -> bool:
     # Damage 상황에서 막기 허용 규칙을 서버와 동일하게 맞춘다.
@@ -55,14 +71,14 @@ def _is_able_to_block(
     return bool(played_card.get("isJoker"))
 
 
-def is_valid_play(
+def _is_valid_play_rule(
     played_card: Dict[str, Any], top_card: Dict[str, Any], damage: float
 ) -> bool:
     # 서버 cardUtils.isValidPlay 규칙을 그대로 재현한다.
     if played_card.get("isJoker"):
         return True
     if damage > 0:
-        return _is_able_to_block(played_card, top_card)
+        return _is_able_to_block_rule(played_card, top_card)
     if top_card.get("isJoker"):
         return True
     if played_card.get("rank") is None or played_card.get("suit") is None:
@@ -75,6 +91,30 @@ def is_valid_play(
     )
 
 
+def _build_playable_masks(damage: float) -> Tuple[int, ...]:
+    cards: list = [{"isJoker": True} if code >= _JOKER_CODE else {} for code in range(54)]
+    for (suit, rank), code in _CODE_BY_SUIT_RANK.items():
+        cards[code] = {"isJoker": False, "suit": suit, "rank": rank}
+    return tuple(
+        sum(1 << p for p in range(54) if _is_valid_play_rule(cards[p], top, damage))
+        for top in cards
+    )
+
+
+# _PLAYABLE_MASKS[damage > 0][top_code] -> 낼 수 있는 카드 코드 비트마스크
+_PLAYABLE_MASKS = (_build_playable_masks(0), _build_playable_masks(1))
+
+
+def is_valid_play(
+    played_card: Dict[str, Any], top_card: Dict[str, Any], damage: float
+) -> bool:
+    played_code = _card_code(played_card)
+    top_code = _card_code(top_card)
+    if played_code is None or top_code is None:
+        return _is_valid_play_rule(played_card, top_card, damage)
+    return bool(_PLAYABLE_MASKS[damage > 0][top_code] >> played_code & 1)
+
+
 @dataclass(frozen=True)
 class ObservationSpec:
     """관측 벡터 구성을 설명하는 스펙.
@@ -314,6 +354,10 @@ class OneCardEnv(gym.Env):
         self.action_space = gym.spaces.Discrete(self.max_hand_size + 1)
 
         self.state_cache: Optional[Dict[str, Any]] = None
+        self._mask_cache: Tuple[Optional[Dict[str, Any]], np.ndarray] = (
+            None,
+            np.zeros(0, dtype=bool),
+        )
         self.game_id: Optional[str] = None
 
     def reset(
@@ -335,7 +379,11 @@ class OneCardEnv(gym.Env):
         if options:
             self.settings.update(options)
         self._cleanup_session()
-        resource = self._request("post", "/games", json={"settings": self.settings})
+        # 서버 게임별 RNG 시드를 np_random 에서 뽑아, reset(seed=...) 이후 에피소드가 재현되도록 한다.
+        game_seed = int(self.np_random.integers(0, 2**63 - 1))
+        resource = self._request(
+            "post", "/games", json={"settings": {**self.settings, "seed": game_seed}}
+        )
         self.game_id = resource["id"]
         state = resource["state"]
         if state.get("gameStatus") == "waiting":
@@ -440,28 +488,30 @@ class OneCardEnv(gym.Env):
 
     def action_mask(self) -> np.ndarray:
         """현재 상태에서 선택 가능한 행동(카드)만 True로 표시한 마스크를 반환한다."""
+        state = self.state_cache
+        cached_state, cached_mask = self._mask_cache
+        if state is not None and cached_state is state:
+            return cached_mask
+
         mask = np.zeros(self.max_hand_size + 1, dtype=bool)
-        if self.state_cache is None:
+        if state is None:
             mask[:] = True
             return mask
 
-        hand = self.state_cache["players"][0]["hand"]
+        hand = state["players"][0]["hand"]
         mask[self.max_hand_size] = len(hand) < self.max_hand_size
 
-        if not self.state_cache.get("discardPile"):
-            mask[: len(hand)] = True
-            mask[len(hand) : self.max_hand_size] = False
-            return mask
-
-        top_card = self.state_cache["discardPile"][0]
-        damage = float(self.state_cache.get("damage", 0))
-
-        for idx in range(self.max_hand_size):
-            if idx >= len(hand):
-                mask[idx] = False
-                continue
-            mask[idx] = is_valid_play(hand[idx], top_card, damage)
-
+        if not state.get("discardPile"):
+            mask[: min(len(hand), self.max_hand_size)] = True
+        else:
+            top_card = state["discardPile"][0]
+            damage = float(state.get("damage", 0))
+            for idx, card in enumerate(hand[: self.max_hand_size]):
+                mask[idx] = is_valid_play(card, top_card, damage)
+
+        # 같은 상태에 대한 마스킹/행동 해석이 한 번의 계산을 공유하도록 상태 객체 기준으로 캐시한다.
+        mask.flags.writeable = False
+        self._mask_cache = (state, mask)
         return mask
 
     def _resolve_to_agent_turn(
@@ -501,18 +551,11 @@ class OneCardEnv(gym.Env):
         available_space = max(self.max_hand_size - len(hand), 0)
         actual_draw = min(draw_amount, available_space) if available_space > 0 else draw_amount
         mask = self.action_mask()
-        top_card = (state.get("discardPile") or [None])[0]
 
         if action_index == self.max_hand_size:
             return {"type": "DRAW_CARD", "amount": actual_draw}, available_space > 0
         if 0 <= action_index < len(hand):
-            is_play_valid = False
-            if top_card is None:
-                is_play_valid = True
-            else:
-                is_play_valid = is_valid_play(hand[action_index], top_card, damage)
-
-            if is_play_valid:
+            if mask[action_index]:
                 return {
                     "type": "PLAY_CARD",
                     "playerIndex": 0,